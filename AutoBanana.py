@@ -1,11 +1,18 @@
+import argparse
 import atexit
 import configparser
-import itertools
+import json
+import gzip
+import hmac
+import ipaddress
 import logging
+import mimetypes
+import multiprocessing
 import os
 import shutil
 import signal
 import sys
+import tempfile
 import threading
 import time
 import uuid
@@ -13,7 +20,7 @@ import webbrowser
 from collections import deque
 from datetime import datetime, timedelta, UTC
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 try:  # winreg is Windows-only; fallback to None on Linux/macOS
     import winreg as reg
 except ImportError:
@@ -21,33 +28,86 @@ except ImportError:
 
 import psutil
 import requests
-import vdf  # type: ignore
-from flask import Flask, jsonify, render_template, request, send_from_directory
+from flask import Blueprint, Flask, jsonify, redirect, render_template, request, send_from_directory
 
 
 import utils
+import utils.app_search
+import utils.assets
+import utils.clock
+import utils.concurrency
+import utils.config_store
+import utils.control
+import utils.fleet
+import utils.game_profiler
+import utils.history_store
+import utils.instance_lock
+import utils.log_writer
+import utils.process_match
+import utils.process_tree
+import utils.rotation_checkpoint
+import utils.run_deferral
+import utils.simulator
+import utils.steam_library
 import utils.steam_manager
+import utils.steam_worker
+import utils.store_client
+import utils.versioned_state
 
 
 APP_DIR = Path(__file__).parent
-LOCK_PATH = APP_DIR / "autobanana.lock"
 LOG_PATH = APP_DIR / "AutoBanana.log"
 ICON_PATH = APP_DIR / "banana.ico"
+STATIC_DIR = APP_DIR / "web" / "static"
 UI_PORT = 5055
 UI_HOST = "127.0.0.1"
+COMPRESS_MIN_BYTES = 512
+SEARCH_RESULT_LIMIT = 12
 
-logging.basicConfig(
-    filename=str(LOG_PATH),
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
 logger = logging.getLogger("main")
+# Set up by ``setup_logging`` from ``main``, never at import: the Steam worker is
+# spawned, and a spawned child re-imports this file as ``__mp_main__``.
+log_writer: Optional[utils.log_writer.LogWriter] = None
+
+
+def setup_logging() -> None:
+    global log_writer
+
+    if log_writer is not None:
+        return
+    log_writer = utils.log_writer.configure_logging(
+        str(LOG_PATH),
+        max_bytes=5 * 1024 * 1024,
+        backup_count=5,
+        max_age_seconds=7 * 24 * 3600,
+        queue_size=10000,
+    )
+    atexit.register(log_writer.stop)
 
 
 def iso_or_none(dt: Optional[datetime]) -> Optional[str]:
     return dt.isoformat() if dt else None
 
 
+def resolve_config_dir() -> Path:
+    """Return the user's roaming AutoBanana config directory."""
+    if os.name == "nt":
+        appdata = os.environ.get("APPDATA")
+        base_dir = Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
+    else:
+        xdg_home = os.environ.get("XDG_CONFIG_HOME")
+        base_dir = Path(xdg_home) if xdg_home else Path.home() / ".config"
+    return base_dir / "AutoBanana"
+
+
+def control_socket_path() -> Path:
+    return resolve_config_dir() / "autobanana.sock"
+
+
+def instance_lock_path() -> Path:
+    return resolve_config_dir() / "autobanana.lock"
+
+
 class AutoBananaService:
     """Backend service that owns scheduling, Steam automation, and UI state."""
 
@@ -55,19 +115,40 @@ class AutoBananaService:
 
     def __init__(self) -> None:
         self.is_windows = os.name == "nt"
+        self.clock = utils.clock.SystemClock()  # every scheduler time read and sleep goes through this
         self.user_id_file = APP_DIR / "user_id.txt"
         self.usage_logged_file = APP_DIR / "usage_logged.txt"
         self.config_path = self._resolve_config_path()
         self._bootstrap_config_storage()
         logger.info(f"Using config file at {self.config_path}")
-        self.config = self.read_config()
-        self.game_open_count = 0
+        self.config: Dict = {}
+        self._config_incomplete = False
+        self.config_store = utils.config_store.ConfigStore(self.config_path, self._config_text, self._mirror_config_to_legacy)
+        atexit.register(self.config_store.close)
+        self.load_config()
+        self.history = utils.history_store.HistoryStore(self.config_path.parent / "history.sqlite3")
+        self.game_open_count = self.history.count("account", status="ok")
+        self.current_run_id: Optional[int] = None
         self.account_names: List[str] = []
         self.steam_install_location = self.get_steam_install_location()
-        self.steam_account_changer = utils.steam_manager.SteamAccountChanger()
+        self.library = utils.steam_library.SteamLibraryIndex(self.steam_install_location)
+        self._metadata_prefetch: Optional[threading.Thread] = None
+        self.app_list_path = self.config_path.parent / "steam_applist.json"
+        self.checkpoint = utils.rotation_checkpoint.RotationCheckpoint(self.config_path.parent / "rotation_checkpoint.json")
+        self.search_index = utils.app_search.AppSearchIndex()
+        self.steam_worker = utils.steam_worker.SteamWorker()
+        self.concurrency = utils.concurrency.AdaptiveConcurrency(
+            initial=int(self.config.get("batch_size", 5)),
+            minimum=int(self.config.get("batch_size_min", 1)),
+            maximum=int(self.config.get("batch_size_max", 10)),
+        )
+        self.profiler = utils.game_profiler.GameProfiler()
+        self.deferral = utils.run_deferral.RunDeferral()
         self.events: Deque[Dict] = deque(maxlen=500)
+        self.status_versions = utils.versioned_state.VersionedState()
         self.stop_event = threading.Event()
         self.manual_trigger = threading.Event()
+        self._force_run = False
         self.paused = False
         self.current_state = "idle"  # idle|running|waiting|stopped
         self.worker_thread: Optional[threading.Thread] = None
@@ -75,7 +156,6 @@ class AutoBananaService:
         self.last_run_at: Optional[datetime] = None
         self.wait_progress: Optional[Dict] = None  # {elapsed, remaining, total, label}
         self.switch_progress: Optional[Dict] = None  # {total, completed, phase, current_account, message}
-        self.lock_fd: Optional[int] = None
         self.ui_url = f"http://{UI_HOST}:{UI_PORT}"
         self._steam_app_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self._steam_search_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
@@ -84,8 +164,10 @@ class AutoBananaService:
             "User-Agent": "AutoBanana/1.0 (+https://github.com/Beelzebub2/AutoBanana)",
             "Accept": "application/json",
         }
+        self.store = utils.store_client.StoreClient(requests_per_minute=self.store_rate(), headers=self._steam_store_headers)
 
         self.update_config_file()
+        self.rebuild_search_index()
         self.apply_startup_setting()
         self.register_usage()
 
@@ -94,13 +176,7 @@ class AutoBananaService:
     # ------------------------------------------------------------
     def _resolve_config_path(self) -> Path:
         """Place config under the user's roaming config directory."""
-        if self.is_windows:
-            appdata = os.environ.get("APPDATA")
-            base_dir = Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
-        else:
-            xdg_home = os.environ.get("XDG_CONFIG_HOME")
-            base_dir = Path(xdg_home) if xdg_home else Path.home() / ".config"
-        return base_dir / "AutoBanana" / "config.ini"
+        return resolve_config_dir() / "config.ini"
 
     def _ensure_config_parent(self) -> None:
         try:
@@ -169,8 +245,22 @@ class AutoBananaService:
             "time_to_wait": 60,
             "run_interval_seconds": 10800,
             "batch_size": 5,
+            "adaptive_batch": False,  # opt-in: existing configs keep their fixed batch_size
+            "batch_size_min": 1,
+            "batch_size_max": 10,
+            "profile_games": True,
             "theme": "fire",
             "switch_steam_accounts": False,
+            "server_threads": 8,
+            "server_keepalive_seconds": 120,
+            "compress_responses": True,
+            "store_requests_per_minute": 40,
+            "freshness_window_seconds": 3600,
+            "history_retention_days": 365,
+            "defer_when_busy": False,  # opt-in: existing schedules keep running on time
+            "defer_max_seconds": 3600,
+            "defer_cpu_percent": 80,
+            "defer_processes": [],
         }
 
         settings = config["Settings"] if "Settings" in config else {}
@@ -185,30 +275,55 @@ class AutoBananaService:
             if settings
             else defaults["run_interval_seconds"],
             "batch_size": settings.getint("batch_size", fallback=defaults["batch_size"]) if settings else defaults["batch_size"],
+            "adaptive_batch": settings.getboolean("adaptive_batch", fallback=defaults["adaptive_batch"]) if settings else defaults["adaptive_batch"],
+            "batch_size_min": settings.getint("batch_size_min", fallback=defaults["batch_size_min"]) if settings else defaults["batch_size_min"],
+            "batch_size_max": settings.getint("batch_size_max", fallback=defaults["batch_size_max"]) if settings else defaults["batch_size_max"],
+            "profile_games": settings.getboolean("profile_games", fallback=defaults["profile_games"]) if settings else defaults["profile_games"],
             "theme": settings.get("theme", defaults["theme"]).lower() if settings else defaults["theme"],
             "switch_steam_accounts": settings.getboolean("switch_steam_accounts", fallback=defaults["switch_steam_accounts"])
             if settings
             else defaults["switch_steam_accounts"],
+            "server_threads": settings.getint("server_threads", fallback=defaults["server_threads"]) if settings else defaults["server_threads"],
+            "server_keepalive_seconds": settings.getint("server_keepalive_seconds", fallback=defaults["server_keepalive_seconds"])
+            if settings
+            else defaults["server_keepalive_seconds"],
+            "compress_responses": settings.getboolean("compress_responses", fallback=defaults["compress_responses"])
+            if settings
+            else defaults["compress_responses"],
+            "store_requests_per_minute": settings.getint("store_requests_per_minute", fallback=defaults["store_requests_per_minute"])
+            if settings
+            else defaults["store_requests_per_minute"],
+            "freshness_window_seconds": settings.getint("freshness_window_seconds", fallback=defaults["freshness_window_seconds"])
+            if settings
+            else defaults["freshness_window_seconds"],
+            "history_retention_days": settings.getint("history_retention_days", fallback=defaults["history_retention_days"])
+            if settings
+            else defaults["history_retention_days"],
+            "defer_when_busy": settings.getboolean("defer_when_busy", fallback=defaults["defer_when_busy"]) if settings else defaults["defer_when_busy"],
+            "defer_max_seconds": settings.getint("defer_max_seconds", fallback=defaults["defer_max_seconds"]) if settings else defaults["defer_max_seconds"],
+            "defer_cpu_percent": settings.getint("defer_cpu_percent", fallback=defaults["defer_cpu_percent"]) if settings else defaults["defer_cpu_percent"],
+            "defer_processes": [name.strip() for name in settings.get("defer_processes", "").split(",") if name.strip()]
+            if settings
+            else defaults["defer_processes"],
         }
 
-        if "Settings" not in config:
-            config["Settings"] = {
-                "run_on_startup": "yes" if cfg["run_on_startup"] else "no",
-                "games": ",".join(cfg["games"]),
-                "time_to_wait": str(cfg["time_to_wait"]),
-                "run_interval_seconds": str(cfg["run_interval_seconds"]),
-                "batch_size": str(cfg["batch_size"]),
-                "theme": cfg["theme"],
-                "switch_steam_accounts": "yes" if cfg["switch_steam_accounts"] else "no",
-            }
-            self._ensure_config_parent()
-            with open(self.config_path, "w", encoding="utf-8") as configfile:
-                config.write(configfile)
-            self._mirror_config_to_legacy()
-
+        # Defaults were filled in for a missing section or keys; load_config writes them back once.
+        self._config_incomplete = not settings or any(key not in settings for key in defaults)
         return cfg
 
+    def load_config(self) -> None:
+        """Replace the in-memory config with the file, queueing a rewrite only if defaults had to be filled in."""
+        with self.config_store.lock:
+            self.config_store.flush()  # pending UI edits must reach the file before it is re-read
+            self.config = self.read_config()
+            if self._config_incomplete:
+                self.write_config()
+
     def write_config(self) -> None:
+        """Queue the in-memory config for the config writer; a burst of calls becomes one write."""
+        self.config_store.schedule()
+
+    def _config_text(self) -> str:
         cfg = configparser.ConfigParser()
         cfg["Settings"] = {
             "run_on_startup": "yes" if self.config.get("run_on_startup") else "no",
@@ -216,42 +331,90 @@ class AutoBananaService:
             "time_to_wait": str(self.config.get("time_to_wait", 60)),
             "run_interval_seconds": str(self.config.get("run_interval_seconds", 10800)),
             "batch_size": str(self.config.get("batch_size", 5)),
+            "adaptive_batch": "yes" if self.config.get("adaptive_batch", False) else "no",
+            "batch_size_min": str(self.config.get("batch_size_min", 1)),
+            "batch_size_max": str(self.config.get("batch_size_max", 10)),
+            "profile_games": "yes" if self.config.get("profile_games", True) else "no",
             "theme": self.config.get("theme", "fire"),
             "switch_steam_accounts": "yes" if self.config.get("switch_steam_accounts") else "no",
+            "server_threads": str(self.config.get("server_threads", 8)),
+            "server_keepalive_seconds": str(self.config.get("server_keepalive_seconds", 120)),
+            "compress_responses": "yes" if self.config.get("compress_responses", True) else "no",
+            "store_requests_per_minute": str(self.config.get("store_requests_per_minute", 40)),
+            "freshness_window_seconds": str(self.config.get("freshness_window_seconds", 3600)),
+            "history_retention_days": str(self.config.get("history_retention_days", 365)),
+            "defer_when_busy": "yes" if self.config.get("defer_when_busy", False) else "no",
+            "defer_max_seconds": str(self.config.get("defer_max_seconds", 3600)),
+            "defer_cpu_percent": str(self.config.get("defer_cpu_percent", 80)),
+            "defer_processes": ",".join(self.config.get("defer_processes", [])),
         }
-        self._ensure_config_parent()
-        with open(self.config_path, "w", encoding="utf-8") as configfile:
-            cfg.write(configfile)
-        self._mirror_config_to_legacy()
+        return utils.config_store.ini_text(cfg)
 
     def update_config_from_payload(self, payload: Dict) -> None:
-        dirty = False
-        for key in ("time_to_wait", "run_interval_seconds", "batch_size"):
+        with self.config_store.lock:
+            before = dict(self.config)
+            self._apply_config_payload(payload)
+            changed = {key for key, value in self.config.items() if before.get(key) != value}
+            if changed:
+                self.write_config()
+        if not changed:
+            return
+        # Only settings with side effects trigger them, so saving a toggle does not touch the registry or the schedule.
+        if "run_on_startup" in changed:
+            self.apply_startup_setting()
+        if "run_interval_seconds" in changed:
+            self.schedule_next_run(respect_existing=False)
+        if "store_requests_per_minute" in changed:
+            self.store.set_rate(self.store_rate())
+        self.log_event("Configuration updated via UI", "info")
+
+    def store_rate(self) -> int:
+        return max(1, int(self.config.get("store_requests_per_minute", 40)))
+
+    def _apply_config_payload(self, payload: Dict) -> None:
+        for key in ("time_to_wait", "run_interval_seconds", "batch_size", "batch_size_min", "batch_size_max", "store_requests_per_minute"):
             if key in payload:
                 try:
                     self.config[key] = max(1, int(payload[key]))
-                    dirty = True
                 except (TypeError, ValueError):
                     continue
 
-        for key in ("run_on_startup", "switch_steam_accounts"):
+        if "history_retention_days" in payload:
+            try:
+                self.config["history_retention_days"] = max(0, int(payload["history_retention_days"]))  # 0 keeps everything
+            except (TypeError, ValueError):
+                pass
+
+        if "freshness_window_seconds" in payload:
+            try:
+                self.config["freshness_window_seconds"] = max(0, int(payload["freshness_window_seconds"]))  # 0 turns skipping off
+            except (TypeError, ValueError):
+                pass
+
+        if "defer_max_seconds" in payload:
+            try:
+                self.config["defer_max_seconds"] = max(0, int(payload["defer_max_seconds"]))
+            except (TypeError, ValueError):
+                pass
+
+        if "defer_cpu_percent" in payload:
+            try:
+                self.config["defer_cpu_percent"] = min(100, max(1, int(payload["defer_cpu_percent"])))
+            except (TypeError, ValueError):
+                pass
+
+        if "defer_processes" in payload and isinstance(payload["defer_processes"], list):
+            self.config["defer_processes"] = [str(name).strip() for name in payload["defer_processes"] if str(name).strip()]
+
+        for key in ("run_on_startup", "switch_steam_accounts", "defer_when_busy"):
             if key in payload:
                 self.config[key] = bool(payload[key])
-                dirty = True
 
         if "games" in payload and isinstance(payload["games"], list):
             self.config["games"] = [str(g).strip() for g in payload["games"] if str(g).strip()]
-            dirty = True
 
         if "theme" in payload and str(payload["theme"]).lower() in self.available_themes:
             self.config["theme"] = str(payload["theme"]).lower()
-            dirty = True
-
-        if dirty:
-            self.write_config()
-            self.apply_startup_setting()
-            self.schedule_next_run(respect_existing=False)
-            self.log_event("Configuration updated via UI", "info")
 
     # ------------------------------------------------------------
     # Logging helpers
@@ -271,59 +434,6 @@ class AutoBananaService:
     # ------------------------------------------------------------
     # Environment setup
     # ------------------------------------------------------------
-    def acquire_lock(self) -> bool:
-        pid = os.getpid()
-        while True:
-            try:
-                self.lock_fd = os.open(str(LOCK_PATH), os.O_CREAT | os.O_EXCL | os.O_RDWR)
-                os.write(self.lock_fd, f"{pid}\n".encode("ascii"))
-                atexit.register(self.release_lock)
-                return True
-            except FileExistsError:
-                if not self._clear_stale_lock():
-                    return False
-
-    def release_lock(self) -> None:
-        if self.lock_fd:
-            try:
-                os.close(self.lock_fd)
-            except OSError:
-                pass
-            self.lock_fd = None
-        if LOCK_PATH.exists():
-            try:
-                LOCK_PATH.unlink()
-            except OSError:
-                pass
-
-    def _clear_stale_lock(self) -> bool:
-        if not LOCK_PATH.exists():
-            return False
-
-        pid: Optional[int] = None
-        try:
-            pid_text = LOCK_PATH.read_text(encoding="utf-8").strip()
-            if pid_text:
-                pid = int(pid_text)
-        except Exception:
-            pid = None
-
-        if pid and psutil.pid_exists(pid):
-            try:
-                proc = psutil.Process(pid)
-                if proc.is_running():
-                    return False
-            except psutil.Error:
-                pass
-
-        try:
-            LOCK_PATH.unlink()
-            self.log_event("Removed stale AutoBanana lock", "warning")
-            return True
-        except OSError as exc:
-            self.log_event(f"Failed removing stale lock: {exc}", "warning")
-            return False
-
     def apply_startup_setting(self) -> None:
         if not self.is_windows or reg is None:
             return
@@ -391,54 +501,15 @@ class AutoBananaService:
         logger.warning("Steam installation not found. Set STEAM_PATH to override.")
         return None
 
-    def _check_app_manifest(self, steam_apps_path: str, app_id: str) -> Optional[str]:
-        manifest_file = os.path.join(steam_apps_path, f"appmanifest_{app_id}.acf")
-        if os.path.exists(manifest_file):
-            with open(manifest_file, "r", encoding="utf-8") as f:
-                manifest = vdf.load(f)
-                install_location = os.path.join(
-                    steam_apps_path, "common", manifest["AppState"].get("installdir", "")
-                )
-                if os.path.exists(install_location):
-                    return install_location
-        return None
-
     def get_game_install_path(self, app_id: str) -> Optional[str]:
-        if not self.steam_install_location:
-            return None
-        steam_apps_path = os.path.join(self.steam_install_location, "steamapps")
-
-        install_path = self._check_app_manifest(steam_apps_path, app_id)
-        if install_path:
-            return install_path
+        return self.library.install_path(app_id)
 
-        library_folders_file = os.path.join(steam_apps_path, "libraryfolders.vdf")
-        if os.path.exists(library_folders_file):
-            with open(library_folders_file, "r", encoding="utf-8") as f:
-                library_folders = vdf.load(f).get("libraryfolders", {})
-
-            for key, library in library_folders.items():
-                if key == "0":
-                    continue
-                library_path = os.path.join(library.get("path", ""), "steamapps")
-                install_path = self._check_app_manifest(library_path, app_id)
-                if install_path:
-                    return install_path
-        return None
-
-    def get_steam_games(self) -> Dict[str, str]:
-        games: Dict[str, str] = {}
+    def get_game_matcher(self) -> utils.process_match.InstallPathMatcher:
+        """Matcher for processes running from the install dir of a configured game."""
         if not self.steam_install_location:
-            return games
-
-        for game_id in self.config.get("games", []):
-            install_path = self.get_game_install_path(game_id)
-            if install_path:
-                for _, _, files in os.walk(install_path):
-                    for file in files:
-                        if file.endswith(".exe") and file not in ("UnityCrashHandler64.exe", "UnityCrashHandler32.exe"):
-                            games[file] = install_path
-        return games
+            return utils.process_match.InstallPathMatcher({})
+        installed, _ = self.library.classify(self.config.get("games", []))
+        return utils.process_match.InstallPathMatcher({app.app_id: app.install_path for app in installed if app.install_path})
 
     # ------------------------------------------------------------
     # Steam metadata helpers (names, artwork, search)
@@ -452,7 +523,7 @@ class AutoBananaService:
         except (TypeError, ValueError):
             return None
 
-    def get_steam_app_info(self, app_id: Any) -> Optional[Dict[str, Any]]:
+    def get_steam_app_info(self, app_id: Any, priority: int = utils.store_client.PRIORITY_BACKGROUND) -> Optional[Dict[str, Any]]:
         app_key = self._sanitize_app_id(app_id)
         if not app_key:
             return None
@@ -462,14 +533,10 @@ class AutoBananaService:
             return cached[1]
 
         try:
-            response = requests.get(
-                "https://store.steampowered.com/api/appdetails",
-                params={"appids": app_key, "cc": "us", "l": "en"},
-                headers=self._steam_store_headers,
-                timeout=6,
-            )
-            response.raise_for_status()
-            payload = response.json()
+            payload = self.store.get_json("/api/appdetails", {"appids": app_key, "cc": "us", "l": "en"}, priority=priority)
+        except utils.store_client.StoreUnavailable as exc:
+            logger.debug(f"Steam metadata lookup for {app_key} deferred: {exc}")
+            return None
         except Exception as exc:
             self.log_event(f"Steam metadata lookup failed for {app_key}: {exc}", "warning")
             return None
@@ -490,33 +557,94 @@ class AutoBananaService:
         self._steam_app_cache[app_key] = (time.time(), info)
         return info
 
-    def get_steam_app_infos(self, app_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    def get_steam_app_infos(self, app_ids: List[Any], priority: int = utils.store_client.PRIORITY_BACKGROUND) -> Dict[str, Dict[str, Any]]:
         details: Dict[str, Dict[str, Any]] = {}
         for value in app_ids:
-            info = self.get_steam_app_info(value)
+            info = self.get_steam_app_info(value, priority)
             if info:
                 details[info["app_id"]] = info
         return details
 
+    def lookup_app_infos(self, app_ids: List[Any], interactive_limit: int = 3) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Metadata for a UI request without waiting on the whole list.
+
+        Cached entries are returned as-is and up to ``interactive_limit``
+        missing ones are fetched at interactive priority; the rest go to the
+        background prefetch and are reported as pending for the UI to ask
+        again later.
+        """
+        keys = [key for key in (self._sanitize_app_id(value) for value in app_ids) if key]
+        missing = [key for key in keys if not (key in self._steam_app_cache and self._cache_is_fresh(self._steam_app_cache[key][0]))]
+        details = {key: self._steam_app_cache[key][1] for key in keys if key not in missing}
+        details.update(self.get_steam_app_infos(missing[:interactive_limit], utils.store_client.PRIORITY_INTERACTIVE))
+        pending = [key for key in missing[interactive_limit:] if key not in details]
+        self.prefetch_app_infos(pending)
+        return details, pending
+
+    def rebuild_search_index(self, wait: bool = False) -> None:
+        """(Re)build the offline search index from the app-list dump and installed manifests."""
+
+        def build() -> None:
+            apps: List[Tuple[str, str]] = []
+            if self.app_list_path.exists():
+                try:
+                    apps = utils.app_search.load_app_list(self.app_list_path)
+                except (OSError, ValueError) as exc:
+                    logger.warning(f"Unable to read Steam app list {self.app_list_path}: {exc}")
+            installed = {app.app_id: app.name for app in self.library.apps()}
+            self.search_index.build(apps, installed)
+            logger.info(f"Search index ready: {self.search_index.size} apps in {self.search_index.build_seconds:.2f}s")
+
+        if wait:
+            build()
+        else:
+            threading.Thread(target=build, name="AutoBanana-search-index", daemon=True).start()
+
+    def import_app_list(self, payload: Any) -> Dict[str, Any]:
+        """Store an uploaded ``GetAppList`` dump and rebuild the search index from it."""
+        self._ensure_config_parent()
+        temp_path = self.app_list_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        try:
+            apps = utils.app_search.load_app_list(temp_path)
+        except (OSError, ValueError):
+            apps = []
+        if not apps:
+            temp_path.unlink(missing_ok=True)
+            raise ValueError("No apps found; expected a GetAppList dump")
+        os.replace(temp_path, self.app_list_path)
+        self._steam_search_cache.clear()
+        self.rebuild_search_index(wait=True)
+        self.log_event(f"Imported Steam app list with {len(apps)} apps", "info")
+        return self.search_index.stats()
+
     def search_steam_apps(self, query: str) -> List[Dict[str, Any]]:
         term = (query or "").strip()
         if len(term) < 2:
             return []
 
+        # The offline index answers in well under a millisecond. With an imported
+        # app list it covers the whole store; without one it only knows the
+        # installed games, so the store API fills up the rest of the page.
+        local = self.search_index.search(term, limit=SEARCH_RESULT_LIMIT)
+        if local and (self.search_index.catalog_size or len(local) >= SEARCH_RESULT_LIMIT):
+            return local
+        known = {item["app_id"] for item in local}
+        remote = [item for item in self._store_search(term) if item["app_id"] not in known]
+        return (local + remote)[:SEARCH_RESULT_LIMIT]
+
+    def _store_search(self, term: str) -> List[Dict[str, Any]]:
         cache_key = term.lower()
         cached = self._steam_search_cache.get(cache_key)
         if cached and self._cache_is_fresh(cached[0]):
             return cached[1]
 
         try:
-            response = requests.get(
-                "https://store.steampowered.com/api/storesearch/",
-                params={"term": term, "cc": "us", "l": "en"},
-                headers=self._steam_store_headers,
-                timeout=6,
-            )
-            response.raise_for_status()
-            payload = response.json()
+            payload = self.store.get_json("/api/storesearch/", {"term": term, "cc": "us", "l": "en"}, priority=utils.store_client.PRIORITY_INTERACTIVE)
+        except utils.store_client.StoreUnavailable as exc:
+            logger.debug(f"Steam search for '{term}' skipped: {exc}")
+            return []
         except Exception as exc:
             self.log_event(f"Steam search failed for '{term}': {exc}", "warning")
             return []
@@ -524,7 +652,7 @@ class AutoBananaService:
         items = payload.get("items") if isinstance(payload, dict) else None
         results: List[Dict[str, Any]] = []
         if isinstance(items, list):
-            for item in items[:12]:
+            for item in items[:SEARCH_RESULT_LIMIT]:
                 app_key = self._sanitize_app_id(item.get("id")) if isinstance(item, dict) else None
                 if not app_key:
                     continue
@@ -541,6 +669,63 @@ class AutoBananaService:
         self._steam_search_cache[cache_key] = (time.time(), results)
         return results
 
+    def prefetch_app_infos(self, app_ids: List[str]) -> None:
+        """Warm the metadata cache for ``app_ids`` on a background thread."""
+        pending = [app_id for app_id in app_ids if not (app_id in self._steam_app_cache and self._cache_is_fresh(self._steam_app_cache[app_id][0]))]
+        if not pending:
+            return
+        previous = self._metadata_prefetch
+
+        def fetch() -> None:
+            if previous is not None:
+                previous.join()
+            self.get_steam_app_infos(pending)
+
+        self._metadata_prefetch = threading.Thread(target=fetch, daemon=True)
+        self._metadata_prefetch.start()
+
+    def import_games(self, source: Any, replace: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """Validate a bulk list of app IDs against the library index and add the installed ones.
+
+        ``source`` is pasted text, a list or a library export (see
+        ``utils.steam_library.parse_app_ids``). Uninstalled IDs are reported
+        but not added, since ``update_config_file`` would drop them anyway.
+        """
+        ids, invalid, duplicates = utils.steam_library.parse_app_ids(source)
+        installed, uninstalled = self.library.classify(ids)
+        current = [] if replace else list(self.config.get("games", []))
+        added = [app.app_id for app in installed if app.app_id not in current]
+
+        if not dry_run and (added or replace):
+            with self.config_store.lock:
+                self.config["games"] = current + added
+                self.write_config()
+            self.log_event(f"Imported {len(added)} game(s); {len(uninstalled)} not installed, {len(invalid)} invalid", "info")
+        if not dry_run:
+            self.prefetch_app_infos([app.app_id for app in installed])
+
+        return {
+            "installed": [{"app_id": app.app_id, "name": app.name} for app in installed],
+            "uninstalled": uninstalled,
+            "invalid": invalid,
+            "duplicates": duplicates,
+            "added": [] if dry_run else added,
+            "games": self.config.get("games", []),
+            "dry_run": dry_run,
+        }
+
+    def list_library(self, limit: int = 100, offset: int = 0, **filters: Any) -> Dict[str, Any]:
+        """One page of installed apps across all library folders, flagged if already configured."""
+        configured_ids = set(self.config.get("games", []))
+        apps, total = self.library.query(configured_ids=configured_ids, limit=limit, offset=offset, **filters)
+        return {
+            "games": [{**app.to_dict(), "configured": app.app_id in configured_ids} for app in apps],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "libraries": self.library.libraries(),
+        }
+
     def update_config_file(self) -> None:
         if not self.steam_install_location:
             return
@@ -548,14 +733,8 @@ class AutoBananaService:
         games = self.config.get("games", [])
         if not games:
             return
-        installed_games = []
-        removed_games = []
-
-        for game in games:
-            if self.get_game_install_path(game.strip()):
-                installed_games.append(game)
-            else:
-                removed_games.append(game)
+        installed, removed_games = self.library.classify(games)
+        installed_games = [app.app_id for app in installed]
 
         if removed_games:
             message = "Removed non-installed game IDs from config: " + ", ".join(removed_games)
@@ -566,81 +745,229 @@ class AutoBananaService:
     # ------------------------------------------------------------
     # Core automation
     # ------------------------------------------------------------
-    def open_games(self, time_to_wait: int) -> None:
-        all_games = self.get_steam_games()
-
-        def find_running_steam_games(steam_games):
-            running_games = []
-            for proc in psutil.process_iter(["pid", "name", "create_time"]):
-                if proc.info.get("name") in steam_games:
-                    start_time = datetime.fromtimestamp(proc.info["create_time"])
-                    process_age = datetime.now() - start_time
-                    running_games.append((proc, start_time, process_age))
-            return running_games
+    def process_snapshot(self) -> Optional[utils.process_tree.ProcessSnapshot]:
+        return utils.process_tree.ProcessSnapshot.take()
+
+    def find_running_steam_games(
+        self, matcher: utils.process_match.InstallPathMatcher, snapshot: Optional[utils.process_tree.ProcessSnapshot] = None
+    ) -> List[Tuple[psutil.Process, datetime, timedelta]]:
+        running_games = []
+        snapshot = snapshot or self.process_snapshot()
+        for proc, _app_id in snapshot.matching(matcher):
+            if proc.info.get("create_time"):
+                start_time = datetime.fromtimestamp(proc.info["create_time"])
+                process_age = self.clock.now() - start_time
+                running_games.append((proc, start_time, process_age))
+        return running_games
+
+    def open_games(
+        self, time_to_wait: int, account: Optional[str] = None, cancel: Optional[threading.Event] = None, games: Optional[List[str]] = None
+    ) -> None:
+        cancel = cancel or self.stop_event
+        all_games = self.get_game_matcher()
 
         def open_single_game(game_id: str) -> bool:
             try:
-                steam_run_url = f"steam://rungameid/{game_id}"
-                webbrowser.open(steam_run_url)
+                steam_run_url = self.launch_game(game_id)
                 self.log_event(f"Opened {steam_run_url}", "success")
+                self.history.record("launch", run_id=self.current_run_id, account=account, app_id=game_id)
                 return True
             except Exception as exc:
                 self.log_event(f"Failed to open the game: {exc}", "error")
+                self.history.record("launch", status="failed", run_id=self.current_run_id, account=account, app_id=game_id, detail=str(exc))
                 return False
 
-        def batch(iterable, n=1):
-            it = iter(iterable)
-            while True:
-                chunk = list(itertools.islice(it, n))
-                if not chunk:
-                    break
-                yield chunk
-
         try:
-            games = self.config.get("games", [])
+            games = self.config.get("games", []) if games is None else games
             if not games:
                 self.log_event("No games configured to launch.", "warning")
                 return
-
-            self.log_event(f"Launching {len(games)} game(s) in batches of {self.config['batch_size']}.")
-            if self.stop_event.is_set():
+            already_done = self.checkpoint.done_games(account)
+            if already_done:
+                games = [game_id for game_id in games if game_id not in already_done]
+                self.log_event(f"Skipping {len(already_done)} game(s) that finished before the restart.")
+                if not games:
+                    return
+
+            adaptive = bool(self.config.get("adaptive_batch", False))
+            if adaptive:
+                self.concurrency.configure(int(self.config.get("batch_size_min", 1)), int(self.config.get("batch_size_max", 10)))
+                self.log_event(f"Launching {len(games)} game(s); batch size adapts between {self.concurrency.minimum} and {self.concurrency.maximum}.")
+            else:
+                self.log_event(f"Launching {len(games)} game(s) in batches of {self.config['batch_size']}.")
+            if cancel.is_set():
                 self.log_event("Stop requested; skipping new launches.", "warning")
                 return
 
-            for game_batch in batch(games, self.config["batch_size"]):
-                if self.stop_event.is_set():
+            pending = list(games)
+            while pending:
+                if cancel.is_set():
                     self.log_event("Stop requested; aborting remaining batches.", "warning")
                     break
+                size = self._record_concurrency(self.concurrency.evaluate(), account) if adaptive else max(1, int(self.config["batch_size"]))
+                game_batch = pending[:size]
+                launched = 0
+                started: List[str] = []
                 for game_id in game_batch:
-                    if self.stop_event.is_set():
+                    if cancel.is_set():
                         break
-                    open_single_game(game_id)
-                    time.sleep(1)
-
-                if self.stop_event.is_set():
+                    if adaptive and launched:
+                        paused = self.concurrency.pressure()
+                        if paused:
+                            self._record_concurrency(paused, account)
+                            break
+                    if open_single_game(game_id):
+                        started.append(game_id)
+                    launched += 1
+                    self.clock.wait(cancel, 1)
+                game_batch = game_batch[:launched]
+                pending = pending[launched:]
+
+                if cancel.is_set():
                     break
 
                 if game_batch:
+                    if self.config.get("profile_games", True):
+                        self.profiler.start(all_games.subset(game_batch))
                     self.log_event(f"Waiting {time_to_wait}s before closing newly started games.")
-                    self.wait_with_progress(time_to_wait, "Waiting before closing games")
+                    self.wait_with_progress(time_to_wait, "Waiting before closing games", cancel)
+                self._record_profiles(account)
 
-                running_games = find_running_steam_games(all_games)
-                self.close_games(running_games)
-                if self.stop_event.is_set():
+                snapshot = self.process_snapshot()
+                running_games = self.find_running_steam_games(all_games, snapshot)
+                self.close_games(running_games, account, cancel, snapshot)
+                if cancel.is_set():
                     break
+                self.history.mark_completed(account, started, self.clock.time(), self.current_run_id)
+                self.checkpoint.games_done(account, started)  # only after the dwell, so a crash mid-dwell replays the batch
         except Exception as exc:
             self.log_event(f"Failed to open or close the game: {exc}", "error")
+            self.history.record("failure", status="failed", run_id=self.current_run_id, account=account, detail=f"open_games: {exc}")
+        finally:
+            self._record_profiles(account)
+
+    def _record_profiles(self, account: Optional[str] = None) -> None:
+        for profile in self.profiler.stop():
+            self.history.record_profile(profile.to_dict(), run_id=self.current_run_id, account=account)
+
+    def game_profiles(self, app_id: Optional[str] = None, since: Optional[float] = None) -> Dict[str, Any]:
+        """Per-game resource profiles, plus what the configured games need if run all at once."""
+        profiles = self.history.profiles(app_id=app_id, start=since)
+        configured = set(self.config.get("games", []))
+        for entry in profiles:
+            app = self.library.get(entry["app_id"])
+            entry["name"] = app.name if app else None
+            entry["configured"] = entry["app_id"] in configured
+        in_config = [entry for entry in profiles if entry["configured"]]
+        return {
+            "profiles": profiles,
+            "configured": {
+                "profiled": len(in_config),
+                "unprofiled": sorted(configured - {entry["app_id"] for entry in in_config}),
+                "rss_peak_total": sum(entry["rss_peak"] for entry in in_config),
+                "cpu_peak_total": sum(entry["cpu_peak"] for entry in in_config),
+            },
+            "sampling": self.profiler.active,
+        }
 
-    def close_games(self, running_games) -> None:
+    def _record_concurrency(self, decision: utils.concurrency.ConcurrencyDecision, account: Optional[str] = None) -> int:
+        """Log and store a concurrency change so operators can see why launches were throttled."""
+        if decision.action == "hold":
+            return decision.limit
+        if decision.action == "pause":
+            message = f"Stopped launching this batch early: {decision.reason}"
+        else:
+            message = f"Batch size {decision.previous} -> {decision.limit}: {decision.reason}"
+        self.log_event(message, "info" if decision.action == "raise" else "warning")
+        self.history.record("concurrency", status=decision.action, run_id=self.current_run_id, account=account, detail=message)
+        return decision.limit
+
+    def launch_game(self, game_id: str) -> str:
+        steam_run_url = f"steam://rungameid/{game_id}"
+        webbrowser.open(steam_run_url)
+        return steam_run_url
+
+    def close_games(
+        self,
+        running_games,
+        account: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        snapshot: Optional[utils.process_tree.ProcessSnapshot] = None,
+    ) -> None:
+        """Terminate recently started games together with everything they spawned.
+
+        With a ``snapshot`` each game's launcher, crash-handler and anti-cheat
+        children are closed too; only descendants of the matched game
+        processes are touched, never their parents. Every tree is signalled
+        first and then waited on together, so one child that ignores SIGTERM
+        costs a single grace period rather than one per game.
+        """
+        cancel = cancel or self.stop_event
         threshold_minutes = 1.5
+        closed: Set[int] = set()
+        closing = []
         for proc, start_time, process_age in running_games:
+            if proc.info["pid"] in closed or process_age >= timedelta(minutes=threshold_minutes):
+                continue  # too old to be ours, or already part of another game's tree
+            tree = snapshot.tree(proc, exclude=closed) if snapshot else [proc]
+            closed.update(member.info["pid"] for member in tree)
+            # The whole tree, so the children still go if the game itself already exited or is protected.
+            signalled = utils.process_tree.terminate_all(tree)
+            if signalled:
+                closing.append((proc, process_age, signalled))
+        if not closing:
+            return
+
+        if not self._wait_for_exit([member for _, _, tree in closing for member in tree], cancel):
+            names = ", ".join(f"{proc.info['name']} (PID: {proc.info['pid']})" for proc, _, _ in closing)
+            self.log_event(f"Stop requested while closing {names}; not waiting for them.", "warning")
+            return
+        for proc, process_age, tree in closing:
+            child_count = sum(member is not proc for member in tree)
+            children = f" and {child_count} child process(es)" if child_count else ""
+            self.log_event(f"Closed {proc.info['name']} (PID: {proc.info['pid']}){children}", "warning")
+            self.history.record(
+                "close",
+                run_id=self.current_run_id,
+                account=account,
+                duration=process_age.total_seconds(),
+                detail=proc.info["name"],
+            )
+
+    def _wait_for_exit(self, procs: List[psutil.Process], cancel: threading.Event, grace_seconds: float = 10) -> bool:
+        """Wait for terminated processes to exit, killing any left after ``grace_seconds``.
+
+        Returns False if ``cancel`` is set first.
+        """
+        pending = list(procs)
+        if not self._wait_gone(pending, self.clock.monotonic() + grace_seconds, cancel):
+            return False
+        for proc in pending:
             try:
-                if process_age < timedelta(minutes=threshold_minutes):
-                    proc.terminate()
-                    proc.wait()
-                    self.log_event(f"Closed {proc.info['name']} (PID: {proc.info['pid']})", "warning")
+                proc.kill()
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
+        self._wait_gone(pending, self.clock.monotonic() + 5)
+        return True
+
+    def _wait_gone(self, pending: List[psutil.Process], deadline: float, cancel: Optional[threading.Event] = None) -> bool:
+        """Drop processes from ``pending`` as they exit, until it is empty or ``deadline`` passes.
+
+        Returns False if ``cancel`` is set first.
+        """
+        while pending and self.clock.monotonic() < deadline:
+            if cancel is not None and cancel.is_set():
+                return False
+            try:
+                # A zombie has exited; its parent just has not reaped it yet.
+                if pending[0].status() != psutil.STATUS_ZOMBIE:
+                    pending[0].wait(timeout=0.1)
+                pending.pop(0)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                pending.pop(0)
+            except psutil.TimeoutExpired:
+                continue
+        return True
 
     def close_program(self, process_name: str) -> None:
         for proc in psutil.process_iter(["pid", "name"]):
@@ -648,23 +975,24 @@ class AutoBananaService:
                 proc.terminate()
                 break
 
-    def wait_with_progress(self, duration: int, label: str = "Waiting") -> None:
+    def wait_with_progress(self, duration: int, label: str = "Waiting", cancel: Optional[threading.Event] = None) -> None:
+        cancel = cancel or self.stop_event
         duration = max(0, int(duration))
-        start = time.time()
+        start = self.clock.monotonic()
         self.wait_progress = {"elapsed": 0, "remaining": duration, "total": duration, "label": label}
         interrupted = False
         try:
             while True:
-                if self.stop_event.is_set():
+                if cancel.is_set():
                     interrupted = True
                     break
-                elapsed = time.time() - start
+                elapsed = self.clock.monotonic() - start
                 elapsed_int = max(0, int(elapsed))
                 remaining = max(0, duration - elapsed_int)
                 self.wait_progress = {"elapsed": elapsed_int, "remaining": remaining, "total": duration, "label": label}
                 if elapsed >= duration:
                     break
-                time.sleep(0.2)
+                self.clock.wait(cancel, 0.2)
         finally:
             self.wait_progress = None
             if interrupted:
@@ -677,14 +1005,23 @@ class AutoBananaService:
         self.stop_event.set()
         self.manual_trigger.set()
 
-    def run_once(self) -> None:
+    def run_once(self, cancel: Optional[threading.Event] = None) -> None:
+        cancel = cancel or self.stop_event
         self.current_state = "running"
-        self.config = self.read_config()
-        self.update_config_file()
-        self.account_names = self.steam_account_changer.get_steam_login_user_names()
-        self.last_run_at = datetime.now()
+        with self.config_store.lock:
+            self.load_config()
+            self.update_config_file()
+        self.store.set_rate(self.store_rate())  # the file may have been edited by hand since startup
+        self.account_names = self.steam_worker.get_steam_login_user_names()
+        self.last_run_at = self.clock.now()
         self.log_event("Starting scheduled run")
         self.switch_progress = None
+        self._prune_history()
+        self.current_run_id = self.history.new_run_id()
+        run_started = self.clock.time()
+        account_passes = 0
+        done_accounts = self._begin_checkpoint(run_started)
+        fresh = self._fresh_pairs(run_started)
 
         if self.config.get("switch_steam_accounts") and self.account_names:
             total_accounts = len(self.account_names)
@@ -699,7 +1036,7 @@ class AutoBananaService:
                 "step_total": 0,
             }
             for index, account in enumerate(self.account_names, start=1):
-                if self.stop_event.is_set():
+                if cancel.is_set():
                     self.switch_progress = {
                         "total": total_accounts,
                         "completed": index - 1,
@@ -711,8 +1048,16 @@ class AutoBananaService:
                         "step_total": self.switch_progress.get("step_total", 0),
                     }
                     break
+                if account in done_accounts:
+                    continue
+                due = self._due_games(account, fresh)
+                if not due:
+                    self.log_event(f"Skipping {account}: every game already ran within the freshness window.")
+                    self.checkpoint.account_done(account)
+                    continue
 
                 self.log_event(f"Switching to account: {account}")
+                account_started = self.clock.time()
                 self.switch_progress = {
                     "total": total_accounts,
                     "completed": index - 1,
@@ -723,9 +1068,14 @@ class AutoBananaService:
                     "step": 0,
                     "step_total": 0,
                 }
-                switched = self.steam_account_changer.switch_account(account, self._switch_step_hook(account))
+                switched = self.steam_worker.switch_account(account, self._switch_step_hook(account), cancel)
+                if not switched and cancel.is_set():
+                    self.history.record("account", status="aborted", run_id=self.current_run_id, account=account, duration=self.clock.time() - account_started, ts=account_started)
+                    break
                 if not switched:
                     self.log_event(f"Skipping launches for account {account} due to switch failure.", "warning")
+                    self.history.record("account", status="failed", run_id=self.current_run_id, account=account, duration=self.clock.time() - account_started, ts=account_started)
+                    self.history.record("failure", status="failed", run_id=self.current_run_id, account=account, detail=f"Switch to {account} failed")
                     self.switch_progress = {
                         "total": total_accounts,
                         "completed": index - 1,
@@ -744,8 +1094,12 @@ class AutoBananaService:
                     "message": f"Launching games for {account}",
                     "detail": "Launching configured games",
                 }
-                self.open_games(self.config.get("time_to_wait", 60))
+                self.open_games(self.config.get("time_to_wait", 60), account, cancel, due)
+                self.history.record("account", run_id=self.current_run_id, account=account, duration=self.clock.time() - account_started, ts=account_started)
+                if not cancel.is_set():
+                    self.checkpoint.account_done(account)
                 self.game_open_count += 1
+                account_passes += 1
                 self.switch_progress = {
                     "total": total_accounts,
                     "completed": index,
@@ -758,21 +1112,89 @@ class AutoBananaService:
                 }
             self.switch_progress = None
         else:
-            if not self.stop_event.is_set():
-                self.open_games(self.config.get("time_to_wait", 60))
+            due = self._due_games(None, fresh)
+            if not due:
+                self.log_event("Skipping this run: every game already ran within the freshness window.")
+            elif not cancel.is_set() and "" not in done_accounts:
+                account_started = self.clock.time()
+                self.open_games(self.config.get("time_to_wait", 60), cancel=cancel, games=due)
+                self.history.record("account", run_id=self.current_run_id, duration=self.clock.time() - account_started, ts=account_started)
+                if not cancel.is_set():
+                    self.checkpoint.account_done(None)
                 self.game_open_count += 1
+                account_passes += 1
+
+        self.history.record(
+            "run",
+            status="aborted" if cancel.is_set() else "ok",
+            run_id=self.current_run_id,
+            duration=self.clock.time() - run_started,
+            detail=f"{account_passes} account pass(es)" + (f", resumed after {len(done_accounts)} done" if done_accounts else ""),
+            ts=run_started,
+        )
+        self.current_run_id = None
 
-        if self.stop_event.is_set():
+        if cancel.is_set():
+            # The checkpoint stays, so a restart within this interval carries on from here.
             try:
-                self.steam_account_changer._restore_loginusers_backup()
+                self.steam_worker.restore_loginusers_backup()
             except Exception:
                 pass
             self.current_state = "stopped"
             return
 
+        self.checkpoint.finish()
         self.schedule_next_run()
         self.current_state = "waiting"
 
+    def _prune_history(self) -> None:
+        """Drop history rows older than ``history_retention_days`` so the database stays bounded."""
+        days = max(0, int(self.config.get("history_retention_days", 365)))
+        if not days:
+            return
+        removed = self.history.prune(self.clock.time() - days * 86400)
+        if removed:
+            logger.info(f"Pruned {removed} history row(s) older than {days} day(s)")
+
+    def _fresh_pairs(self, now: float) -> Dict[str, Dict[str, float]]:
+        """(account, game) pairs that finished within ``freshness_window_seconds`` of ``now``."""
+        if self._force_run:
+            self._force_run = False
+            return {}
+        window = max(0, int(self.config.get("freshness_window_seconds", 3600)))
+        # Scheduled runs start at least one interval after the last completion; never let the window swallow them.
+        window = min(window, max(0, int(self.config.get("run_interval_seconds", 10800)) - 1))
+        return self.history.completed_since(now - window) if window else {}
+
+    def _due_games(self, account: Optional[str], fresh: Dict[str, Dict[str, float]]) -> List[str]:
+        games = self.config.get("games", [])
+        recent = fresh.get(account or "", {})
+        due = [game_id for game_id in games if game_id not in recent]
+        if due and len(due) < len(games):
+            skipped = len(games) - len(due)
+            label = f" for {account}" if account else ""
+            self.log_event(f"{skipped} game(s){label} already ran within the freshness window; launching {len(due)}.")
+        return due
+
+    def _begin_checkpoint(self, now: float) -> Set[str]:
+        """Resume the checkpoint of an interrupted run from this interval, or start a new one.
+
+        Returns the accounts that run already finished.
+        """
+        games = self.config.get("games", [])
+        rotating = bool(self.config.get("switch_steam_accounts") and self.account_names)
+        interval = max(1, int(self.config.get("run_interval_seconds", 10800)))
+        state = self.checkpoint.resumable(now, interval, games, rotating)
+        if not state:
+            self.checkpoint.begin(now, self.account_names if rotating else [], games, rotating)
+            return set()
+        self.checkpoint.resume(state)
+        done = self.checkpoint.done_accounts()
+        started = datetime.fromtimestamp(state["started_at"]).strftime("%H:%M")
+        total = len(self.account_names) if rotating else 1
+        self.log_event(f"Resuming the run started at {started}: {len(done)} of {total} account pass(es) already done.", "warning")
+        return {account for account in done if account} if rotating else done
+
     # ------------------------------------------------------------
     # Scheduler
     # ------------------------------------------------------------
@@ -782,50 +1204,99 @@ class AutoBananaService:
         self.stop_event = threading.Event()
         self.paused = False
         self.schedule_next_run()
+        interval = max(1, int(self.config.get("run_interval_seconds", 10800)))
+        if self.checkpoint.resumable(self.clock.time(), interval, self.config.get("games", [])):
+            self.log_event("Found an unfinished run from this interval; resuming it now.", "warning")
+            self.manual_trigger.set()
         self.worker_thread = threading.Thread(target=self._runner_loop, daemon=True)
         self.worker_thread.start()
         self.current_state = "waiting"
         self.log_event("Scheduler started")
 
     def _runner_loop(self) -> None:
-        while not self.stop_event.is_set():
+        stop_event = self.stop_event
+        while not stop_event.is_set():
             if self.paused:
-                time.sleep(0.5)
+                self.clock.wait(stop_event, 0.5)
                 continue
             if self.manual_trigger.is_set():
                 self.manual_trigger.clear()
-                self.run_once()
+                self._end_deferral("manual")
+                self.run_once(stop_event)
                 continue
 
-            if self.next_run_at and datetime.now() >= self.next_run_at:
-                self.run_once()
+            if self.next_run_at and self.clock.now() >= self.next_run_at:
+                if self._defer_scheduled_run():
+                    # Short steps, so "Run now" does not sit behind a whole check interval.
+                    for _ in range(utils.run_deferral.CHECK_INTERVAL_SECONDS):
+                        if self.manual_trigger.is_set() or self.clock.wait(stop_event, 1):
+                            break
+                    continue
+                self.run_once(stop_event)
                 continue
 
-            time.sleep(1)
+            self.clock.wait(stop_event, 1)
+
+    def _defer_scheduled_run(self) -> bool:
+        """True while a due scheduled run should keep waiting for the host to go idle."""
+        if not self.config.get("defer_when_busy", False):
+            return False
+        self.deferral.configure(
+            int(self.config.get("defer_cpu_percent", 80)), self.config.get("defer_processes", []), int(self.config.get("defer_max_seconds", 3600))
+        )
+        was_deferring = self.deferral.active
+        stop_event = self.stop_event
+        verdict = self.deferral.check(self.clock.time(), lambda seconds: self.clock.wait(stop_event, seconds))
+        if verdict == "stopped":
+            return True  # the runner loop sees the stop event and exits
+        if verdict == "wait":
+            if not was_deferring:
+                limit = self.deferral.max_delay_seconds
+                self.log_event(f"Deferring the scheduled run for up to {int(limit)}s: {'; '.join(self.deferral.reasons)}", "warning")
+            return True
+        self._end_deferral(verdict)
+        return False
+
+    def _end_deferral(self, outcome: str) -> None:
+        summary = self.deferral.finish(self.clock.time(), outcome)
+        if not summary:
+            return
+        reasons = "; ".join(summary["reasons"])
+        if outcome == "max_delay":
+            self.log_event(f"Running anyway after deferring {summary['seconds']:.0f}s; host still busy ({reasons}).", "warning")
+        elif outcome == "idle":
+            self.log_event(f"Host is idle again; running after a {summary['seconds']:.0f}s deferral.")
+        self.history.record(
+            "deferral", status="ok" if outcome == "idle" else outcome, duration=summary["seconds"], ts=summary["since"], detail=reasons
+        )
 
     def schedule_next_run(self, respect_existing: bool = False) -> None:
         interval = max(1, int(self.config.get("run_interval_seconds", 10800)))
         if respect_existing and self.next_run_at:
             return
-        self.next_run_at = datetime.now() + timedelta(seconds=interval)
+        self.next_run_at = self.clock.now() + timedelta(seconds=interval)
         self.current_state = "waiting"
 
-    def trigger_manual_run(self) -> None:
+    def trigger_manual_run(self, force: bool = False) -> None:
+        """Queue a run now; ``force`` ignores the freshness window for that run."""
         self.ensure_worker()
+        if force:
+            self._force_run = True
         self.manual_trigger.set()
 
     def stop(self) -> None:
         self.stop_event.set()
         if self.worker_thread:
             self.worker_thread.join(timeout=3)
-        self.release_lock()
         self.switch_progress = None
         self.current_state = "stopped"
         self.log_event("Scheduler stopped", "warning")
+        self._end_deferral("stopped")
         try:
-            self.steam_account_changer._restore_loginusers_backup()
+            self.steam_worker.restore_loginusers_backup()
         except Exception:
             pass
+        self.steam_worker.shutdown()
 
     def pause_scheduler(self) -> None:
         self.paused = True
@@ -837,25 +1308,38 @@ class AutoBananaService:
         self.switch_progress = None
         self.current_state = "stopped"
         self.log_event("Scheduler paused", "warning")
+        self._end_deferral("stopped")
         # Force close any running games
         self._force_close_games()
         try:
-            self.steam_account_changer._restore_loginusers_backup()
+            self.steam_worker.restore_loginusers_backup()
         except Exception:
             pass
 
     def _force_close_games(self) -> None:
         """Terminate all currently running games that were opened by AutoBanana."""
-        all_games = self.get_steam_games()
-        if not all_games:
+        all_games = self.get_game_matcher()
+        if not len(all_games):
             return
-        for proc in psutil.process_iter(["pid", "name"]):
-            try:
-                if proc.info.get("name") in all_games:
-                    proc.terminate()
-                    self.log_event(f"Force closed {proc.info['name']} (PID: {proc.info['pid']})", "warning")
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        snapshot = self.process_snapshot()
+        if snapshot is None:
+            return
+        closed: Set[int] = set()
+        signalled: List[psutil.Process] = []
+        for proc, _app_id in snapshot.matching(all_games):
+            if proc.info["pid"] in closed:
                 continue
+            tree = snapshot.tree(proc, exclude=closed)
+            closed.update(member.info["pid"] for member in tree)
+            members = utils.process_tree.terminate_all(tree)  # children too, even if the game itself is gone
+            if not members:
+                continue
+            signalled += members
+            children = [member for member in members if member is not proc]
+            suffix = f" and {len(children)} child process(es)" if children else ""
+            self.log_event(f"Force closed {proc.info['name']} (PID: {proc.info['pid']}){suffix}", "warning")
+        # Short grace, then kill whatever ignores SIGTERM (anti-cheat helpers often do).
+        self._wait_for_exit(signalled, threading.Event(), grace_seconds=3)
 
     def _switch_step_hook(self, account_name: str):
         def hook(step_idx: int, total_steps: int, detail: str) -> None:
@@ -879,7 +1363,7 @@ class AutoBananaService:
         if self.current_state != "waiting":
             return False, "Manual switching is only allowed while the scheduler is waiting."
 
-        self.account_names = self.steam_account_changer.get_steam_login_user_names()
+        self.account_names = self.steam_worker.get_steam_login_user_names()
         match = next((name for name in self.account_names if name.lower() == account_name.lower()), None)
         if not match:
             return False, f"Account '{account_name}' is not in the remembered list."
@@ -899,12 +1383,12 @@ class AutoBananaService:
         }
 
         try:
-            switched = self.steam_account_changer.switch_account(match, self._switch_step_hook(match))
+            switched = self.steam_worker.switch_account(match, self._switch_step_hook(match))
         finally:
             self.current_state = previous_state
             try:
                 # Ensure loginusers.vdf is restored even if SteamAccountChanger bails early
-                self.steam_account_changer._restore_loginusers_backup()
+                self.steam_worker.restore_loginusers_backup()
             except Exception:
                 self.log_event("Failed to restore Steam account roster after manual switch", "warning")
 
@@ -926,7 +1410,7 @@ class AutoBananaService:
     # ------------------------------------------------------------
     def status_payload(self) -> Dict:
         # Refresh account list for accurate count in UI
-        self.account_names = self.steam_account_changer.get_steam_login_user_names()
+        self.account_names = self.steam_worker.get_steam_login_user_names()
         return {
             "config": self.config,
             "next_run_at": iso_or_none(self.next_run_at),
@@ -941,8 +1425,21 @@ class AutoBananaService:
             "interval_seconds": self.config.get("run_interval_seconds", 10800),
             "wait_progress": self.wait_progress,
             "switch_progress": self.switch_progress,
+            "log_dropped": log_writer.dropped if log_writer else 0,
+            "steam_worker": self.steam_worker.snapshot(),
+            "search_index": self.search_index.stats(),
+            "store": self.store.snapshot(),
+            "concurrency": self.concurrency.snapshot(),
+            "rotation_checkpoint": self.checkpoint.snapshot(),
+            "config_writes": self.config_store.snapshot(),
+            "deferral": {"enabled": bool(self.config.get("defer_when_busy", False)), **self.deferral.snapshot(self.clock.time())},
         }
 
+    def status_since(self, since_version: Optional[int] = None) -> Tuple[int, Optional[Dict]]:
+        """Current status version and the fields changed after ``since_version`` (None if none)."""
+        self.status_versions.update(self.status_payload())
+        return self.status_versions.since(since_version)
+
     def open_ui(self) -> None:
         try:
             webbrowser.open(self.ui_url)
@@ -993,38 +1490,267 @@ class AutoBananaService:
         self.log_event("Tray icon started")
 
 
+class SimulatedService(AutoBananaService):
+    """The real scheduler and ``run_once`` on a virtual clock, with Steam and game processes stubbed.
+
+    Used by the ``simulate`` command to project what a config does over many
+    cycles in well under a second. Config is read from ``base_config`` (a
+    copy of the user's ``config.ini``) with ``overrides`` applied, and
+    nothing is written back.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        overrides: Dict[str, Any],
+        accounts: Optional[int],
+        timings: utils.simulator.SimulationTimings,
+        base_config: Optional[Path] = None,
+    ) -> None:
+        self._work_dir = Path(work_dir)
+        # Host memory and CPU are not simulated, so batches use the static batch_size, nothing is profiled and runs are never deferred.
+        self._overrides = {"adaptive_batch": False, "profile_games": False, "defer_when_busy": False, **overrides}
+        if base_config and base_config.exists():
+            shutil.copy2(base_config, self._work_dir / "config.ini")
+        super().__init__()
+        detected = self.steam_worker.get_steam_login_user_names()
+        count = accounts if accounts is not None else max(1, len(detected))
+        self.clock = utils.clock.VirtualClock(start=time.time())
+        self.processes = utils.simulator.SimulatedProcessTable(self.clock, timings)
+        self.steam_worker = utils.simulator.SimulatedSteamWorker(self.clock, [f"account{index}" for index in range(1, count + 1)], timings)
+        self.report = utils.simulator.SimulationReport()
+        self._target_cycles = 0
+
+    def _resolve_config_path(self) -> Path:
+        return self._work_dir / "config.ini"
+
+    def _bootstrap_config_storage(self) -> None:
+        pass
+
+    def _mirror_config_to_legacy(self) -> None:
+        pass
+
+    def read_config(self) -> Dict:
+        return {**super().read_config(), **self._overrides}
+
+    def write_config(self) -> None:
+        pass
+
+    def update_config_file(self) -> None:
+        pass
+
+    def apply_startup_setting(self) -> None:
+        pass
+
+    def register_usage(self) -> None:
+        pass
+
+    def rebuild_search_index(self, wait: bool = False) -> None:
+        pass
+
+    def log_event(self, message: str, level: str = "info") -> None:
+        self.events.append({"timestamp": self.clock.time(), "level": level, "message": message})
+
+    def get_game_matcher(self) -> utils.process_match.InstallPathMatcher:
+        return utils.process_match.InstallPathMatcher(
+            {app_id: f"{utils.simulator.SIMULATED_LIBRARY}/{app_id}" for app_id in self.config.get("games", [])}, windows=False
+        )
+
+    def launch_game(self, game_id: str) -> str:
+        self.processes.launch(f"Game{game_id}.exe", f"{utils.simulator.SIMULATED_LIBRARY}/{game_id}/Game{game_id}.exe")
+        return f"steam://rungameid/{game_id}"
+
+    def process_snapshot(self) -> Optional[utils.process_tree.ProcessSnapshot]:
+        return None  # simulated games have no children, and their fake PIDs must never reach the real process table
+
+    def find_running_steam_games(
+        self, matcher: utils.process_match.InstallPathMatcher, snapshot: Optional[utils.process_tree.ProcessSnapshot] = None
+    ) -> List[Tuple[psutil.Process, datetime, timedelta]]:
+        running_games = []
+        for proc in list(self.processes.running.values()):
+            if matcher.match(proc.info):
+                start_time = datetime.fromtimestamp(proc.info["create_time"])
+                running_games.append((proc, start_time, self.clock.now() - start_time))
+        return running_games
+
+    def wait_with_progress(self, duration: int, label: str = "Waiting", cancel: Optional[threading.Event] = None) -> None:
+        started = self.clock.monotonic()
+        super().wait_with_progress(duration, label, cancel)
+        self.report.waiting_seconds += self.clock.monotonic() - started
+
+    def run_once(self, cancel: Optional[threading.Event] = None) -> None:
+        started = self.clock.monotonic()
+        super().run_once(cancel)
+        self.report.starts.append(started - self.clock.started_at)
+        self.report.cycles.append(self.clock.monotonic() - started)
+        if len(self.report.cycles) >= self._target_cycles:
+            self.stop_event.set()
+
+    def simulate(self, cycles: int) -> utils.simulator.SimulationReport:
+        """Drive the scheduler loop until ``cycles`` runs have finished."""
+        real_started = time.perf_counter()
+        self._target_cycles = max(1, cycles)
+        self.stop_event = threading.Event()
+        self.paused = False
+        self.manual_trigger.set()
+        self._runner_loop()
+
+        report = self.report
+        report.virtual_seconds = self.clock.elapsed
+        report.real_seconds = time.perf_counter() - real_started
+        report.steam_restarts = self.steam_worker.restarts
+        report.failed_switches = self.steam_worker.failed_switches
+        report.launches = self.processes.launches
+        report.closes = self.processes.closes
+        report.left_running = len(self.processes.running)
+        report.peak_concurrent_games = self.processes.peak
+        report.account_passes = self.game_open_count
+        self.history.close()
+        return report
+
+
 service: Optional[AutoBananaService] = None
+fleet_controller: Optional[utils.fleet.FleetController] = None
 shutdown_event = threading.Event()
-app = Flask(__name__, static_folder="web/static", template_folder="web/templates")
+api_token: Optional[str] = None  # required on every request once the server binds beyond loopback
+# Routes are collected on a blueprint; the Flask app and asset pipeline are only built by ``create_app``.
+routes = Blueprint("autobanana", __name__)
+app: Optional[Flask] = None
+assets: Optional[utils.assets.AssetPipeline] = None
+
+
+def create_app() -> Flask:
+    global app, assets
+
+    if app is None:
+        assets = utils.assets.AssetPipeline(STATIC_DIR, STATIC_DIR / "dist")
+        app = Flask(__name__, static_folder="web/static", template_folder="web/templates")
+        app.register_blueprint(routes)
+    return app
+
+
+@routes.app_context_processor
+def inject_asset_url():
+    return {"asset_url": assets.url_for}
+
+
+API_TOKEN_HEADER = "X-AutoBanana-Token"
+API_TOKEN_COOKIE = "autobanana_token"
+
+
+def is_loopback_host(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
 
+@routes.before_app_request
+def check_api_token():
+    """Reject requests without the shared token when the server is reachable from other hosts.
 
-@app.route("/")
+    Scripts and the fleet controller send it as ``X-AutoBanana-Token``. A
+    browser opens the dashboard once with ``?token=...``; the token is then
+    kept in a cookie so the dashboard's own API calls carry it.
+    """
+    if not api_token:
+        return None
+    supplied = request.headers.get(API_TOKEN_HEADER) or request.args.get("token") or request.cookies.get(API_TOKEN_COOKIE) or ""
+    if not hmac.compare_digest(supplied.encode("utf-8"), api_token.encode("utf-8")):
+        return jsonify({"error": "Missing or invalid API token"}), 401
+    return None
+
+
+@routes.after_app_request
+def remember_api_token(response):
+    if api_token and request.args.get("token") == api_token:
+        response.set_cookie(API_TOKEN_COOKIE, api_token, httponly=True, samesite="Strict")
+    return response
+
+
+@routes.after_app_request
+def compress_response(response):
+    """Gzip API and page responses for clients that accept it."""
+    if service and not service.config.get("compress_responses", True):
+        return response
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code >= 300
+        or "Content-Encoding" in response.headers
+        or "gzip" not in request.headers.get("Accept-Encoding", "").lower()
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=5))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@routes.route("/")
 def index():
+    if fleet_controller and not service:
+        return redirect("/fleet")
     if not service:
         return "Service not ready", 503
     return render_template("index.html", theme=service.config.get("theme", "fire"))
 
 
-@app.route("/settings")
+@routes.route("/settings")
 def settings():
     if not service:
         return "Service not ready", 503
     return render_template("settings.html", theme=service.config.get("theme", "fire"))
 
 
-@app.route("/api/ping")
+@routes.route("/fleet")
+def fleet_view():
+    if not fleet_controller:
+        return "Fleet controller not running", 404
+    return render_template("fleet.html", fleet=fleet_controller.snapshot())
+
+
+@routes.route("/api/fleet")
+def api_fleet():
+    if not fleet_controller:
+        return jsonify({"error": "Fleet controller not running"}), 404
+    return jsonify(fleet_controller.snapshot())
+
+
+@routes.route("/api/ping")
 def api_ping():
     return jsonify({"ok": True})
 
 
-@app.route("/api/status")
+@routes.route("/api/status")
 def api_status():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
-    return jsonify(service.status_payload())
-
-
-@app.route("/api/logs")
+    since_param = request.args.get("since_version")
+    try:
+        since_version = int(since_param) if since_param else None
+    except ValueError:
+        return jsonify({"error": "since_version must be an integer"}), 400
+
+    version, fields = service.status_since(since_version)
+    etag = f'"{version}"'
+    if since_version is None and etag in request.headers.get("If-None-Match", ""):
+        response = app.response_class(status=304)
+    elif fields is None:
+        response = jsonify({"version": version, "unchanged": True})
+    else:
+        response = jsonify({**fields, "version": version, "delta": since_version is not None})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@routes.route("/api/logs")
 def api_logs():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1033,15 +1759,91 @@ def api_logs():
     return jsonify({"events": events, "latest": events[-1]["timestamp"] if events else since})
 
 
-@app.route("/api/run", methods=["POST"])
+def _parse_time_param(value: Optional[str]) -> Optional[float]:
+    """Accept epoch seconds or an ISO-8601 timestamp."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+@routes.route("/api/history")
+def api_history():
+    if not service:
+        return jsonify({"error": "Service not ready"}), 503
+    try:
+        limit = min(1000, max(1, int(request.args.get("limit", 100))))
+        offset = max(0, int(request.args.get("offset", 0)))
+        bucket = int(request.args.get("bucket", 86400))
+    except ValueError:
+        return jsonify({"error": "limit, offset and bucket must be integers"}), 400
+    filters = {
+        "start": _parse_time_param(request.args.get("start")),
+        "end": _parse_time_param(request.args.get("end")),
+        "kinds": [kind.strip() for kind in request.args.get("kind", "").split(",") if kind.strip()],
+        "account": request.args.get("account") or None,
+        "app_id": request.args.get("app_id") or None,
+    }
+    events, total = service.history.query(limit=limit, offset=offset, **filters)
+    payload = {"events": events, "total": total, "limit": limit, "offset": offset}
+    if request.args.get("aggregates", "").lower() in ("1", "true", "yes"):
+        payload["aggregates"] = service.history.aggregates(bucket_seconds=bucket, **filters)
+    return jsonify(payload)
+
+
+@routes.route("/api/profiles")
+def api_profiles():
+    if not service:
+        return jsonify({"error": "Service not ready"}), 503
+    return jsonify(service.game_profiles(app_id=request.args.get("app_id") or None, since=_parse_time_param(request.args.get("since"))))
+
+
+def _parse_bool_param(value: Optional[str]) -> Optional[bool]:
+    if value is None or value == "":
+        return None
+    return value.lower() in ("1", "true", "yes")
+
+
+@routes.route("/api/library")
+def api_library():
+    if not service:
+        return jsonify({"error": "Service not ready"}), 503
+    try:
+        limit = min(1000, max(1, int(request.args.get("limit", 100))))
+        offset = max(0, int(request.args.get("offset", 0)))
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    try:
+        payload = service.list_library(
+            limit=limit,
+            offset=offset,
+            search=request.args.get("q") or None,
+            sort=request.args.get("sort", "name"),
+            descending=request.args.get("order", "asc").lower() == "desc",
+            installed=_parse_bool_param(request.args.get("installed")),
+            configured=_parse_bool_param(request.args.get("configured")),
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify(payload)
+
+
+@routes.route("/api/run", methods=["POST"])
 def api_run():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
-    service.trigger_manual_run()
+    payload = request.get_json(force=True, silent=True) or {}
+    service.trigger_manual_run(force=bool(payload.get("force")) if isinstance(payload, dict) else False)
     return jsonify({"status": "queued"})
 
 
-@app.route("/api/stop", methods=["POST"])
+@routes.route("/api/stop", methods=["POST"])
 def api_stop():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1049,7 +1851,7 @@ def api_stop():
     return jsonify({"status": "stopped"})
 
 
-@app.route("/api/config", methods=["POST"])
+@routes.route("/api/config", methods=["POST"])
 def api_config():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1058,7 +1860,23 @@ def api_config():
     return jsonify(service.status_payload())
 
 
-@app.route("/api/steam/apps")
+@routes.route("/api/games/import", methods=["POST"])
+def api_games_import():
+    if not service:
+        return jsonify({"error": "Service not ready"}), 503
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {"text": request.get_data(as_text=True)}
+    if isinstance(payload, dict):
+        options = payload
+        source = next((payload[key] for key in ("ids", "text", "export") if key in payload), payload)
+    else:
+        options, source = {}, payload
+    result = service.import_games(source, replace=bool(options.get("replace")), dry_run=bool(options.get("dry_run")))
+    return jsonify(result)
+
+
+@routes.route("/api/steam/apps")
 def api_steam_apps():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1069,11 +1887,11 @@ def api_steam_apps():
     ids.extend([value.strip() for value in request.args.getlist("id") if value.strip()])
     if not ids:
         return jsonify({"apps": {}})
-    details = service.get_steam_app_infos(ids)
-    return jsonify({"apps": details})
+    details, pending = service.lookup_app_infos(ids)
+    return jsonify({"apps": details, "pending": pending})
 
 
-@app.route("/api/steam/search")
+@routes.route("/api/steam/search")
 def api_steam_search():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1082,7 +1900,21 @@ def api_steam_search():
     return jsonify({"results": results})
 
 
-@app.route("/api/switch-account", methods=["POST"])
+@routes.route("/api/steam/applist", methods=["POST"])
+def api_steam_applist():
+    if not service:
+        return jsonify({"error": "Service not ready"}), 503
+    payload = request.get_json(force=True, silent=True)
+    if payload is None:
+        return jsonify({"error": "Expected a JSON app list"}), 400
+    try:
+        stats = service.import_app_list(payload)
+    except (OSError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"status": "ok", "search_index": stats})
+
+
+@routes.route("/api/switch-account", methods=["POST"])
 def api_switch_account():
     if not service:
         return jsonify({"error": "Service not ready"}), 503
@@ -1094,26 +1926,47 @@ def api_switch_account():
     return jsonify({"error": message}), 400
 
 
-@app.route("/static/<path:path>")
-def send_static(path):
-    return send_from_directory(app.static_folder, path)
+@routes.route("/assets/<path:filename>")
+def send_asset(filename):
+    resolved = assets.resolve(filename, request.headers.get("Accept-Encoding", ""))
+    if not resolved:
+        return "Not found", 404
+    served_name, encoding = resolved
+    response = send_from_directory(str(assets.build_dir), served_name, mimetype=mimetypes.guess_type(filename)[0])
+    response.headers["Cache-Control"] = utils.assets.IMMUTABLE_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
 
 
-@app.route("/favicon.ico")
+@routes.route("/favicon.ico")
 def favicon():
     return send_from_directory(str(APP_DIR), "banana.ico")
 
 
-def start_flask():
-    app.run(host=UI_HOST, port=UI_PORT, debug=False, use_reloader=False)
-
-
-def existing_instance_running() -> bool:
+def start_flask(host: str = UI_HOST, port: int = UI_PORT) -> None:
+    """Serve the dashboard with waitress, falling back to Flask's dev server."""
+    threads = max(1, int(service.config.get("server_threads", 8))) if service else 8
+    keepalive = max(1, int(service.config.get("server_keepalive_seconds", 120))) if service else 120
     try:
-        requests.get(f"http://{UI_HOST}:{UI_PORT}/api/ping", timeout=1)
-        return True
-    except Exception:
-        return False
+        from waitress import create_server
+    except ImportError:
+        logger.warning("waitress not installed; using Flask development server")
+        create_app().run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+        return
+
+    logger.info(f"Serving UI with waitress on {host}:{port} ({threads} threads)")
+    server = create_server(
+        create_app(),
+        host=host,
+        port=port,
+        threads=threads,
+        channel_timeout=keepalive,
+        connection_limit=max(100, threads * 16),
+        ident="AutoBanana",
+    )
+    server.run()
 
 
 def register_signal_handlers():
@@ -1129,40 +1982,325 @@ def register_signal_handlers():
             signal.signal(sig, _handle)
 
 
+def build_control_server(svc: AutoBananaService, ui_enabled: bool = False) -> utils.control.ControlServer:
+    def status(_request):
+        return svc.status_payload()
+
+    def run(_request):
+        svc.trigger_manual_run()
+        return "queued"
+
+    def stop(_request):
+        svc.pause_scheduler()
+        return "stopped"
+
+    def switch(request):
+        ok, message = svc.manual_switch_account(request.get("account"))
+        if not ok:
+            raise RuntimeError(message)
+        return message
+
+    def open_ui(_request):
+        if not ui_enabled:
+            raise RuntimeError("The running instance has no web UI (started with --daemon)")
+        svc.open_ui()
+        return svc.ui_url
+
+    def quit_daemon(_request):
+        shutdown_event.set()
+        svc.initiate_shutdown("Control socket quit")
+        return "shutting down"
+
+    def tail(request):
+        since = float(request.get("since", 0))
+        backlog = [event for event in list(svc.events) if event["timestamp"] > since]
+        for event in backlog[-max(0, int(request.get("lines", 20))):]:
+            yield event
+        if backlog:
+            since = backlog[-1]["timestamp"]
+        while request.get("follow") and not shutdown_event.is_set():
+            time.sleep(0.5)
+            for event in [event for event in list(svc.events) if event["timestamp"] > since]:
+                since = event["timestamp"]
+                yield event
+
+    return utils.control.ControlServer(
+        control_socket_path(),
+        {"ping": lambda _request: {"pid": os.getpid()}, "status": status, "run": run, "stop": stop, "switch": switch, "open_ui": open_ui, "quit": quit_daemon},
+        {"tail": tail},
+    )
+
+
+def format_event(event: Dict) -> str:
+    stamp = datetime.fromtimestamp(event["timestamp"]).strftime("%H:%M:%S")
+    return f"{stamp} {event['level']:<8} {event['message']}"
+
+
+def run_ctl(args: argparse.Namespace) -> int:
+    """Client side of ``AutoBanana.py ctl``; returns the process exit code."""
+    path = control_socket_path()
+    try:
+        if args.action == "tail":
+            for event in utils.control.stream_command(path, "tail", timeout=None, lines=args.lines, follow=args.follow):
+                print(format_event(event), flush=True)
+            return 0
+        if args.action == "switch":
+            if not args.account:
+                print("Usage: AutoBanana.py ctl switch <account>")
+                return 2
+            result = utils.control.send_command(path, "switch", timeout=180, account=args.account)
+        else:
+            result = utils.control.send_command(path, args.action, timeout=30)
+    except utils.control.ControlError as exc:
+        print(exc)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    print(json.dumps(result, indent=2) if isinstance(result, (dict, list)) else result)
+    return 0
+
+
+def hand_off_to_running_instance(args: argparse.Namespace, wait_seconds: float = 5) -> int:
+    """Pass this launch's request to the instance holding the lock; return the exit code.
+
+    The holder may still be starting up, so the control socket is retried for
+    up to ``wait_seconds``. Without Unix sockets the request goes to the web API.
+    """
+    command = "run" if args.run_now else ("ping" if args.daemon else "open_ui")
+    if not utils.control.control_supported():
+        return hand_off_over_http(args, command, wait_seconds)
+
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            result = utils.control.send_command(control_socket_path(), command, timeout=5)
+            break
+        except utils.control.ControlError as exc:
+            if time.monotonic() >= deadline or "not running" not in str(exc):
+                print(f"AutoBanana is already running, but it did not accept the request: {exc}")
+                return 1
+            time.sleep(0.05)
+
+    if command == "run":
+        print("AutoBanana is already running. Queued a run on it.")
+    elif command == "open_ui":
+        print(f"AutoBanana is already running. Opened {result}.")
+    else:
+        print(f"AutoBanana is already running (PID {result['pid']}).")
+    return 0
+
+
+def hand_off_over_http(args: argparse.Namespace, command: str, wait_seconds: float) -> int:
+    """``hand_off_to_running_instance`` through the web API, for platforms without Unix sockets."""
+    host = UI_HOST if args.host in ("0.0.0.0", "::") else args.host
+    url = f"http://{host}:{args.port}"
+    headers = {API_TOKEN_HEADER: args.token} if args.token else None
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            if command == "run":
+                response = requests.post(f"{url}/api/run", headers=headers, timeout=5)
+            else:
+                response = requests.get(f"{url}/api/ping", headers=headers, timeout=5)
+            if response.status_code == 503 and time.monotonic() < deadline:
+                time.sleep(0.25)  # web server is up, service not ready yet
+                continue
+            response.raise_for_status()
+            break
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            # The holder may still be starting, or it runs without the web UI.
+            if time.monotonic() >= deadline:
+                print(f"AutoBanana is already running, but its web API at {url} did not answer: {exc}")
+                return 1
+            time.sleep(0.25)
+        except requests.RequestException as exc:
+            print(f"AutoBanana is already running, but it did not accept the request: {exc}")
+            return 1
+
+    if command == "run":
+        print("AutoBanana is already running. Queued a run on it.")
+    elif command == "open_ui":
+        webbrowser.open(url)
+        print(f"AutoBanana is already running. Opened {url}.")
+    else:
+        print("AutoBanana is already running.")
+    return 0
+
+
+def require_token_for_host(args: argparse.Namespace) -> bool:
+    """Arm the API token check for ``args.host``; False if the host is not loopback and no token was given."""
+    global api_token
+
+    if is_loopback_host(args.host):
+        api_token = args.token or None
+        return True
+    if not args.token:
+        print(
+            f"Refusing to serve on {args.host} without --token (or AUTOBANANA_TOKEN): "
+            "the API can change the config, start runs and switch Steam accounts.",
+            file=sys.stderr,
+        )
+        return False
+    api_token = args.token
+    return True
+
+
+def run_fleet(args: argparse.Namespace) -> None:
+    """Run as a fleet controller that drives remote agents over their HTTP API."""
+    global fleet_controller
+
+    if not require_token_for_host(args):
+        sys.exit(2)
+    games = [game.strip() for game in args.games.split(",") if game.strip()] if args.games else None
+    fleet_controller = utils.fleet.FleetController(args.agent, args.interval, games=games, poll_seconds=args.poll, token=args.token)
+    register_signal_handlers()
+    threading.Thread(target=start_flask, args=(args.host, args.port), daemon=True).start()
+    print(f"Fleet view at http://{args.host}:{args.port}/fleet")
+    try:
+        fleet_controller.run_forever(shutdown_event)
+    except KeyboardInterrupt:
+        shutdown_event.set()
+
+
+def run_simulation(args: argparse.Namespace) -> int:
+    """Project cycle time, Steam restarts and game concurrency for a config without touching Steam."""
+    overrides: Dict[str, Any] = {}
+    for key, value in (
+        ("batch_size", args.batch_size),
+        ("time_to_wait", args.time_to_wait),
+        ("run_interval_seconds", args.interval),
+        ("switch_steam_accounts", args.switch_accounts),
+    ):
+        if value is not None:
+            overrides[key] = value
+    if args.games is not None:
+        overrides["games"] = [str(10 * (index + 1)) for index in range(args.games)]
+    timings = utils.simulator.SimulationTimings(
+        switch_seconds=args.switch_seconds,
+        game_exit_seconds=args.exit_seconds,
+        switch_failure_rate=args.switch_failure_rate,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="autobanana_sim_") as work_dir:
+        svc = SimulatedService(Path(work_dir), overrides, args.accounts, timings, base_config=resolve_config_dir() / "config.ini")
+        if not svc.config.get("games"):
+            print("No games configured; pass --games N to simulate N games.", file=sys.stderr)
+            return 2
+        report = svc.simulate(args.cycles).to_dict()
+        config = svc.config
+
+    if args.json:
+        print(json.dumps({"config": {key: config.get(key) for key in ("batch_size", "time_to_wait", "run_interval_seconds", "switch_steam_accounts")}, **report}, indent=2))
+        return 0
+    accounts = len(svc.steam_worker.accounts) if config.get("switch_steam_accounts") else 1
+    print(
+        f"Config: {len(config['games'])} game(s), batch {config['batch_size']}, wait {config['time_to_wait']}s, "
+        f"interval {config['run_interval_seconds']}s, {accounts} account(s)"
+    )
+    print(f"Simulated {report['cycles']} cycle(s) over {report['virtual_seconds'] / 3600:.1f} h in {report['real_seconds']:.2f} s")
+    print(f"  cycle time        {report['cycle_seconds_mean']:.0f} s mean, {report['cycle_seconds_max']:.0f} s max (start to start {report['period_seconds_mean']:.0f} s)")
+    print(f"  waiting in runs   {report['waiting_seconds']:.0f} s; idle between runs {report['idle_seconds']:.0f} s")
+    print(f"  Steam restarts    {report['steam_restarts']} ({report['failed_switches']} failed switch(es))")
+    print(f"  games             {report['launches']} launched, {report['closes']} closed, peak {report['peak_concurrent_games']} running at once")
+    if report["left_running"]:
+        print(f"  warning           {report['left_running']} game(s) were never closed; close_games only closes games younger than 90 s")
+    print(f"  throughput        {report['launches_per_hour']:.1f} launches/hour, {report['account_passes']} account pass(es)")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="AutoBanana", description="Open and close Steam games on a schedule.")
+    parser.add_argument("--daemon", action="store_true", help="run headless: scheduler and control socket only, no browser or tray")
+    parser.add_argument("--ui", action="store_true", help="with --daemon, also serve the web dashboard")
+    parser.add_argument("--host", default=UI_HOST, help="address the web UI/API binds to; any non-loopback address requires --token")
+    parser.add_argument("--token", default=os.environ.get("AUTOBANANA_TOKEN"), help="shared API token (default: $AUTOBANANA_TOKEN)")
+    parser.add_argument("--port", type=int, default=UI_PORT, help="port of the web UI/API")
+    parser.add_argument("--run-now", action="store_true", help="start a run immediately (or queue one on the instance that is already running)")
+    subparsers = parser.add_subparsers(dest="command")
+    fleet = subparsers.add_parser("fleet", help="coordinate several AutoBanana agents from one controller")
+    fleet.add_argument("--agent", action="append", required=True, help="agent base URL, e.g. http://10.0.0.5:5055 (repeatable)")
+    fleet.add_argument("--interval", type=int, default=10800, help="seconds between runs on each agent")
+    fleet.add_argument("--games", help="comma-separated app IDs to split across agents (default: leave agent configs alone)")
+    fleet.add_argument("--poll", type=float, default=5, help="seconds between agent status polls")
+    fleet.add_argument("--host", default=UI_HOST, help="address the fleet view binds to; any non-loopback address requires --token")
+    fleet.add_argument("--token", default=os.environ.get("AUTOBANANA_TOKEN"), help="API token shared with the agents (default: $AUTOBANANA_TOKEN)")
+    fleet.add_argument("--port", type=int, default=UI_PORT + 5, help="port of the fleet view")
+    simulate = subparsers.add_parser("simulate", help="dry-run the scheduler on a virtual clock and project cycle time and restarts")
+    simulate.add_argument("--cycles", type=int, default=8, help="number of scheduled runs to simulate")
+    simulate.add_argument("--batch-size", type=int, help="override batch_size")
+    simulate.add_argument("--time-to-wait", type=int, help="override time_to_wait (seconds)")
+    simulate.add_argument("--interval", type=int, help="override run_interval_seconds")
+    simulate.add_argument("--switch-accounts", action=argparse.BooleanOptionalAction, help="override switch_steam_accounts")
+    simulate.add_argument("--accounts", type=int, help="number of Steam accounts (default: the ones saved on this machine)")
+    simulate.add_argument("--games", type=int, help="simulate this many games instead of the configured list")
+    simulate.add_argument("--switch-seconds", type=float, default=25.0, help="time one account switch takes, Steam restart included")
+    simulate.add_argument("--exit-seconds", type=float, default=2.0, help="time a game takes to exit after being asked to close")
+    simulate.add_argument("--switch-failure-rate", type=float, default=0.0, help="share of account switches that fail (0-1)")
+    simulate.add_argument("--json", action="store_true", help="print the report as JSON")
+    ctl = subparsers.add_parser("ctl", help="control a running AutoBanana over its local socket")
+    ctl.add_argument("action", choices=("status", "run", "stop", "switch", "tail", "quit"))
+    ctl.add_argument("account", nargs="?", help="account name for 'switch'")
+    ctl.add_argument("-f", "--follow", action="store_true", help="keep streaming new events for 'tail'")
+    ctl.add_argument("-n", "--lines", type=int, default=20, help="number of past events for 'tail'")
+    return parser.parse_args(argv)
+
+
 def main():
     global service
 
-    if existing_instance_running():
-        webbrowser.open(f"http://{UI_HOST}:{UI_PORT}")
-        print("Another AutoBanana instance is already running. Opening the UI instead.")
+    args = parse_args()
+    setup_logging()
+    if args.command == "ctl":
+        sys.exit(run_ctl(args))
+    if args.command == "fleet":
+        run_fleet(args)
         return
+    if args.command == "simulate":
+        sys.exit(run_simulation(args))
 
-    svc = AutoBananaService()
-    if not svc.acquire_lock():
-        webbrowser.open(f"http://{UI_HOST}:{UI_PORT}")
-        print("AutoBanana is already running. Opening the existing UI.")
-        return
+    headless = args.daemon
+    if not require_token_for_host(args):
+        sys.exit(2)
+    instance_lock = utils.instance_lock.InstanceLock(instance_lock_path())
+    if not instance_lock.acquire():
+        sys.exit(hand_off_to_running_instance(args))
 
+    svc = AutoBananaService()
+    svc.ui_url = f"http://{UI_HOST if args.host in ('0.0.0.0', '::') else args.host}:{args.port}"
     service = svc
     register_signal_handlers()
     service.start()
+    if args.run_now:
+        service.trigger_manual_run()
+
+    ui_enabled = not headless or args.ui
+    control_server = build_control_server(service, ui_enabled)
+    control_server.start()
 
-    flask_thread = threading.Thread(target=start_flask, daemon=True)
-    flask_thread.start()
+    flask_thread: Optional[threading.Thread] = None
+    if ui_enabled:
+        create_app()
+        assets.ensure_built()
+        flask_thread = threading.Thread(target=start_flask, args=(args.host, args.port), daemon=True)
+        flask_thread.start()
 
-    service.start_tray_icon()
-    service.open_ui()
+    if not headless:
+        service.start_tray_icon()
+        service.open_ui()
 
     try:
-        while flask_thread.is_alive() and not shutdown_event.is_set():
-            time.sleep(1)
+        while not shutdown_event.is_set() and (flask_thread is None or flask_thread.is_alive()):
+            shutdown_event.wait(1)
     except KeyboardInterrupt:
         print("\nKeyboardInterrupt received. Stopping AutoBanana...")
         shutdown_event.set()
         service.initiate_shutdown("KeyboardInterrupt")
     finally:
+        control_server.stop()
         service.stop()
+        instance_lock.release()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
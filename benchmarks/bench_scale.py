@@ -0,0 +1,85 @@
+"""Scaling benchmarks for the Steam-facing code paths.
+
+Runs against synthetic Steam trees from ``fake_steam`` and prints one timing
+row per scenario, so a regression in how a path scales with the number of
+games or accounts shows up as a jump between rows.
+
+Usage: python benchmarks/bench_scale.py [--games 10,100,1000] [--accounts 1,10,50] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from fake_steam import FakeSteamAccountChanger, build_fake_steam, create_service
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of ``func`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def report(name: str, scale: str, millis: float) -> None:
+    print(f"{name:<32} {scale:>14} {millis:>12.2f} ms")
+
+
+def bench_games(counts: List[int], repeat: int, files_per_game: int) -> None:
+    for count in counts:
+        work_dir = tempfile.mkdtemp(prefix="autobanana_bench_")
+        try:
+            fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=count, files_per_game=files_per_game)
+            service = create_service(fake)
+            scale = f"{count} games"
+
+            report("get_game_install_path (all)", scale, time_call(lambda: [service.get_game_install_path(app_id) for app_id in fake.app_ids], repeat))
+            report("update_config_file", scale, time_call(service.update_config_file, repeat))
+            report("get_game_matcher", scale, time_call(service.get_game_matcher, repeat))
+            matcher = service.get_game_matcher()
+            report("find_running_steam_games", scale, time_call(lambda: service.find_running_steam_games(matcher), repeat))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_accounts(counts: List[int], repeat: int) -> None:
+    for count in counts:
+        work_dir = tempfile.mkdtemp(prefix="autobanana_bench_")
+        try:
+            fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=1, accounts=count)
+            changer = FakeSteamAccountChanger(fake)
+            scale = f"{count} accounts"
+
+            report("get_steam_login_user_names", scale, time_call(changer.get_steam_login_user_names, repeat))
+            target = fake.accounts[-1]
+            report("switch_account (last account)", scale, time_call(lambda: changer.switch_account(target), repeat))
+            changer.kill_steam()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def parse_counts(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=parse_counts, default=[10, 100, 1000])
+    parser.add_argument("--accounts", type=parse_counts, default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--files-per-game", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<32} {'scale':>14} {'median':>15}")
+    bench_games(args.games, args.repeat, args.files_per_game)
+    bench_accounts(args.accounts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Count config file writes for a burst of UI saves, and check none are lost.
+
+A burst of ``--posts`` ``/api/config`` requests toggles settings from several
+threads while a stand-in scheduler thread keeps re-reading the config the
+way ``run_once`` does. Two modes run:
+
+* ``per save``: the old behaviour, writing and mirroring on every request.
+* ``coalesced``: the config writer, which batches the burst.
+
+For each mode the script prints file writes, legacy mirrors, the mean and
+max request latency, and whether the file on disk matches the in-memory
+config once the burst is over. It exits non-zero if a save is lost.
+
+Usage: python benchmarks/config_writes.py [--posts 200] [--threads 8]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from fake_steam import build_fake_steam, create_service
+
+
+def burst(service, posts: int, threads: int, per_save: bool) -> Dict[str, float]:
+    import AutoBanana
+
+    AutoBanana.service = service
+    client = AutoBanana.create_app().test_client()
+    mirrors = [0]
+    service.config_store.on_flush = lambda: mirrors.__setitem__(0, mirrors[0] + 1)
+    writes_before = service.config_store.writes
+    latencies: List[float] = []
+    done = threading.Event()
+
+    def poster(offset: int) -> None:
+        for index in range(offset, posts, threads):
+            payload = {"time_to_wait": 30 + index, "switch_steam_accounts": bool(index % 2), "defer_processes": [f"tool{index}"]}
+            started = time.perf_counter()
+            client.post("/api/config", json=payload)
+            if per_save:
+                service.config_store.flush()
+            latencies.append(time.perf_counter() - started)
+
+    def scheduler() -> None:
+        while not done.is_set():
+            service.load_config()
+            time.sleep(0.01)
+
+    reader = threading.Thread(target=scheduler)
+    reader.start()
+    workers = [threading.Thread(target=poster, args=(offset,)) for offset in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done.set()
+    reader.join()
+    service.config_store.flush()
+    on_disk = service.read_config()
+    return {
+        "writes": service.config_store.writes - writes_before,
+        "mirrors": mirrors[0],
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "consistent": all(on_disk[key] == service.config[key] for key in ("time_to_wait", "switch_steam_accounts", "defer_processes")),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="autobanana_config_")
+    failed = False
+    try:
+        fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=10, accounts=1)
+        service = create_service(fake)
+        print(f"{'mode':<10} {'writes':>7} {'mirrors':>8} {'mean ms':>8} {'max ms':>8} {'on disk':>8}")
+        for label, per_save in (("per save", True), ("coalesced", False)):
+            result = burst(service, args.posts, args.threads, per_save)
+            state = "ok" if result["consistent"] else "LOST"
+            print(f"{label:<10} {result['writes']:>7} {result['mirrors']:>8} {result['mean_ms']:>8.2f} {result['max_ms']:>8.2f} {state:>8}")
+            failed = failed or not result["consistent"]
+        service.config_store.close()
+        service.history.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Synthetic Steam install generator used by the benchmark scripts.
+
+Builds a throwaway Steam tree with several library folders, app manifests,
+populated install directories, a multi-account ``loginusers.vdf`` and a
+stand-in Steam binary, so the code paths that normally need a real Steam
+client can be exercised anywhere.
+"""
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import vdf  # type: ignore
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from utils.steam_manager import SteamAccountChanger  # noqa: E402
+from utils.steam_worker import SteamWorker  # noqa: E402
+
+FIRST_APP_ID = 100000
+FIRST_STEAM_ID = 76561198000000000
+
+# The stand-in binary acknowledges the trimmed loginusers.vdf the way the real
+# client does (by rewriting it), then idles until it is killed.
+STAND_IN_BINARY = """#!{python}
+import os, sys, time
+steam_root = os.path.dirname(os.path.abspath(__file__))
+loginusers = os.path.join(steam_root, "config", "loginusers.vdf")
+time.sleep({ack_delay})
+if os.path.exists(loginusers):
+    stamp = time.time() + 1
+    os.utime(loginusers, (stamp, stamp))
+while True:
+    time.sleep(1)
+"""
+
+
+@dataclass
+class FakeSteam:
+    """Paths and IDs of a generated Steam tree."""
+
+    root: str
+    libraries: List[str]
+    app_ids: List[str]
+    accounts: List[str]
+    binary: str
+    install_dirs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def loginusers_path(self) -> str:
+        return os.path.join(self.root, "config", "loginusers.vdf")
+
+
+def _write_vdf(path: str, data: Dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as vdf_file:
+        vdf.dump(data, vdf_file, pretty=True)
+
+
+def _populate_install_dir(install_dir: str, app_id: str, files_per_game: int, file_size: int) -> None:
+    """Fill an install dir with a main exe, a launcher and nested data files."""
+    os.makedirs(install_dir, exist_ok=True)
+    binaries = [f"Game{app_id}.exe", "launcher.exe", "UnityCrashHandler64.exe"]
+    for name in binaries:
+        with open(os.path.join(install_dir, name), "wb") as handle:
+            handle.truncate(file_size)
+
+    data_files = max(0, files_per_game - len(binaries))
+    per_dir = 50
+    for index in range(data_files):
+        sub_dir = os.path.join(install_dir, "data", f"pak{index // per_dir:03d}")
+        if index % per_dir == 0:
+            os.makedirs(sub_dir, exist_ok=True)
+        with open(os.path.join(sub_dir, f"asset{index:05d}.pak"), "wb") as handle:
+            handle.truncate(file_size)
+
+
+def build_fake_steam(
+    root: str,
+    games: int = 10,
+    accounts: int = 1,
+    libraries: int = 3,
+    files_per_game: int = 20,
+    file_size: int = 4096,
+    ack_delay: float = 0.2,
+) -> FakeSteam:
+    """Write a synthetic Steam tree under ``root`` and return its layout.
+
+    Games are spread round-robin across ``libraries`` folders; library 0 is the
+    Steam install itself, matching how ``libraryfolders.vdf`` is laid out on a
+    real machine. Files are sparse, so ``file_size`` costs no disk space.
+    """
+    root = os.path.abspath(root)
+    library_roots = [root] + [os.path.join(os.path.dirname(root), f"{os.path.basename(root)}_library{index}") for index in range(1, libraries)]
+    fake = FakeSteam(root=root, libraries=library_roots, app_ids=[], accounts=[], binary=os.path.join(root, "steam.sh"))
+
+    library_apps: Dict[int, Dict[str, str]] = {index: {} for index in range(len(library_roots))}
+    now = int(time.time())
+    for index in range(games):
+        app_id = str(FIRST_APP_ID + index)
+        library_index = index % len(library_roots)
+        steamapps = os.path.join(library_roots[library_index], "steamapps")
+        install_name = f"Fake Game {app_id}"
+        install_dir = os.path.join(steamapps, "common", install_name)
+        size_on_disk = files_per_game * file_size
+        _write_vdf(
+            os.path.join(steamapps, f"appmanifest_{app_id}.acf"),
+            {
+                "AppState": {
+                    "appid": app_id,
+                    "Universe": "1",
+                    "name": f"Fake Game {index}",
+                    "StateFlags": "4",
+                    "installdir": install_name,
+                    "LastUpdated": str(now - index * 3600),
+                    "LastPlayed": str(now - index * 600),
+                    "SizeOnDisk": str(size_on_disk),
+                }
+            },
+        )
+        _populate_install_dir(install_dir, app_id, files_per_game, file_size)
+        library_apps[library_index][app_id] = str(size_on_disk)
+        fake.app_ids.append(app_id)
+        fake.install_dirs[app_id] = install_dir
+
+    folders = {}
+    for index, library_root in enumerate(library_roots):
+        os.makedirs(os.path.join(library_root, "steamapps"), exist_ok=True)
+        folders[str(index)] = {"path": library_root, "label": "", "apps": library_apps[index]}
+    _write_vdf(os.path.join(root, "steamapps", "libraryfolders.vdf"), {"libraryfolders": folders})
+
+    users = {}
+    for index in range(accounts):
+        account_name = f"fakeuser{index:03d}"
+        users[str(FIRST_STEAM_ID + index)] = {
+            "AccountName": account_name,
+            "PersonaName": f"Fake User {index}",
+            "RememberPassword": "1",
+            "WantsOfflineMode": "0",
+            "AllowAutoLogin": "1",
+            "MostRecent": "1" if index == 0 else "0",
+            "Timestamp": str(now - index),
+        }
+        fake.accounts.append(account_name)
+    _write_vdf(fake.loginusers_path, {"users": users})
+
+    with open(fake.binary, "w", encoding="utf-8") as handle:
+        handle.write(STAND_IN_BINARY.format(python=sys.executable, ack_delay=ack_delay))
+    os.chmod(fake.binary, os.stat(fake.binary).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return fake
+
+
+class FakeSteamAccountChanger(SteamAccountChanger):
+    """Account changer that drives the stand-in binary instead of real Steam.
+
+    Only the process-control methods are replaced; the loginusers handling is
+    the production code. ``kill_steam`` only touches processes it spawned, so
+    a real Steam client on the host is never affected.
+    """
+
+    def __init__(self, fake: FakeSteam, ready_timeout: float = 5) -> None:
+        self._fake = fake
+        self._stand_ins: List[subprocess.Popen] = []
+        os.environ["STEAM_PATH"] = fake.root
+        super().__init__()
+        self._steam_ready_timeout = ready_timeout
+        self._poll_interval = 0.02
+
+    def kill_steam(self):
+        for proc in self._stand_ins:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        self._stand_ins = []
+
+    def open_steam(self):
+        self._stand_ins.append(subprocess.Popen([self._fake.binary], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        return True
+
+    def is_steam_running(self):
+        return any(proc.poll() is None for proc in self._stand_ins)
+
+
+def create_service(fake: FakeSteam):
+    """Build an ``AutoBananaService`` bound to ``fake`` and a scratch config dir.
+
+    The returned service skips the outbound usage ping, never mirrors its
+    config into the repository folder and drives the stand-in Steam binary
+    from its worker process.
+    """
+    os.environ["XDG_CONFIG_HOME"] = tempfile.mkdtemp(prefix="autobanana_bench_cfg_")
+    os.environ["STEAM_PATH"] = fake.root
+    import AutoBanana
+
+    class BenchService(AutoBanana.AutoBananaService):
+        def register_usage(self) -> None:
+            pass
+
+        def _mirror_config_to_legacy(self) -> None:
+            pass
+
+    service = BenchService()
+    service.steam_worker = SteamWorker(FakeSteamAccountChanger, (fake,))
+    service.config["games"] = list(fake.app_ids)
+    return service
@@ -0,0 +1,95 @@
+"""Exercise the fleet controller against several agents on localhost ports.
+
+Each agent is a small stand-in that speaks the AutoBanana ``/api/status``,
+``/api/config`` and ``/api/run`` surface and records when runs were
+triggered. The script runs the real ``FleetController`` with a short interval
+and prints the game split, the trigger timeline and the aggregated view.
+
+Usage: python benchmarks/fleet_local.py [--agents 4] [--games 12] [--interval 8] [--duration 20]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fleet import FleetController  # noqa: E402
+
+
+class StubAgent:
+    def __init__(self, name: str, accounts: int) -> None:
+        self.name = name
+        self.config: Dict[str, Any] = {"games": [], "run_interval_seconds": 10800, "switch_steam_accounts": accounts > 1}
+        self.accounts = accounts
+        self.runs: List[float] = []
+        self.app = Flask(name)
+        self.app.add_url_rule("/api/status", "status", self.status)
+        self.app.add_url_rule("/api/config", "config", self.update_config, methods=["POST"])
+        self.app.add_url_rule("/api/run", "run", self.run, methods=["POST"])
+        self.server = make_server("127.0.0.1", 0, self.app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def status(self):
+        return jsonify(
+            {
+                "config": self.config,
+                "state": "waiting",
+                "accounts_count": self.accounts,
+                "game_open_count": len(self.runs),
+                "last_run_at": None,
+                "next_run_at": None,
+            }
+        )
+
+    def update_config(self):
+        self.config.update(request.get_json(force=True, silent=True) or {})
+        return jsonify({"config": self.config})
+
+    def run(self):
+        self.runs.append(time.time())
+        return jsonify({"status": "queued"})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--games", type=int, default=12)
+    parser.add_argument("--interval", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    agents = [StubAgent(f"agent{index}", accounts=1 + index % 3) for index in range(args.agents)]
+    games = [str(100000 + index) for index in range(args.games)]
+    controller = FleetController([agent.url for agent in agents], args.interval, games=games, poll_seconds=0.25)
+
+    stop = threading.Event()
+    started = time.time()
+    thread = threading.Thread(target=controller.run_forever, args=(stop,), daemon=True)
+    thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    thread.join()
+
+    print(f"{'agent':<8} {'accounts':>8} {'games':>6} {'work':>5}  trigger offsets (s)")
+    for agent in agents:
+        offsets = ", ".join(f"{stamp - started:.1f}" for stamp in agent.runs)
+        work = len(agent.config["games"]) * (agent.accounts if agent.config["switch_steam_accounts"] else 1)
+        print(f"{agent.name:<8} {agent.accounts:>8} {len(agent.config['games']):>6} {work:>5}  {offsets}")
+
+    assigned = sorted(game for agent in agents for game in agent.config["games"])
+    print(f"every game assigned exactly once: {assigned == sorted(games)}")
+    print(json.dumps(controller.snapshot()["totals"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Load test for the dashboard polling endpoints.
+
+Simulates dashboard tabs that poll ``/api/status`` every 500 ms and
+``/api/logs`` every second (the cadence used by ``web/static/app.js``) and
+reports p50/p99 latency per endpoint.
+
+By default an in-process AutoBanana backed by a fake Steam tree is started on
+a free port; pass ``--url`` to measure an already running instance instead.
+
+Usage: python benchmarks/load_test.py [--pollers 40] [--duration 20] [--server waitress|dev]
+"""
+import argparse
+import os
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+from fake_steam import build_fake_steam, create_service
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_instance(server: str, work_dir: str) -> str:
+    import AutoBanana
+
+    fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=20, accounts=10)
+    service = create_service(fake)
+    for index in range(400):
+        service.log_event(f"Synthetic console line {index}", "info")
+    AutoBanana.service = service
+
+    port = free_port()
+    if server == "dev":
+        target = lambda: AutoBanana.create_app().run(host="127.0.0.1", port=port, debug=False, use_reloader=False, threaded=True)  # noqa: E731
+    else:
+        target = lambda: AutoBanana.start_flask("127.0.0.1", port)  # noqa: E731
+    threading.Thread(target=target, daemon=True).start()
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{url}/api/ping", timeout=0.5)
+            return url
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("Local AutoBanana instance did not start")
+
+
+def poller(url: str, stop_at: float, samples: Dict[str, List[float]], errors: Dict[str, int], lock: threading.Lock) -> None:
+    session = requests.Session()
+    latest_log = 0.0
+    next_status = next_logs = time.monotonic()
+    while True:
+        now = time.monotonic()
+        if now >= stop_at:
+            break
+        if now >= next_status:
+            endpoint, path, next_status = "/api/status", "/api/status", now + 0.5
+        elif now >= next_logs:
+            endpoint, path, next_logs = "/api/logs", f"/api/logs?since={latest_log}", now + 1.0
+        else:
+            time.sleep(min(next_status, next_logs) - now)
+            continue
+
+        start = time.perf_counter()
+        try:
+            response = session.get(url + path, timeout=10)
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError):
+            with lock:
+                errors[endpoint] += 1
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        if endpoint == "/api/logs":
+            latest_log = payload.get("latest", latest_log)
+        with lock:
+            samples[endpoint].append(elapsed)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pollers", type=int, default=40)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--server", choices=("waitress", "dev"), default="waitress")
+    parser.add_argument("--url", help="measure an already running instance instead of starting one")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="autobanana_load_")
+    try:
+        url = args.url.rstrip("/") if args.url else start_local_instance(args.server, work_dir)
+        samples: Dict[str, List[float]] = {"/api/status": [], "/api/logs": []}
+        errors: Dict[str, int] = {"/api/status": 0, "/api/logs": 0}
+        lock = threading.Lock()
+        stop_at = time.monotonic() + args.duration
+        threads = [threading.Thread(target=poller, args=(url, stop_at, samples, errors, lock), daemon=True) for _ in range(args.pollers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        label = args.url or args.server
+        print(f"{args.pollers} pollers for {args.duration:.0f}s against {label}")
+        print(f"{'endpoint':<14} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'mean ms':>9}")
+        for endpoint, values in samples.items():
+            print(
+                f"{endpoint:<14} {len(values):>9} {errors[endpoint]:>7} {percentile(values, 50):>9.2f} "
+                f"{percentile(values, 99):>9.2f} {max(values, default=0):>9.2f} {statistics.fmean(values) if values else 0:>9.2f}"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Check that closing games takes their whole process tree down, and nothing else.
+
+Each fake game is started the way Steam would, then spawns a crash handler
+and an "anti-cheat" child that ignores SIGTERM and has a helper child of its
+own. The last game is started the way Proton does it: the process is the
+interpreter (standing in for ``wine64-preloader``) and the game only shows up
+as a ``Z:\\...\\Game.exe`` argument. A decoy process has the same exe name as
+the first game but runs from outside every install dir. For three modes the
+script reports:
+
+* ``names only``: the old behaviour, terminating just the processes whose
+  name matches a game executable.
+* ``close_games``: the scheduler's close path, using one process snapshot.
+* ``force close``: ``_force_close_games`` as used by stop and quit.
+
+For each mode it prints how many game-tree processes survived, whether the
+decoy survived, how many ``process_iter`` passes the close took, and how
+long it took. The script exits non-zero if a tree-aware mode leaves a
+descendant behind or touches the decoy.
+
+Usage: python benchmarks/process_tree.py [--games 4]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import psutil
+
+from fake_steam import FakeSteam, build_fake_steam, create_service
+
+# Game -> crash handler, and game -> anti-cheat (ignores SIGTERM) -> helper.
+# sys.executable would be the game's own exe name in there, so the interpreter comes in argv.
+GAME = """import subprocess, sys, time
+crash = subprocess.Popen([sys.argv[1], "-c", "import time\\nwhile True: time.sleep(1)"])
+anti_cheat = subprocess.Popen([sys.argv[3], "-c", sys.argv[2]])
+while True:
+    time.sleep(1)
+"""
+ANTI_CHEAT = """import signal, subprocess, sys, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+helper = subprocess.Popen([sys.executable, "-c", "import time\\nwhile True: time.sleep(1)"])
+while True:
+    time.sleep(1)
+"""
+TREE_SIZE = 4  # game, crash handler, anti-cheat, helper
+PYTHON = os.path.realpath(sys.executable)
+
+
+class Counter:
+    """Counts ``psutil.process_iter`` passes."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._original = psutil.process_iter
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self._original(*args, **kwargs)
+
+
+def spawn_games(fake: FakeSteam, bin_dir: str) -> List[int]:
+    """Start one tree per game and return every PID in those trees once they are all up.
+
+    Game executables sit in their install dirs; the crash handler runs from
+    elsewhere, so only its parentage ties it to a game.
+    """
+    crash_handler = os.path.join(bin_dir, "UnityCrashHandler64.exe")
+    if not os.path.exists(crash_handler):
+        os.symlink(sys.executable, crash_handler)
+    roots = []
+    for index, app_id in enumerate(fake.app_ids):
+        exe = os.path.join(fake.install_dirs[app_id], f"Game{app_id}.exe")
+        if index == len(fake.app_ids) - 1:
+            command = [PYTHON, "-c", GAME, crash_handler, ANTI_CHEAT, PYTHON, "Z:" + exe.replace("/", "\\")]
+        else:
+            if not os.path.islink(exe):
+                os.remove(exe)
+                os.symlink(sys.executable, exe)  # the process name becomes the exe name
+            command = [exe, "-c", GAME, crash_handler, ANTI_CHEAT, PYTHON]
+        roots.append(subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    deadline = time.monotonic() + 15
+    while True:
+        pids = [proc.pid for root in roots for proc in [psutil.Process(root.pid)] + psutil.Process(root.pid).children(recursive=True)]
+        if len(pids) == TREE_SIZE * len(roots):
+            return pids
+        if time.monotonic() > deadline:
+            raise TimeoutError("fake game trees never came up")
+        time.sleep(0.05)
+
+
+def survivors(pids: List[int]) -> int:
+    alive = 0
+    for pid in pids:
+        try:
+            if psutil.Process(pid).status() != psutil.STATUS_ZOMBIE:
+                alive += 1
+        except psutil.NoSuchProcess:
+            continue
+    return alive
+
+
+def names_only(service) -> None:
+    names = {f"Game{app_id}.exe" for app_id in service.config["games"]}
+    for proc in psutil.process_iter(["pid", "name"]):
+        if proc.info.get("name") in names:
+            proc.terminate()
+            proc.wait(timeout=5)
+
+
+def close_games(service) -> None:
+    all_games = service.get_game_matcher()
+    snapshot = service.process_snapshot()
+    service.close_games(service.find_running_steam_games(all_games, snapshot), cancel=service.stop_event, snapshot=snapshot)
+
+
+def force_close(service) -> None:
+    service._force_close_games()  # waits up to a 3 s grace, then kills what is left
+
+
+def run(mode: Callable, service, fake: FakeSteam, bin_dir: str) -> Dict[str, float]:
+    pids = spawn_games(fake, bin_dir)
+    impostor = os.path.join(bin_dir, f"Game{fake.app_ids[0]}.exe")
+    if not os.path.exists(impostor):
+        os.symlink(sys.executable, impostor)
+    decoy = subprocess.Popen([impostor, "-c", "import time\nwhile True: time.sleep(1)"])
+    counter = Counter()
+    psutil.process_iter = counter
+    try:
+        started = time.perf_counter()
+        mode(service)
+        elapsed = time.perf_counter() - started
+    finally:
+        psutil.process_iter = counter._original
+    result = {"tree": len(pids), "left": survivors(pids), "decoy_alive": decoy.poll() is None, "passes": counter.calls, "seconds": elapsed}
+    for pid in pids + [decoy.pid]:
+        try:
+            psutil.Process(pid).kill()
+        except psutil.NoSuchProcess:
+            continue
+    decoy.wait()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=4)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="autobanana_tree_")
+    failed = False
+    try:
+        fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=args.games, accounts=1)
+        service = create_service(fake)
+        bin_dir = os.path.join(work_dir, "bin")
+        os.makedirs(bin_dir)
+        print(f"{'mode':<12} {'left / tree':>12} {'decoy':>7} {'passes':>7} {'seconds':>8}")
+        for label, mode in (("names only", names_only), ("close_games", close_games), ("force close", force_close)):
+            result = run(mode, service, fake, bin_dir)
+            decoy = "alive" if result["decoy_alive"] else "KILLED"
+            print(f"{label:<12} {result['left']:>5} / {result['tree']:<5} {decoy:>7} {result['passes']:>7} {result['seconds']:>8.2f}")
+            if mode is not names_only and (result["left"] or not result["decoy_alive"]):
+                failed = True
+        service.history.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Build the offline app search index from a synthetic app list and time queries.
+
+Names are drawn from a Zipf-distributed vocabulary, so common words ("the",
+"game", "simulator") have long posting lists the way they do in Steam's real
+catalogue. Queries replay typing: every prefix (two characters and up) of
+randomly picked names, plus a few multi-word searches. Pass ``--applist`` to
+use a real ``GetAppList`` dump instead.
+
+Usage: python benchmarks/search_index.py [--apps 150000] [--queries 2000] [--applist dump.json]
+"""
+import argparse
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import fake_steam  # noqa: F401  (puts the repository on sys.path)
+
+from utils.app_search import AppSearchIndex, load_app_list
+
+
+def synthetic_apps(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    vocabulary = sorted({"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10))) for _ in range(40000)})
+    rng.shuffle(vocabulary)
+    vocabulary[:12] = ["the", "of", "game", "simulator", "edition", "soundtrack", "dlc", "pack", "2", "3", "world", "war"]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    apps = []
+    for index in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(1, 5))
+        apps.append((str(10 + index * 10), " ".join(word.capitalize() for word in words)))
+    return apps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=150000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--applist", type=Path)
+    args = parser.parse_args()
+
+    apps = load_app_list(args.applist) if args.applist else synthetic_apps(args.apps)
+    installed = {app_id: name for app_id, name in random.Random(1).sample(apps, min(200, len(apps)))}
+    index = AppSearchIndex()
+    index.build(apps, installed)
+    print(f"indexed {index.size} apps in {index.build_seconds:.2f}s")
+
+    rng = random.Random(3)
+    queries: List[str] = []
+    while len(queries) < args.queries:
+        name = rng.choice(apps)[1]
+        queries.extend(name[:length] for length in range(2, len(name) + 1))
+        words = name.split()
+        if len(words) > 1:
+            queries.append(f"{words[-1][:3]} {words[0]}")
+    queries = queries[: args.queries]
+
+    timings = []
+    empty = 0
+    for query in queries:
+        started = time.perf_counter()
+        results = index.search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+        empty += not results
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{len(queries)} queries: p50 {statistics.median(timings):.3f} ms, p99 {p99:.3f} ms, max {timings[-1]:.3f} ms, {empty} without results")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Measure how long a stop takes while a run is busy.
+
+Each scenario starts a real scheduler run against a synthetic Steam tree and
+then stops it. The stop happens while the run is waiting for Steam to consume
+``loginusers.vdf``, while it waits before closing games, or while it waits
+for a game that ignores SIGTERM to exit. Two numbers are reported: the time
+until the scheduler thread exits, and the time until ``stop()`` returns. The
+script also checks that the full account roster is back in ``loginusers.vdf``.
+
+Usage: python benchmarks/stop_latency.py [--repeat 5]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import webbrowser
+from subprocess import DEVNULL, Popen
+from typing import Callable, Dict, List
+
+import psutil
+import vdf  # type: ignore
+
+from fake_steam import FakeSteam, FakeSteamAccountChanger, build_fake_steam, create_service
+
+from utils.steam_worker import SteamWorker
+
+# A game that ignores SIGTERM, so close_games has to wait for it.
+STUBBORN_GAME = "import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\nwhile True:\n    time.sleep(1)\n"
+
+
+class GameLauncher:
+    """Stand-in for ``webbrowser.open``: start the game's exe for steam://rungameid URLs."""
+
+    def __init__(self, fake: FakeSteam, bin_dir: str) -> None:
+        self.fake = fake
+        self.bin_dir = bin_dir
+        self.processes: List[Popen] = []
+
+    def __call__(self, url: str, *args, **kwargs) -> bool:
+        app_id = url.rsplit("/", 1)[-1]
+        exe = os.path.join(self.fake.install_dirs[app_id], f"Game{app_id}.exe")
+        if not os.path.islink(exe):
+            os.remove(exe)
+            os.symlink(sys.executable, exe)  # argv[0] is now inside the game's install dir
+        self.processes.append(Popen([exe, "-c", STUBBORN_GAME], stdout=DEVNULL, stderr=DEVNULL))
+        return True
+
+    def cleanup(self) -> None:
+        for proc in self.processes:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+def kill_stand_ins(fake: FakeSteam) -> None:
+    for proc in psutil.process_iter(["cmdline"]):
+        try:
+            if fake.binary in (proc.info.get("cmdline") or []):
+                proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+
+def roster_size(fake: FakeSteam) -> int:
+    with open(fake.loginusers_path, "r", encoding="utf-8") as handle:
+        return len(vdf.load(handle).get("users", {}))
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("run never reached the phase under test")
+        time.sleep(0.01)
+
+
+def measure(scenario: str, work_dir: str) -> Dict[str, float]:
+    switching = scenario == "switch"
+    # ack_delay is far past the run, so Steam never "consumes" the single-user
+    # loginusers.vdf and the switch sits in its full 45 s wait.
+    fake = build_fake_steam(os.path.join(work_dir, "Steam"), games=1, accounts=3 if switching else 1, ack_delay=3600)
+    launcher = GameLauncher(fake, work_dir)
+    webbrowser.open = launcher
+    service = create_service(fake)
+    service.steam_worker = SteamWorker(FakeSteamAccountChanger, (fake, 45))
+    service.config.update({"switch_steam_accounts": switching, "time_to_wait": 1 if scenario == "close" else 60, "batch_size": 1})
+    service.write_config()
+
+    try:
+        service.start()
+        service.trigger_manual_run()
+        if switching:
+            wait_until(lambda: (service.switch_progress or {}).get("step") == 5)
+        elif scenario == "wait":
+            wait_until(lambda: service.wait_progress is not None)
+        else:
+            wait_until(lambda: service.wait_progress is not None)
+            wait_until(lambda: service.wait_progress is None)
+        time.sleep(0.3)
+
+        thread = service.worker_thread
+        started = time.perf_counter()
+        service.stop_event.set()
+        thread.join(timeout=10)
+        thread_exit = time.perf_counter() - started
+        service.stop()
+        total = time.perf_counter() - started
+        if roster_size(fake) != len(fake.accounts):
+            raise AssertionError("loginusers.vdf was not restored")
+        return {"thread_exit": thread_exit, "stop_total": total}
+    finally:
+        service.steam_worker.shutdown()
+        service.history.close()
+        launcher.cleanup()
+        kill_stand_ins(fake)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    labels = {
+        "switch": "switch: waiting for Steam to read loginusers",
+        "wait": "waiting before closing games",
+        "close": "closing a game that ignores SIGTERM",
+    }
+    print(f"{'scenario':<46} {'thread exit p50/max (ms)':>26} {'stop() p50/max (ms)':>22}")
+    for scenario, label in labels.items():
+        samples: List[Dict[str, float]] = []
+        for _ in range(args.repeat):
+            work_dir = tempfile.mkdtemp(prefix="autobanana_stop_")
+            try:
+                samples.append(measure(scenario, work_dir))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        exits = [sample["thread_exit"] * 1000 for sample in samples]
+        totals = [sample["stop_total"] * 1000 for sample in samples]
+        print(f"{label:<46} {statistics.median(exits):>14.1f} / {max(exits):<9.1f} {statistics.median(totals):>11.1f} / {max(totals):<9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Drive the store request queue against a local stub that throttles like Steam.
+
+The stub accepts ``--limit`` requests per ``--window`` seconds and answers the
+rest with ``429`` and a ``Retry-After`` header. Three scenarios run against it:
+
+* ``naive``: the old behaviour, one ``requests.get`` per app as fast as possible.
+* ``queued``: the same prefetch through ``StoreClient``, with interactive
+  searches fired while the prefetch is running.
+* ``outage``: the stub returns ``500`` for every request, which should open the
+  circuit so later calls fail fast without reaching the server.
+
+Usage: python benchmarks/store_throttle.py [--apps 60] [--limit 10] [--window 2]
+"""
+import argparse
+import collections
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List
+
+import requests
+
+import fake_steam  # noqa: F401  (puts the repository on sys.path)
+
+from utils.store_client import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, StoreClient, StoreUnavailable
+
+
+class ThrottlingStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, limit: int, window: float) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.limit = limit
+        self.window = window
+        self.failing = False
+        self.hits: Deque[float] = collections.deque()
+        self.counts: Dict[int, int] = collections.Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: ThrottlingStub
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        stub = self.server
+        with stub.lock:
+            now = time.monotonic()
+            while stub.hits and now - stub.hits[0] > stub.window:
+                stub.hits.popleft()
+            if stub.failing:
+                status, retry_after = 500, None
+            elif len(stub.hits) >= stub.limit:
+                status, retry_after = 429, max(1, int(stub.window - (now - stub.hits[0]) + 0.999))
+            else:
+                status, retry_after = 200, None
+                stub.hits.append(now)
+            stub.counts[status] += 1
+        body = json.dumps({"ok": status == 200}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def naive(stub: ThrottlingStub, apps: int) -> Dict[str, float]:
+    ok = 0
+    started = time.perf_counter()
+    for app_id in range(apps):
+        try:
+            response = requests.get(f"{stub.url}/api/appdetails", params={"appids": app_id}, timeout=6)
+            response.raise_for_status()
+            ok += 1
+        except requests.RequestException:
+            pass
+    return {"ok": ok, "seconds": time.perf_counter() - started}
+
+
+def queued(stub: ThrottlingStub, apps: int, rpm: float) -> Dict[str, float]:
+    client = StoreClient(base_url=stub.url, requests_per_minute=rpm, burst=5)
+    ok = 0
+    latencies: List[float] = []
+    search_failures = 0
+
+    def prefetch() -> None:
+        nonlocal ok
+        for app_id in range(apps):
+            try:
+                client.get_json("/api/appdetails", {"appids": app_id}, priority=PRIORITY_BACKGROUND)
+                ok += 1
+            except (StoreUnavailable, requests.RequestException):
+                pass
+
+    started = time.perf_counter()
+    worker = threading.Thread(target=prefetch)
+    worker.start()
+    while worker.is_alive():
+        time.sleep(0.5)
+        began = time.perf_counter()
+        try:
+            client.get_json("/api/storesearch/", {"term": "half"}, priority=PRIORITY_INTERACTIVE)
+            latencies.append((time.perf_counter() - began) * 1000)
+        except (StoreUnavailable, requests.RequestException):
+            search_failures += 1
+    worker.join()
+    return {
+        "ok": ok,
+        "seconds": time.perf_counter() - started,
+        "searches": len(latencies),
+        "search_failures": search_failures,
+        "search_p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "search_max_ms": max(latencies) if latencies else 0.0,
+    }
+
+
+def outage(stub: ThrottlingStub, calls: int) -> Dict[str, float]:
+    client = StoreClient(base_url=stub.url, requests_per_minute=6000, burst=50, failure_threshold=5, open_seconds=30)
+    stub.failing = True
+    before = sum(stub.counts.values())
+    rejected_latency: List[float] = []
+    for app_id in range(calls):
+        began = time.perf_counter()
+        try:
+            client.get_json("/api/appdetails", {"appids": app_id})
+        except StoreUnavailable:
+            rejected_latency.append((time.perf_counter() - began) * 1000)
+        except requests.RequestException:
+            pass
+    stub.failing = False
+    return {
+        "reached_server": sum(stub.counts.values()) - before,
+        "rejected": len(rejected_latency),
+        "reject_max_ms": max(rejected_latency) if rejected_latency else 0.0,
+        "circuit": client.snapshot()["circuit"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=60)
+    parser.add_argument("--limit", type=int, default=10, help="requests the stub accepts per window")
+    parser.add_argument("--window", type=float, default=2.0, help="stub window in seconds")
+    args = parser.parse_args()
+    rpm = args.limit / args.window * 60 * 0.9  # stay just under the stub's budget
+
+    stub = ThrottlingStub(args.limit, args.window)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    try:
+        result = naive(stub, args.apps)
+        print(f"naive : {result['ok']}/{args.apps} ok in {result['seconds']:.1f}s, server sent {stub.counts[429]} x 429")
+        time.sleep(args.window)
+        stub.counts.clear()
+
+        result = queued(stub, args.apps, rpm)
+        print(
+            f"queued: {result['ok']}/{args.apps} ok in {result['seconds']:.1f}s, server sent {stub.counts[429]} x 429; "
+            f"{result['searches']} searches during prefetch p50 {result['search_p50_ms']:.0f} ms, max {result['search_max_ms']:.0f} ms, "
+            f"{result['search_failures']} dropped"
+        )
+
+        result = outage(stub, 50)
+        print(
+            f"outage: 50 calls, {result['reached_server']} reached the server, {result['rejected']} failed fast "
+            f"(max {result['reject_max_ms']:.2f} ms), circuit {result['circuit']}"
+        )
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("main")
+
+CAPSULE_URL = "https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/capsule_231x87.jpg"
+HEAD_PREFIX_LENGTH = 3  # prefixes up to this length answer from a precomputed top list
+HEAD_SIZE = 64
+SCAN_BUDGET = 500  # word-match candidates examined per query, best static rank first
+NAME_PREFIX_LIMIT = 200  # whole-name prefix matches examined per query
+MAX_RANGE_WORDS = 256
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    ascii_text = decomposed.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def load_app_list(path: Path) -> List[Tuple[str, str]]:
+    """Read a Steam app-list dump as ``(app_id, name)`` pairs.
+
+    Accepts the ``ISteamApps/GetAppList/v2`` shape
+    (``{"applist": {"apps": [{"appid": 10, "name": "..."}]}}``), the same
+    object without the ``applist`` wrapper, or a bare list of apps.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get("applist", data)
+    if isinstance(data, dict):
+        data = data.get("apps", [])
+    apps: List[Tuple[str, str]] = []
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        app_id, name = item.get("appid", item.get("app_id")), str(item.get("name") or "").strip()
+        if app_id and name:
+            apps.append((str(app_id), name))
+    return apps
+
+
+class AppSearchIndex:
+    """Offline autocomplete over Steam app names.
+
+    Entries are stored best-first (installed apps, then shorter names), so
+    every posting list is already in rank order. Each word of each name goes
+    into a sorted vocabulary, and a word prefix becomes a ``bisect`` range
+    over it. Very short prefixes match too many words to merge per
+    keystroke, so their best ``HEAD_SIZE`` entries are precomputed.
+
+    A query merges two bounded candidate sets: names that start with the
+    whole query (a ``bisect`` range over sorted names) and, in rank order, up
+    to ``SCAN_BUDGET`` entries containing its rarest word. The other words and
+    the exact/prefix ranking are checked only on those candidates, which keeps
+    the cost per keystroke flat however common the words are.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.size = 0
+        self.catalog_size = 0  # entries from the app-list dump; 0 means only installed apps are indexed
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._normalized: List[str] = []
+        self._spaced: List[str] = []  # " " + normalized name, for word-prefix tests with ``in``
+        self._tokens: List[Tuple[str, ...]] = []
+        self._installed: List[bool] = []
+        self._sorted_names: List[Tuple[str, int]] = []
+        self._vocab: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._head: Dict[str, List[int]] = {}
+        self._head_counts: Dict[str, int] = {}
+
+    def build(self, apps: Iterable[Tuple[str, str]], installed: Optional[Dict[str, str]] = None) -> None:
+        """Index ``(app_id, name)`` pairs plus ``installed`` (app_id -> name from manifests)."""
+        started = time.perf_counter()
+        installed = installed or {}
+        names: Dict[str, str] = {}
+        for app_id, name in apps:
+            names.setdefault(app_id, name)
+        catalog_size = len(names)
+        names.update(installed)
+
+        rows = []
+        for app_id, name in names.items():
+            normalized = normalize(name)
+            if normalized:
+                rows.append((app_id not in installed, len(normalized), int(app_id) if app_id.isdigit() else 0, app_id, name, normalized))
+        rows.sort()
+
+        ids, display, normalized_names, token_lists, installed_flags = [], [], [], [], []
+        postings: Dict[str, List[int]] = {}
+        for index, (not_installed, _, _, app_id, name, normalized) in enumerate(rows):
+            tokens = tuple(dict.fromkeys(normalized.split()))
+            ids.append(app_id)
+            display.append(name)
+            normalized_names.append(normalized)
+            token_lists.append(tokens)
+            installed_flags.append(not not_installed)
+            for token in tokens:
+                postings.setdefault(token, []).append(index)
+
+        head: Dict[str, List[int]] = {}
+        head_counts: Dict[str, int] = {}
+        for token, entries in postings.items():
+            for length in range(1, min(HEAD_PREFIX_LENGTH, len(token)) + 1):
+                head.setdefault(token[:length], []).extend(entries[:HEAD_SIZE])
+                head_counts[token[:length]] = head_counts.get(token[:length], 0) + len(entries)
+        for prefix, entries in head.items():
+            head[prefix] = sorted(set(entries))[:HEAD_SIZE]
+
+        with self._lock:
+            self._ids, self._names, self._normalized = ids, display, normalized_names
+            self._spaced = [" " + name for name in normalized_names]
+            self._tokens, self._installed = token_lists, installed_flags
+            self._sorted_names = sorted((name, index) for index, name in enumerate(normalized_names))
+            self._postings = postings
+            self._vocab = sorted(postings)
+            self._head = head
+            self._head_counts = head_counts
+            self.size = len(ids)
+            self.catalog_size = catalog_size
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+            self.ready = True
+
+    def _word_lists(self, prefix: str) -> Tuple[int, List[List[int]]]:
+        """Posting lists for words starting with ``prefix`` and their total size."""
+        if len(prefix) <= HEAD_PREFIX_LENGTH:
+            return self._head_counts.get(prefix, 0), [self._head.get(prefix, [])]
+        start = bisect.bisect_left(self._vocab, prefix)
+        end = min(bisect.bisect_left(self._vocab, prefix + "\x7f", start), start + MAX_RANGE_WORDS)
+        lists = [self._postings[token] for token in self._vocab[start:end]]
+        return sum(len(entries) for entries in lists), lists
+
+    def _name_candidates(self, normalized: str) -> List[int]:
+        """Entries whose whole name starts with ``normalized``."""
+        position = bisect.bisect_left(self._sorted_names, (normalized, -1))
+        matches = []
+        for name, index in self._sorted_names[position:position + NAME_PREFIX_LIMIT]:
+            if not name.startswith(normalized):
+                break
+            matches.append(index)
+        return matches
+
+    def search(self, query: str, limit: int = 12) -> List[Dict[str, Any]]:
+        normalized = normalize(query)
+        terms = normalized.split()
+        if not terms or not self.ready:
+            return []
+
+        with self._lock:
+            ranks: Dict[int, int] = {}
+            for index in self._name_candidates(normalized):
+                ranks[index] = 0 if self._normalized[index] == normalized else 1
+
+            # Drive the scan from the rarest word; short words only have their
+            # precomputed head list, so prefer any longer word when there is one.
+            options = sorted((len(term) <= HEAD_PREFIX_LENGTH, *self._word_lists(term)[:1], position) for position, term in enumerate(terms))
+            driver_position = options[0][-1]
+            _, lists = self._word_lists(terms[driver_position])
+            others = [" " + term for position, term in enumerate(terms) if position != driver_position]
+            other = others[0] if len(others) == 1 else None  # the common two-word case skips all()
+            first = terms[0]
+            spaced, tokens = self._spaced, self._tokens
+            strong = len(ranks)
+            candidates = lists[0] if len(lists) == 1 else heapq.merge(*lists)
+            for index in itertools.islice(candidates, SCAN_BUDGET):
+                if index in ranks:
+                    continue
+                if other is not None:
+                    if other not in spaced[index]:
+                        continue
+                elif others and not all(term in spaced[index] for term in others):
+                    continue
+                rank = 2 if tokens[index][0].startswith(first) else 3
+                ranks[index] = rank
+                if rank == 2:
+                    strong += 1
+                    if strong >= limit:
+                        break  # later candidates rank lower on both keys
+            scored = sorted((rank, index) for index, rank in ranks.items())
+            return [
+                {
+                    "app_id": self._ids[index],
+                    "name": self._names[index],
+                    "image": CAPSULE_URL.format(app_id=self._ids[index]),
+                    "price": None,
+                    "released": None,
+                    "installed": self._installed[index],
+                }
+                for _, index in scored[:limit]
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "apps": self.size, "catalog": self.catalog_size, "built_at": self.built_at, "build_seconds": self.build_seconds}
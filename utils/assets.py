@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:  # brotli is optional; gzip alone still covers every browser
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("main")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class AssetPipeline:
+    """Fingerprint and precompress dashboard assets.
+
+    Each source file is copied to ``build_dir`` as ``<stem>.<hash>.<ext>`` plus
+    ``.gz`` (and ``.br`` when brotli is installed) siblings. Because the name
+    changes whenever the content does, the files can be cached forever.
+    """
+
+    def __init__(self, source_dir: Path, build_dir: Path, files: Iterable[str] = ("app.js", "style.css")) -> None:
+        self.source_dir = Path(source_dir)
+        self.build_dir = Path(build_dir)
+        self.files = tuple(files)
+        self.manifest: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, name: str, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        return f"{stem}.{digest}{ext}"
+
+    def _write_if_missing(self, path: Path, data: bytes) -> None:
+        if path.exists():
+            return
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def _remove_stale(self, keep: Iterable[str]) -> None:
+        keep_names = set(keep)
+        for entry in self.build_dir.iterdir():
+            base = entry.name
+            for suffix in (".gz", ".br"):
+                if base.endswith(suffix):
+                    base = base[: -len(suffix)]
+            if base not in keep_names and entry.name != "manifest.json":
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def build(self) -> Dict[str, str]:
+        """Write fingerprinted and compressed copies; return logical -> built name."""
+        manifest: Dict[str, str] = {}
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        for name in self.files:
+            source = self.source_dir / name
+            if not source.exists():
+                continue
+            data = source.read_bytes()
+            built_name = self._fingerprint(name, data)
+            self._write_if_missing(self.build_dir / built_name, data)
+            self._write_if_missing(self.build_dir / f"{built_name}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                self._write_if_missing(self.build_dir / f"{built_name}.br", brotli.compress(data, quality=11))
+            manifest[name] = built_name
+
+        self._remove_stale(manifest.values())
+        (self.build_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        self.manifest = manifest
+        return manifest
+
+    def ensure_built(self) -> Dict[str, str]:
+        if self.manifest is not None:
+            return self.manifest
+        with self._lock:
+            if self.manifest is None:
+                try:
+                    self.build()
+                except Exception as exc:
+                    logger.warning(f"Asset build failed; serving unversioned assets: {exc}")
+                    self.manifest = {}
+        return self.manifest or {}
+
+    def url_for(self, name: str) -> str:
+        built_name = self.ensure_built().get(name)
+        if built_name:
+            return f"/assets/{built_name}"
+        return f"/static/{name}"
+
+    def resolve(self, filename: str, accept_encoding: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Pick the best precompressed variant of ``filename`` for the client.
+
+        Returns the file name to send and its Content-Encoding, or ``None`` if
+        ``filename`` is not a current build output.
+        """
+        if filename not in self.ensure_built().values():
+            return None
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",") if part.strip()}
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and (self.build_dir / f"{filename}{suffix}").exists():
+                return f"{filename}{suffix}", encoding
+        return filename, None
+
+
+if __name__ == "__main__":
+    app_dir = Path(__file__).resolve().parent.parent
+    pipeline = AssetPipeline(app_dir / "web" / "static", app_dir / "web" / "static" / "dist")
+    for logical, built in pipeline.build().items():
+        print(f"{logical} -> {built}")
@@ -0,0 +1,59 @@
+import threading
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """Wall-clock time and waits, as used by the scheduler.
+
+    The scheduler reads time and sleeps only through this object, so the
+    dry-run simulator can swap in a ``VirtualClock``.
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True early if ``event`` is set."""
+        return event.wait(timeout)
+
+
+class VirtualClock(SystemClock):
+    """A clock that only moves when something waits on it.
+
+    Waits return immediately after advancing virtual time, so hours of
+    scheduling run in a fraction of a second. Only for single-threaded use:
+    nothing sets an event while a wait is "sleeping".
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = start
+        self.started_at = start
+
+    @property
+    def elapsed(self) -> float:
+        return self._now - self.started_at
+
+    def advance(self, seconds: float) -> None:
+        self._now += max(0.0, seconds)
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._now)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return event.is_set()
@@ -0,0 +1,135 @@
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import psutil
+
+
+@dataclass
+class ResourceSample:
+    available_memory_percent: float
+    available_memory_mb: float
+    cpu_percent: float
+    load_per_cpu: Optional[float]  # 1-minute load average per core; None where the OS has none
+
+
+def sample_resources() -> ResourceSample:
+    memory = psutil.virtual_memory()
+    try:
+        load_per_cpu: Optional[float] = os.getloadavg()[0] / (psutil.cpu_count() or 1)
+    except (AttributeError, OSError):
+        load_per_cpu = None
+    return ResourceSample(
+        available_memory_percent=memory.available * 100.0 / memory.total,
+        available_memory_mb=memory.available / (1024 * 1024),
+        cpu_percent=psutil.cpu_percent(interval=None),  # since the previous call
+        load_per_cpu=load_per_cpu,
+    )
+
+
+@dataclass
+class ConcurrencyDecision:
+    ts: float
+    action: str  # raise|lower|hold|pause
+    previous: int
+    limit: int
+    reason: str
+    sample: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class AdaptiveConcurrency:
+    """Pick how many games to run at once from free memory, CPU and load.
+
+    Before each batch ``evaluate`` halves the limit when any resource is
+    under pressure, raises it by one when all of them have clear headroom
+    and otherwise keeps it, always within ``[minimum, maximum]``. While a
+    batch is launching, ``pressure`` is checked before every further game so
+    a batch can stop early if memory runs out. Recent decisions are kept
+    with the sample and the reason behind them.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 10,
+        min_free_memory_percent: float = 15.0,
+        max_cpu_percent: float = 85.0,
+        max_load_per_cpu: float = 1.5,
+        sampler: Callable[[], ResourceSample] = sample_resources,
+        keep: int = 50,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.min_free_memory_percent = min_free_memory_percent
+        self.max_cpu_percent = max_cpu_percent
+        self.max_load_per_cpu = max_load_per_cpu
+        self.sampler = sampler
+        self.decisions: Deque[ConcurrencyDecision] = deque(maxlen=keep)
+
+    def configure(self, minimum: int, maximum: int) -> None:
+        """Apply new bounds, clamping the current limit into them."""
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, self.limit))
+
+    def _pressure(self, sample: ResourceSample) -> List[str]:
+        reasons = []
+        if sample.available_memory_percent < self.min_free_memory_percent:
+            reasons.append(f"memory {sample.available_memory_percent:.0f}% free < {self.min_free_memory_percent:.0f}%")
+        if sample.cpu_percent > self.max_cpu_percent:
+            reasons.append(f"CPU {sample.cpu_percent:.0f}% > {self.max_cpu_percent:.0f}%")
+        if sample.load_per_cpu is not None and sample.load_per_cpu > self.max_load_per_cpu:
+            reasons.append(f"load {sample.load_per_cpu:.2f}/core > {self.max_load_per_cpu:.2f}")
+        return reasons
+
+    def _headroom(self, sample: ResourceSample) -> bool:
+        return (
+            sample.available_memory_percent >= 2 * self.min_free_memory_percent
+            and sample.cpu_percent <= 0.6 * self.max_cpu_percent
+            and (sample.load_per_cpu is None or sample.load_per_cpu <= 0.6 * self.max_load_per_cpu)
+        )
+
+    def _decide(self, action: str, limit: int, reason: str, sample: ResourceSample) -> ConcurrencyDecision:
+        decision = ConcurrencyDecision(time.time(), action, self.limit, limit, reason, asdict(sample))
+        self.limit = limit
+        self.decisions.append(decision)
+        return decision
+
+    def evaluate(self) -> ConcurrencyDecision:
+        """Sample resources and set the limit for the next batch."""
+        sample = self.sampler()
+        pressure = self._pressure(sample)
+        if pressure:
+            lowered = max(self.minimum, self.limit // 2)
+            action = "lower" if lowered < self.limit else "hold"
+            return self._decide(action, lowered, "; ".join(pressure) + ("" if action == "lower" else " (at minimum)"), sample)
+        if self._headroom(sample):
+            raised = min(self.maximum, self.limit + 1)
+            action = "raise" if raised > self.limit else "hold"
+            return self._decide(action, raised, "headroom on memory, CPU and load" + ("" if action == "raise" else " (at maximum)"), sample)
+        return self._decide("hold", self.limit, "resources within bounds", sample)
+
+    def pressure(self) -> Optional[ConcurrencyDecision]:
+        """Mid-batch check: a ``pause`` decision if launching another game now would overload the host."""
+        sample = self.sampler()
+        pressure = self._pressure(sample)
+        if not pressure:
+            return None
+        return self._decide("pause", max(self.minimum, self.limit // 2), "; ".join(pressure), sample)
+
+    def snapshot(self) -> Dict[str, Any]:
+        last = self.decisions[-1] if self.decisions else None
+        return {
+            "limit": self.limit,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "last_action": last.action if last else None,
+            "last_reason": last.reason if last else None,
+        }
@@ -0,0 +1,128 @@
+import configparser
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("main")
+
+DEBOUNCE_SECONDS = 0.5
+MAX_DELAY_SECONDS = 3.0
+
+
+def ini_text(parser: configparser.ConfigParser) -> str:
+    buffer = io.StringIO()
+    parser.write(buffer)
+    return buffer.getvalue()
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` via a temp file in the same directory, so readers never see half a file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+
+
+class ConfigStore:
+    """Single writer for the config file.
+
+    Callers change the config in memory while holding ``lock`` and then call
+    ``schedule``. One background thread renders and writes the file once
+    changes have been quiet for ``debounce`` seconds, or ``max_delay``
+    seconds after the first unsaved change, whichever comes first. A burst
+    of saves therefore becomes one atomic write and one ``on_flush`` call
+    (the legacy mirror). ``flush`` writes pending changes right away.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        render: Callable[[], str],
+        on_flush: Optional[Callable[[], None]] = None,
+        debounce: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+    ) -> None:
+        self.path = Path(path)
+        self.render = render
+        self.on_flush = on_flush
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self.lock = threading.RLock()  # held while the in-memory config is changed or replaced
+        self.requests = 0
+        self.writes = 0
+        self._write_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._first_change: Optional[float] = None
+        self._last_change = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> bool:
+        return self._first_change is not None
+
+    def schedule(self) -> None:
+        """Note an in-memory change; it is written by the next flush."""
+        with self._cond:
+            now = time.monotonic()
+            self.requests += 1
+            self._last_change = now
+            if self._first_change is None:
+                self._first_change = now
+            closed = self._closed
+            if not closed and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._loop, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        if closed:
+            self.flush()  # no writer thread after close; save synchronously
+
+    def flush(self) -> bool:
+        """Write pending changes now; False if there were none or the write failed."""
+        with self.lock, self._write_lock:  # same order as callers that flush while holding ``lock``
+            with self._cond:
+                if self._first_change is None:
+                    return False
+                self._first_change = None
+            try:
+                write_atomic(self.path, self.render())
+            except OSError as exc:
+                logger.error(f"Failed to write config to {self.path}: {exc}")
+                return False
+            self.writes += 1
+            if self.on_flush:
+                self.on_flush()
+        return True
+
+    def close(self) -> None:
+        """Stop the writer thread and write anything still pending."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._first_change is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                while self._first_change is not None and not self._closed:
+                    due = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"pending": self.pending, "requests": self.requests, "writes": self.writes}
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger("main")
+
+# A handler returns a JSON-serializable result; a stream handler yields results
+# until the client disconnects or the generator finishes.
+Handler = Callable[[Dict[str, Any]], Any]
+StreamHandler = Callable[[Dict[str, Any]], Iterator[Any]]
+
+
+class ControlError(RuntimeError):
+    """Raised by the client when the daemon is unreachable or rejects a command."""
+
+
+def control_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socketserver, "ThreadingUnixStreamServer")
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        server: "_ControlSocketServer" = self.server  # type: ignore[assignment]
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8") or "{}")
+        except ValueError:
+            self._send({"ok": False, "error": "Malformed request"})
+            return
+        command = str(request.get("cmd", ""))
+
+        try:
+            if command in server.stream_handlers:
+                for item in server.stream_handlers[command](request):
+                    self._send({"ok": True, "result": item})
+                return
+            if command not in server.handlers:
+                self._send({"ok": False, "error": f"Unknown command '{command}'"})
+                return
+            self._send({"ok": True, "result": server.handlers[command](request)})
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        except Exception as exc:
+            logger.error(f"Control command '{command}' failed: {exc}")
+            try:
+                self._send({"ok": False, "error": str(exc)})
+            except OSError:
+                pass
+
+
+if control_supported():
+
+    class _ControlSocketServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path: str, handlers: Dict[str, Handler], stream_handlers: Dict[str, StreamHandler]) -> None:
+            self.handlers = handlers
+            self.stream_handlers = stream_handlers
+            super().__init__(path, _ControlRequestHandler)
+
+
+class ControlServer:
+    """Serve newline-delimited JSON commands over a Unix domain socket.
+
+    Each connection carries one request line and receives one response line
+    (or a stream of lines for stream handlers).
+    """
+
+    def __init__(self, path: Path, handlers: Dict[str, Handler], stream_handlers: Optional[Dict[str, StreamHandler]] = None) -> None:
+        self.path = Path(path)
+        self.handlers = handlers
+        self.stream_handlers = stream_handlers or {}
+        self._server: Optional[socketserver.BaseServer] = None
+
+    def start(self) -> bool:
+        if not control_supported():
+            logger.warning("Unix domain sockets are unavailable; control socket disabled")
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self.path.unlink()
+            self._server = _ControlSocketServer(str(self.path), self.handlers, self.stream_handlers)
+            os.chmod(self.path, 0o600)
+        except OSError as exc:
+            logger.error(f"Unable to open control socket {self.path}: {exc}")
+            return False
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Control socket listening at {self.path}")
+        return True
+
+    def stop(self) -> None:
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def _connect(path: Path, timeout: Optional[float]) -> socket.socket:
+    if not control_supported():
+        raise ControlError("Unix domain sockets are not supported on this platform")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError as exc:
+        sock.close()
+        raise ControlError(f"AutoBanana is not running (no control socket at {path})") from exc
+    return sock
+
+
+def stream_command(path: Path, command: str, timeout: Optional[float] = 5.0, **args: Any) -> Iterator[Any]:
+    """Send ``command`` and yield every result line the daemon returns."""
+    sock = _connect(path, timeout)
+    try:
+        sock.sendall(json.dumps({"cmd": command, **args}).encode("utf-8") + b"\n")
+        reader = sock.makefile("r", encoding="utf-8")
+        for line in reader:
+            reply = json.loads(line)
+            if not reply.get("ok"):
+                raise ControlError(reply.get("error") or "Command failed")
+            yield reply.get("result")
+    finally:
+        sock.close()
+
+
+def send_command(path: Path, command: str, timeout: float = 5.0, **args: Any) -> Any:
+    """Send ``command`` and return its single result."""
+    for result in stream_command(path, command, timeout=timeout, **args):
+        return result
+    raise ControlError("Daemon closed the connection without replying")
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger("main")
+
+
+class FleetAgent:
+    """Controller-side view of one remote AutoBanana instance."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+        self.status: Optional[Dict[str, Any]] = None
+        self.last_seen: Optional[float] = None
+        self.error: Optional[str] = None
+        self.assigned_games: Optional[List[str]] = None
+        self.offset = 0.0
+        self.next_trigger: Optional[float] = None
+        self.last_trigger: Optional[float] = None
+
+    @property
+    def online(self) -> bool:
+        return self.status is not None and self.error is None
+
+    @property
+    def weight(self) -> int:
+        """Work multiplier: each game is launched once per rotated account."""
+        if not self.status:
+            return 1
+        config = self.status.get("config") or {}
+        if config.get("switch_steam_accounts"):
+            return max(1, int(self.status.get("accounts_count") or 0))
+        return 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = self.status or {}
+        config = status.get("config") or {}
+        return {
+            "url": self.url,
+            "online": self.online,
+            "error": self.error,
+            "last_seen": self.last_seen,
+            "state": status.get("state"),
+            "next_run_at": status.get("next_run_at"),
+            "last_run_at": status.get("last_run_at"),
+            "games": config.get("games", []),
+            "accounts_count": status.get("accounts_count", 0),
+            "switch_steam_accounts": bool(config.get("switch_steam_accounts")),
+            "runs_completed": status.get("game_open_count", 0),
+            "offset_seconds": round(self.offset, 1),
+            "next_trigger": self.next_trigger,
+            "last_trigger": self.last_trigger,
+        }
+
+
+class FleetController:
+    """Coordinate several AutoBanana agents through their HTTP API.
+
+    The controller splits the fleet's game list across agents (weighted by how
+    many accounts each one rotates), pushes each share with ``/api/config`` and
+    triggers ``/api/run`` on a shared interval with a per-agent offset. Every
+    request carries the fleet's shared API token when one is set. Each
+    agent's own scheduler stays armed as a fallback: it fires ``interval``
+    after its last run finished, which is always later than the controller's
+    next trigger, so it only takes over if the controller goes away.
+    """
+
+    def __init__(
+        self,
+        agent_urls: List[str],
+        interval_seconds: int,
+        games: Optional[List[str]] = None,
+        poll_seconds: float = 5,
+        timeout: float = 3,
+        token: Optional[str] = None,
+    ) -> None:
+        self.agents = [FleetAgent(url) for url in agent_urls]
+        self.interval_seconds = max(1, int(interval_seconds))
+        self.games = list(games) if games is not None else None
+        self.poll_seconds = poll_seconds
+        self.timeout = timeout
+        self._session = requests.Session()
+        if token:
+            self._session.headers["X-AutoBanana-Token"] = token  # agents bound beyond loopback require it
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, min(16, len(self.agents))))
+        self._planned_for: Optional[tuple] = None
+
+    # ------------------------------------------------------------
+    # Agent I/O
+    # ------------------------------------------------------------
+    def _fetch_status(self, agent: FleetAgent) -> None:
+        try:
+            response = self._session.get(f"{agent.url}/api/status", timeout=self.timeout)
+            response.raise_for_status()
+            status = response.json()
+        except Exception as exc:
+            with self._lock:
+                agent.error = str(exc)
+            return
+        with self._lock:
+            agent.status = status
+            agent.error = None
+            agent.last_seen = time.time()
+
+    def poll_agents(self) -> None:
+        list(self._pool.map(self._fetch_status, self.agents))
+
+    def _post(self, agent: FleetAgent, path: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        try:
+            response = self._session.post(f"{agent.url}{path}", json=payload or {}, timeout=self.timeout)
+            response.raise_for_status()
+            return True
+        except Exception as exc:
+            with self._lock:
+                agent.error = str(exc)
+            logger.warning(f"Fleet request {path} to {agent.url} failed: {exc}")
+            return False
+
+    # ------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------
+    def plan_games(self) -> Dict[str, List[str]]:
+        """Greedily hand each game to the online agent with the least work."""
+        online = [agent for agent in self.agents if agent.online]
+        plan: Dict[str, List[str]] = {agent.url: [] for agent in online}
+        if not online or self.games is None:
+            return plan
+        load = {agent.url: 0 for agent in online}
+        weights = {agent.url: agent.weight for agent in online}
+        for game in self.games:
+            target = min(online, key=lambda agent: (load[agent.url] + weights[agent.url], agent.url))
+            plan[target.url].append(game)
+            load[target.url] += weights[target.url]
+        return plan
+
+    def apply_plan(self) -> None:
+        """Push game shares and reset the stagger when the online set changes."""
+        online = tuple(agent.url for agent in self.agents if agent.online)
+        if online == self._planned_for:
+            return
+        self._planned_for = online
+        plan = self.plan_games()
+        now = time.time()
+        online_agents = [agent for agent in self.agents if agent.online]
+        step = self.interval_seconds / max(1, len(online_agents))
+        for index, agent in enumerate(online_agents):
+            agent.offset = index * step
+            agent.next_trigger = now + agent.offset
+            payload: Dict[str, Any] = {"run_interval_seconds": self.interval_seconds}
+            if self.games is not None:
+                agent.assigned_games = plan.get(agent.url, [])
+                payload["games"] = agent.assigned_games
+            self._post(agent, "/api/config", payload)
+        if online_agents:
+            logger.info(f"Fleet plan applied to {len(online_agents)} agent(s), stagger {step:.0f}s")
+
+    def trigger_due(self, now: Optional[float] = None) -> List[str]:
+        """Start runs on every agent whose slot has come up; return their URLs."""
+        now = now if now is not None else time.time()
+        triggered = []
+        for agent in self.agents:
+            if not agent.online or agent.next_trigger is None or now < agent.next_trigger:
+                continue
+            if self._post(agent, "/api/run"):
+                agent.last_trigger = now
+                triggered.append(agent.url)
+            while agent.next_trigger <= now:
+                agent.next_trigger += self.interval_seconds
+        return triggered
+
+    def run_forever(self, stop_event: threading.Event) -> None:
+        logger.info(f"Fleet controller managing {len(self.agents)} agent(s) every {self.interval_seconds}s")
+        while not stop_event.is_set():
+            self.poll_agents()
+            self.apply_plan()
+            for url in self.trigger_due():
+                logger.info(f"Fleet triggered run on {url}")
+            stop_event.wait(self.poll_seconds)
+
+    # ------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = [agent.to_dict() for agent in self.agents]
+        online = [agent for agent in agents if agent["online"]]
+        return {
+            "interval_seconds": self.interval_seconds,
+            "agents": agents,
+            "totals": {
+                "agents": len(agents),
+                "online": len(online),
+                "running": sum(1 for agent in online if agent["state"] == "running"),
+                "games": sum(len(agent["games"]) for agent in online),
+                "accounts": sum(agent["accounts_count"] for agent in online),
+                "runs_completed": sum(agent["runs_completed"] or 0 for agent in online),
+            },
+        }
@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import psutil
+
+from utils.process_match import InstallPathMatcher
+from utils.process_tree import ProcessSnapshot
+
+logger = logging.getLogger("main")
+
+SAMPLE_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class GameProfile:
+    """CPU, memory and disk I/O of one game's process tree over one dwell."""
+
+    app_id: str
+    started_at: float
+    seconds: float = 0.0
+    samples: int = 0
+    cpu_avg: float = 0.0  # percent of one core, summed over the tree
+    cpu_peak: float = 0.0
+    rss_avg: float = 0.0  # bytes
+    rss_peak: float = 0.0
+    io_read: int = 0  # bytes since the processes started
+    io_write: int = 0
+    peak_processes: int = 0
+    _cpu_total: float = field(default=0.0, repr=False)
+    _rss_total: float = field(default=0.0, repr=False)
+    _io: Dict[int, Any] = field(default_factory=dict, repr=False)
+
+    def add(self, cpu: float, rss: float, processes: int) -> None:
+        self.samples += 1
+        self._cpu_total += cpu
+        self._rss_total += rss
+        self.cpu_avg = self._cpu_total / self.samples
+        self.rss_avg = self._rss_total / self.samples
+        self.cpu_peak = max(self.cpu_peak, cpu)
+        self.rss_peak = max(self.rss_peak, rss)
+        self.peak_processes = max(self.peak_processes, processes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+
+class GameProfiler:
+    """Sample the process trees of launched games at a low rate.
+
+    ``start`` is given a matcher for the install dirs of the games to watch.
+    A daemon thread then takes one ``process_iter`` pass every ``interval``
+    seconds, finds the processes running from those dirs plus everything
+    they spawned, and adds their CPU, RSS and I/O to that app's profile. ``stop``
+    ends sampling and returns the profiles of every app that was seen.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS) -> None:
+        self.interval = max(0.1, interval)
+        self._matcher = InstallPathMatcher({})
+        self._profiles: Dict[str, GameProfile] = {}
+        self._procs: Dict[int, psutil.Process] = {}  # kept so cpu_percent measures since the previous sample
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, matcher: InstallPathMatcher) -> None:
+        """Begin sampling the processes of the games in ``matcher``."""
+        self.stop()
+        if not len(matcher):
+            return
+        with self._lock:
+            self._matcher = matcher
+            self._profiles = {}
+            self._procs = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="game-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> List[GameProfile]:
+        """Stop sampling and return one profile per app that had running processes."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return []
+        self._stop.set()
+        thread.join(timeout=self.interval + 5)
+        with self._lock:
+            profiles = [profile for profile in self._profiles.values() if profile.samples]
+            self._profiles = {}
+            self._procs = {}
+        now = time.time()
+        for profile in profiles:
+            profile.seconds = now - profile.started_at
+        return profiles
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as exc:  # never let profiling take the scheduler down
+                logger.warning(f"Game profiling sample failed: {exc}")
+            self._stop.wait(self.interval)
+
+    def sample(self) -> None:
+        """Take one sample of every target's process tree."""
+        snapshot = ProcessSnapshot.take()
+        roots: Dict[str, List[int]] = {}
+        for proc, app_id in snapshot.matching(self._matcher):
+            roots.setdefault(app_id, []).append(proc.info["pid"])
+
+        with self._lock:
+            seen: Set[int] = set()
+            for app_id, pids in roots.items():
+                tree = set(pids) | snapshot.descendants(pids)
+                seen.update(tree)
+                self._sample_tree(app_id, tree)
+            for pid in list(self._procs):
+                if pid not in seen:
+                    del self._procs[pid]
+
+    def _sample_tree(self, app_id: str, pids: Set[int]) -> None:
+        profile = self._profiles.get(app_id)
+        if profile is None:
+            profile = self._profiles[app_id] = GameProfile(app_id=app_id, started_at=time.time())
+        cpu = rss = 0.0
+        primed = True
+        alive = 0
+        for pid in pids:
+            proc = self._procs.get(pid)
+            try:
+                if proc is None:
+                    proc = self._procs[pid] = psutil.Process(pid)
+                    proc.cpu_percent(None)  # first call only sets the baseline
+                    primed = False
+                else:
+                    cpu += proc.cpu_percent(None)
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    try:
+                        io = proc.io_counters()
+                        profile._io[pid] = (io.read_bytes, io.write_bytes)
+                    except (AttributeError, psutil.AccessDenied):
+                        pass  # no per-process I/O on macOS, or not ours to read
+                alive += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._procs.pop(pid, None)
+        if not alive:
+            return
+        profile.io_read = sum(read for read, _ in profile._io.values())
+        profile.io_write = sum(write for _, write in profile._io.values())
+        if primed or profile.samples:
+            profile.add(cpu, rss, alive)
+        else:
+            # The very first pass has no CPU baseline yet; keep memory only.
+            profile.rss_peak = max(profile.rss_peak, rss)
+            profile.peak_processes = max(profile.peak_processes, alive)
@@ -0,0 +1,316 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("main")
+
+EVENT_KINDS = ("run", "account", "launch", "close", "failure", "concurrency", "deferral")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    run_id INTEGER,
+    account TEXT,
+    app_id TEXT,
+    status TEXT NOT NULL,
+    duration REAL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events (kind, ts);
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    run_id INTEGER,
+    account TEXT,
+    app_id TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    cpu_avg REAL NOT NULL,
+    cpu_peak REAL NOT NULL,
+    rss_avg REAL NOT NULL,
+    rss_peak REAL NOT NULL,
+    io_read INTEGER NOT NULL,
+    io_write INTEGER NOT NULL,
+    peak_processes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_app_ts ON profiles (app_id, ts);
+CREATE TABLE IF NOT EXISTS ledger (
+    account TEXT NOT NULL,
+    app_id TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    run_id INTEGER,
+    PRIMARY KEY (account, app_id)
+);
+CREATE TABLE IF NOT EXISTS pruned (
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (kind, status)
+);
+"""
+
+
+class HistoryStore:
+    """Append-only SQLite history of scheduler events and game resource profiles.
+
+    ``events`` has one row per run, account pass, launch, close, failure,
+    concurrency change or deferral (``EVENT_KINDS``) and ``profiles`` one row
+    per game dwell. Both are only inserted into, so the store can be queried
+    while the scheduler keeps writing to it, and ``prune`` drops rows past
+    the retention window. The ledger keeps a single row per (account, game)
+    with the latest time that game finished a full dwell on that account.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def new_run_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM events").fetchone()
+        return int(row[0])
+
+    def prune(self, before: float) -> int:
+        """Delete events and profiles older than ``before``; return how many rows went.
+
+        Pruned events still count towards ``count``, and the latest run's
+        events are kept so ``new_run_id`` never hands out an ID twice.
+        """
+        where = "ts < ? AND run_id IS NOT (SELECT MAX(run_id) FROM events)"
+        try:
+            with self._lock:
+                self._conn.execute(
+                    f"""INSERT INTO pruned (kind, status, total) SELECT kind, status, COUNT(*) FROM events WHERE {where} GROUP BY kind, status
+                        ON CONFLICT (kind, status) DO UPDATE SET total = total + excluded.total""",
+                    (before,),
+                )
+                removed = self._conn.execute(f"DELETE FROM events WHERE {where}", (before,)).rowcount
+                removed += self._conn.execute("DELETE FROM profiles WHERE ts < ?", (before,)).rowcount
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning(f"Unable to prune history: {exc}")
+            return 0
+        return removed
+
+    def record(
+        self,
+        kind: str,
+        status: str = "ok",
+        run_id: Optional[int] = None,
+        account: Optional[str] = None,
+        app_id: Optional[str] = None,
+        duration: Optional[float] = None,
+        detail: Optional[str] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown history event kind: {kind}")
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO events (ts, kind, run_id, account, app_id, status, duration, detail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ts if ts is not None else time.time(), kind, run_id, account, app_id, status, duration, detail),
+                )
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning(f"Unable to record {kind} history event: {exc}")
+
+    def record_profile(self, profile: Dict[str, Any], run_id: Optional[int] = None, account: Optional[str] = None) -> None:
+        """Store one ``GameProfile.to_dict()``."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """INSERT INTO profiles (ts, run_id, account, app_id, seconds, samples, cpu_avg, cpu_peak,
+                                             rss_avg, rss_peak, io_read, io_write, peak_processes)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        profile["started_at"],
+                        run_id,
+                        account,
+                        profile["app_id"],
+                        profile["seconds"],
+                        profile["samples"],
+                        profile["cpu_avg"],
+                        profile["cpu_peak"],
+                        profile["rss_avg"],
+                        profile["rss_peak"],
+                        profile["io_read"],
+                        profile["io_write"],
+                        profile["peak_processes"],
+                    ),
+                )
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning(f"Unable to record profile for {profile.get('app_id')}: {exc}")
+
+    def profiles(self, app_id: Optional[str] = None, start: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Peak and sample-weighted average figures per app ID, most expensive (peak RSS) first."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if app_id:
+            clauses.append("app_id = ?")
+            params.append(app_id)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT app_id, COUNT(*) AS dwells, SUM(samples) AS samples, SUM(seconds) AS seconds,
+                           SUM(cpu_avg * samples) / SUM(samples) AS cpu_avg, MAX(cpu_peak) AS cpu_peak,
+                           SUM(rss_avg * samples) / SUM(samples) AS rss_avg, MAX(rss_peak) AS rss_peak,
+                           AVG(io_read) AS io_read_avg, MAX(io_read) AS io_read_peak,
+                           AVG(io_write) AS io_write_avg, MAX(io_write) AS io_write_peak,
+                           MAX(peak_processes) AS peak_processes, MAX(ts) AS last_seen
+                    FROM profiles{where} GROUP BY app_id ORDER BY rss_peak DESC""",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_completed(self, account: Optional[str], app_ids: Iterable[str], completed_at: float, run_id: Optional[int] = None) -> None:
+        """Record that ``app_ids`` finished their dwell on ``account`` (None when not rotating)."""
+        rows = [(account or "", app_id, completed_at, run_id) for app_id in app_ids]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    """INSERT INTO ledger (account, app_id, completed_at, run_id) VALUES (?, ?, ?, ?)
+                       ON CONFLICT (account, app_id) DO UPDATE SET completed_at = excluded.completed_at, run_id = excluded.run_id""",
+                    rows,
+                )
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning(f"Unable to update the completion ledger: {exc}")
+
+    def completed_since(self, since: float) -> Dict[str, Dict[str, float]]:
+        """account -> {app_id: completed_at} for pairs completed at or after ``since``."""
+        with self._lock:
+            rows = self._conn.execute("SELECT account, app_id, completed_at FROM ledger WHERE completed_at >= ?", (since,)).fetchall()
+        completed: Dict[str, Dict[str, float]] = {}
+        for row in rows:
+            completed.setdefault(row["account"], {})[row["app_id"]] = row["completed_at"]
+        return completed
+
+    def count(self, kind: str, status: Optional[str] = None) -> int:
+        """Lifetime number of ``kind`` events, including pruned ones."""
+        where = "kind = ?"
+        params: List[Any] = [kind]
+        if status:
+            where += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            live = self._conn.execute(f"SELECT COUNT(*) FROM events WHERE {where}", params).fetchone()[0]
+            pruned = self._conn.execute(f"SELECT COALESCE(SUM(total), 0) FROM pruned WHERE {where}", params).fetchone()[0]
+        return int(live) + int(pruned)
+
+    def _where(
+        self,
+        start: Optional[float],
+        end: Optional[float],
+        kinds: Optional[Iterable[str]],
+        account: Optional[str],
+        app_id: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        kind_list = [kind for kind in (kinds or []) if kind in EVENT_KINDS]
+        if kind_list:
+            clauses.append(f"kind IN ({', '.join('?' for _ in kind_list)})")
+            params.extend(kind_list)
+        if account:
+            clauses.append("account = ?")
+            params.append(account)
+        if app_id:
+            clauses.append("app_id = ?")
+            params.append(app_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        kinds: Optional[Iterable[str]] = None,
+        account: Optional[str] = None,
+        app_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of events (newest first) and the total match count."""
+        where, params = self._where(start, end, kinds, account, app_id)
+        with self._lock:
+            total = int(self._conn.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0])
+            rows = self._conn.execute(
+                f"SELECT ts, kind, run_id, account, app_id, status, duration, detail FROM events{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def aggregates(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        kinds: Optional[Iterable[str]] = None,
+        account: Optional[str] = None,
+        app_id: Optional[str] = None,
+        bucket_seconds: int = 86400,
+    ) -> Dict[str, Any]:
+        """Summarize matching events per kind and per time bucket."""
+        where, params = self._where(start, end, kinds, account, app_id)
+        bucket_seconds = max(60, int(bucket_seconds))
+        with self._lock:
+            kind_rows = self._conn.execute(
+                f"""SELECT kind, COUNT(*) AS count,
+                           SUM(CASE WHEN status = 'ok' THEN 0 ELSE 1 END) AS not_ok,
+                           SUM(duration) AS total_duration, AVG(duration) AS avg_duration, MAX(duration) AS max_duration
+                    FROM events{where} GROUP BY kind""",
+                params,
+            ).fetchall()
+            bucket_rows = self._conn.execute(
+                f"""SELECT CAST(ts / ? AS INTEGER) * ? AS bucket, kind, COUNT(*) AS count
+                    FROM events{where} GROUP BY bucket, kind ORDER BY bucket""",
+                [bucket_seconds, bucket_seconds] + params,
+            ).fetchall()
+
+        buckets: Dict[int, Dict[str, Any]] = {}
+        for row in bucket_rows:
+            entry = buckets.setdefault(int(row["bucket"]), {"start": int(row["bucket"])})
+            entry[row["kind"]] = row["count"]
+        return {
+            "by_kind": {
+                row["kind"]: {
+                    "count": row["count"],
+                    "not_ok": row["not_ok"] or 0,
+                    "total_duration": row["total_duration"],
+                    "avg_duration": row["avg_duration"],
+                    "max_duration": row["max_duration"],
+                }
+                for row in kind_rows
+            },
+            "bucket_seconds": bucket_seconds,
+            "buckets": list(buckets.values()),
+        }
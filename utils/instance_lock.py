@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+try:  # POSIX advisory locks
+    import fcntl
+except ImportError:
+    fcntl = None
+try:  # Windows byte-range locks
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class InstanceLock:
+    """OS-level lock that marks the one running AutoBanana instance.
+
+    The lock belongs to an open file handle, so the OS releases it whenever the
+    holder exits, crashes included, and no stale lock is ever left to clean
+    up. The file stays on disk and only records the holder's PID.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._handle is not None
+
+    def acquire(self) -> bool:
+        """Take the lock without blocking; return False if another process holds it."""
+        if self._handle is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a+", encoding="ascii")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{os.getpid()}\n")
+        handle.flush()
+        self._handle = handle
+        return True
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._handle.close()
+        self._handle = None
@@ -0,0 +1,135 @@
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller.
+
+    When the queue is full the record is discarded and counted; the count is
+    written to the log as a warning once the writer catches up.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.dropped = 0
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self._drop_lock:
+            unreported = self._unreported
+        if unreported:
+            notice = logging.LogRecord("main", logging.WARNING, __file__, 0, f"Dropped {unreported} log record(s); log queue was full", None, None)
+            try:
+                self.queue.put_nowait(notice)
+                with self._drop_lock:
+                    self._unreported -= unreported
+            except queue.Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                self._unreported += 1
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotate on size or age and gzip the rotated files.
+
+    Archives are named ``<log>.1.gz`` (newest) to ``<log>.<backup_count>.gz``.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, max_age_seconds: int = 0) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=max(1, backup_count), encoding="utf-8", delay=True)
+        self.max_age_seconds = max_age_seconds
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+        self._period_start = self._initial_period_start()
+
+    def _initial_period_start(self) -> float:
+        """Age an existing log from its first record so restarts don't reset it."""
+        try:
+            with open(self.baseFilename, "r", encoding="utf-8", errors="replace") as handle:
+                first_line = handle.readline()
+            return datetime.strptime(first_line[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+        except (OSError, ValueError):
+            return time.time()
+
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        if not os.path.exists(source):
+            return
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if self.max_age_seconds and time.time() - self._period_start >= self.max_age_seconds:
+            return 1
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._period_start = time.time()
+
+
+class _BlockingSentinelListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=5)
+        except queue.Full:
+            pass
+
+
+class LogWriter:
+    """Route log records through a bounded queue to a background file writer."""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int, max_age_seconds: int, queue_size: int) -> None:
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.file_handler = CompressingRotatingFileHandler(path, max_bytes, backup_count, max_age_seconds)
+        self.file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self._listener: Optional[logging.handlers.QueueListener] = _BlockingSentinelListener(self.queue, self.file_handler)
+        self._listener.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.queue_handler.dropped
+
+    @property
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    def stop(self) -> None:
+        """Flush queued records and close the file; safe to call twice."""
+        if not self._listener:
+            return
+        self._listener.stop()
+        self._listener = None
+        self.file_handler.close()
+
+
+def configure_logging(
+    path: str,
+    level: int = logging.INFO,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 5,
+    max_age_seconds: int = 7 * 24 * 3600,
+    queue_size: int = 10000,
+) -> LogWriter:
+    """Install a non-blocking root handler that writes to ``path`` in the background."""
+    writer = LogWriter(path, max_bytes, backup_count, max_age_seconds, queue_size)
+    logging.basicConfig(level=level, handlers=[writer.queue_handler])
+    return writer
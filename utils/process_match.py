@@ -0,0 +1,97 @@
+import ntpath
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_DRIVE = re.compile(r"^([a-zA-Z]):[\\/]")
+_LEAF = object()  # trie key holding the app ID of the install dir that ends at a node
+
+
+def path_parts(path: str, windows: bool = os.name == "nt") -> Tuple[str, ...]:
+    """Split ``path`` into comparable components.
+
+    Windows paths are case-folded. Under Proton/Wine the game is started as
+    ``Z:\\home\\...\\Game.exe``; the ``Z:`` drive maps to ``/``, so those
+    paths are turned back into the POSIX path of the install dir.
+    """
+    if not path:
+        return ()
+    if windows:
+        return tuple(part for part in ntpath.normcase(ntpath.normpath(path)).split("\\") if part)
+    drive = _DRIVE.match(path)
+    if drive:
+        if drive.group(1).lower() != "z":
+            return ()  # other Wine drives live inside the prefix, never under a Steam library
+        path = "/" + path[3:].replace("\\", "/")
+    return tuple(part for part in os.path.normpath(path).split("/") if part)
+
+
+class InstallPathMatcher:
+    """Map a process to the configured game whose install dir it runs from.
+
+    Install dirs go into a trie of path components, so a lookup walks at
+    most one path's depth no matter how many games are configured. A
+    process is tried by its executable, its ``argv[0]`` and any ``.exe``
+    argument, which is where Proton puts the Windows binary while the
+    process itself is ``wine64-preloader``.
+    """
+
+    def __init__(self, install_paths: Dict[str, str], windows: bool = os.name == "nt") -> None:
+        self.windows = windows
+        self.install_paths = dict(install_paths)
+        self._trie: Dict[Any, Any] = {}
+        for app_id, path in self.install_paths.items():
+            if not path:
+                continue
+            variants = {path} if windows else {path, os.path.realpath(path)}  # Steam dirs are often symlinked on Linux
+            for variant in variants:
+                self._insert(path_parts(variant, windows), app_id)
+
+    def __len__(self) -> int:
+        return len(self.install_paths)
+
+    @property
+    def app_ids(self) -> List[str]:
+        return list(self.install_paths)
+
+    def subset(self, app_ids: Iterable[str]) -> "InstallPathMatcher":
+        wanted = set(app_ids)
+        return InstallPathMatcher({app_id: path for app_id, path in self.install_paths.items() if app_id in wanted}, self.windows)
+
+    def _insert(self, parts: Tuple[str, ...], app_id: str) -> None:
+        if not parts:
+            return
+        node = self._trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_LEAF] = app_id
+
+    def match_path(self, path: Optional[str]) -> Optional[str]:
+        """App ID of the deepest install dir containing ``path``, if any."""
+        if not path:
+            return None
+        node = self._trie
+        found = None
+        for part in path_parts(path, self.windows):
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_LEAF, found)
+        return found
+
+    def match(self, info: Dict[str, Any]) -> Optional[str]:
+        """App ID for a ``process_iter`` info dict with ``exe`` and ``cmdline``."""
+        app_id = self.match_path(info.get("exe"))
+        if app_id:
+            return app_id
+        cmdline = info.get("cmdline") or []
+        if cmdline:
+            app_id = self.match_path(cmdline[0])
+            if app_id:
+                return app_id
+        for arg in cmdline[1:]:
+            if arg[-4:].lower() == ".exe":
+                app_id = self.match_path(arg)
+                if app_id:
+                    return app_id
+        return None
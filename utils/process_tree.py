@@ -0,0 +1,67 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import psutil
+
+from utils.process_match import InstallPathMatcher
+
+
+class ProcessSnapshot:
+    """One ``process_iter`` pass: every process plus a parent -> children map.
+
+    Lookups for game processes and whole subtrees are answered from the
+    snapshot, so closing a batch of games costs a single walk of the process
+    table however many games and children there are.
+    """
+
+    def __init__(self, processes: Iterable[psutil.Process]) -> None:
+        self.processes: Dict[int, psutil.Process] = {}
+        self.children: Dict[int, List[int]] = {}
+        for proc in processes:
+            pid = proc.info["pid"]
+            self.processes[pid] = proc
+            self.children.setdefault(proc.info.get("ppid") or 0, []).append(pid)
+
+    @classmethod
+    def take(cls) -> "ProcessSnapshot":
+        return cls(psutil.process_iter(["pid", "ppid", "name", "create_time", "exe", "cmdline"]))
+
+    def matching(self, matcher: InstallPathMatcher) -> List[Tuple[psutil.Process, str]]:
+        """Processes running from one of ``matcher``'s install dirs, with the app ID each belongs to."""
+        found = []
+        for proc in self.processes.values():
+            app_id = matcher.match(proc.info)
+            if app_id:
+                found.append((proc, app_id))
+        return found
+
+    def descendants(self, pids: Iterable[int]) -> Set[int]:
+        """PIDs of everything below ``pids``, not including them."""
+        found: Set[int] = set()
+        stack = [child for pid in pids for child in self.children.get(pid, ())]
+        while stack:
+            pid = stack.pop()
+            if pid in found:
+                continue
+            found.add(pid)
+            stack.extend(self.children.get(pid, ()))
+        return found
+
+    def tree(self, root: psutil.Process, exclude: Optional[Set[int]] = None) -> List[psutil.Process]:
+        """``root`` followed by its descendants, skipping PIDs in ``exclude``."""
+        exclude = exclude or set()
+        pids = sorted(self.descendants([root.info["pid"]]) - exclude)
+        return [root] + [self.processes[pid] for pid in pids if pid in self.processes]
+
+
+def terminate_all(procs: Iterable[psutil.Process]) -> List[psutil.Process]:
+    """Send SIGTERM to each process; return the ones that were still there to signal."""
+    signalled = []
+    for proc in procs:
+        try:
+            proc.terminate()
+            signalled.append(proc)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        except psutil.AccessDenied:
+            continue  # anti-cheat services often run elevated; leave them to the game's own exit
+    return signalled
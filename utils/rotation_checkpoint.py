@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger("main")
+
+VERSION = 1
+
+
+class RotationCheckpoint:
+    """On-disk progress of the current run, so a restart can pick up where it stopped.
+
+    ``begin`` records which accounts and games the run covers. After that,
+    every batch whose games finished their dwell and every finished account
+    is written through (temp file, fsync, rename) before the run moves on. A crash therefore
+    loses at most the step in flight. ``finish`` removes the file once the
+    rotation is complete. ``resumable`` only accepts a checkpoint taken
+    within the current interval for the same game list.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._state: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable rotation checkpoint {self.path}: {exc}")
+            return None
+        if not isinstance(state, dict) or state.get("version") != VERSION:
+            return None
+        return state
+
+    def _write(self) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(self._state, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as exc:
+            logger.warning(f"Unable to save rotation checkpoint: {exc}")
+
+    def resumable(self, now: float, interval_seconds: float, games: List[str], rotating: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """The saved checkpoint if it belongs to this interval, game list and rotation mode, else None."""
+        state = self.load()
+        if not state:
+            return None
+        if not state["started_at"] <= now < state["started_at"] + interval_seconds:
+            return None
+        if state["games"] != list(games) or (rotating is not None and state["rotating"] != rotating):
+            return None
+        return state
+
+    def begin(self, started_at: float, accounts: List[str], games: List[str], rotating: bool) -> None:
+        with self._lock:
+            self._state = {
+                "version": VERSION,
+                "started_at": started_at,
+                "rotating": rotating,
+                "accounts": list(accounts),
+                "games": list(games),
+                "done_accounts": [],
+                "done_games": {},
+                "resumes": 0,
+            }
+            self._write()
+
+    def resume(self, state: Dict[str, Any]) -> None:
+        """Continue recording into a checkpoint returned by ``resumable``."""
+        with self._lock:
+            self._state = state
+            self._state["resumes"] = int(state.get("resumes", 0)) + 1
+            self._write()
+
+    def done_accounts(self) -> Set[str]:
+        with self._lock:
+            return set(self._state["done_accounts"]) if self._state else set()
+
+    def done_games(self, account: Optional[str]) -> Set[str]:
+        with self._lock:
+            return set(self._state["done_games"].get(account or "", [])) if self._state else set()
+
+    def games_done(self, account: Optional[str], app_ids: List[str]) -> None:
+        with self._lock:
+            if not self._state:
+                return
+            done = self._state["done_games"].setdefault(account or "", [])
+            added = [app_id for app_id in app_ids if app_id not in done]
+            if added:
+                done.extend(added)
+                self._write()
+
+    def account_done(self, account: Optional[str]) -> None:
+        with self._lock:
+            if not self._state:
+                return
+            self._state["done_accounts"].append(account or "")
+            self._state["done_games"].pop(account or "", None)
+            self._write()
+
+    def finish(self) -> None:
+        with self._lock:
+            self._state = None
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logger.warning(f"Unable to remove rotation checkpoint: {exc}")
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._state:
+                return None
+            return {
+                "started_at": self._state["started_at"],
+                "accounts_done": len(self._state["done_accounts"]),
+                "accounts_total": len(self._state["accounts"]),
+                "resumes": self._state["resumes"],
+            }
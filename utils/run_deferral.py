@@ -0,0 +1,155 @@
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from utils.concurrency import ResourceSample, sample_resources
+
+CHECK_INTERVAL_SECONDS = 30
+MIN_FREE_MEMORY_PERCENT = 10.0
+CPU_BASELINE_SECONDS = 1.0
+
+
+def running_process_names() -> Set[str]:
+    """Lower-cased names of every running process, with and without ``.exe``."""
+    names: Set[str] = set()
+    for proc in psutil.process_iter(["name"]):
+        name = (proc.info.get("name") or "").lower()
+        if name:
+            names.add(name)
+            if name.endswith(".exe"):
+                names.add(name[:-4])
+    return names
+
+
+def foreground_fullscreen() -> Optional[str]:
+    """Name of the process owning a fullscreen foreground window, if any (Windows only)."""
+    if os.name != "nt":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class MonitorInfo(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT), ("rcWork", wintypes.RECT), ("dwFlags", wintypes.DWORD)]
+
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd or hwnd in (user32.GetDesktopWindow(), user32.GetShellWindow()):
+        return None
+    window = wintypes.RECT()
+    info = MonitorInfo(cbSize=ctypes.sizeof(MonitorInfo))
+    if not user32.GetWindowRect(hwnd, ctypes.byref(window)):
+        return None
+    if not user32.GetMonitorInfoW(user32.MonitorFromWindow(hwnd, 2), ctypes.byref(info)):  # MONITOR_DEFAULTTONEAREST
+        return None
+    screen = info.rcMonitor
+    if window.left > screen.left or window.top > screen.top or window.right < screen.right or window.bottom < screen.bottom:
+        return None
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    try:
+        return psutil.Process(pid.value).name()
+    except psutil.Error:
+        return "unknown process"
+
+
+class RunDeferral:
+    """Hold a due scheduled run back while the host is busy.
+
+    The host counts as busy while CPU is above ``max_cpu_percent``, free
+    memory is below ``min_free_memory_percent``, a listed process is running
+    or a fullscreen window has the focus. ``check`` is called every
+    ``CHECK_INTERVAL_SECONDS`` once a run is due and keeps saying "wait"
+    until the host is idle or the run has waited ``max_delay_seconds``.
+    It sleeps only through the ``wait`` it is given, so the scheduler's
+    clock and stop event stay in charge.
+    ``finish`` closes the deferral and returns how long it lasted and why.
+    """
+
+    def __init__(
+        self,
+        max_cpu_percent: float = 80.0,
+        min_free_memory_percent: float = MIN_FREE_MEMORY_PERCENT,
+        processes: Iterable[str] = (),
+        max_delay_seconds: float = 3600,
+        sampler: Callable[[], ResourceSample] = sample_resources,
+        process_names: Callable[[], Set[str]] = running_process_names,
+        fullscreen: Callable[[], Optional[str]] = foreground_fullscreen,
+    ) -> None:
+        self.min_free_memory_percent = min_free_memory_percent
+        self.sampler = sampler
+        self.process_names = process_names
+        self.fullscreen = fullscreen
+        self.configure(max_cpu_percent, processes, max_delay_seconds)
+        self.since: Optional[float] = None
+        self.reasons: List[str] = []
+        self.checks = 0
+        self.last: Optional[Dict[str, Any]] = None
+
+    def configure(self, max_cpu_percent: float, processes: Iterable[str], max_delay_seconds: float) -> None:
+        self.max_cpu_percent = max_cpu_percent
+        self.processes = [name.strip().lower() for name in processes if name.strip()]
+        self.max_delay_seconds = max(0.0, max_delay_seconds)
+
+    @property
+    def active(self) -> bool:
+        return self.since is not None
+
+    def busy_reasons(self, wait: Callable[[float], bool]) -> Optional[List[str]]:
+        """Why the host is busy right now; None if ``wait`` was interrupted while taking the CPU baseline."""
+        if not self.active:
+            # CPU is measured since the previous sample, which may be hours old; start a fresh window.
+            self.sampler()
+            if wait(CPU_BASELINE_SECONDS):
+                return None
+        sample = self.sampler()
+        reasons = []
+        if sample.cpu_percent > self.max_cpu_percent:
+            reasons.append(f"CPU {sample.cpu_percent:.0f}% > {self.max_cpu_percent:.0f}%")
+        if sample.available_memory_percent < self.min_free_memory_percent:
+            reasons.append(f"memory {sample.available_memory_percent:.0f}% free < {self.min_free_memory_percent:.0f}%")
+        if self.processes:
+            running = self.process_names()
+            busy = [name for name in self.processes if name in running]
+            if busy:
+                reasons.append("running " + ", ".join(busy))
+        window = self.fullscreen()
+        if window:
+            reasons.append(f"fullscreen {window}")
+        return reasons
+
+    def check(self, now: float, wait: Callable[[float], bool]) -> str:
+        """``wait`` while the due run should hold off, else why it may go: ``idle`` or ``max_delay``.
+
+        ``wait(seconds)`` sleeps and returns True if it was interrupted, in
+        which case the verdict is ``stopped``.
+        """
+        reasons = self.busy_reasons(wait)
+        if reasons is None:
+            return "stopped"
+        if not reasons:
+            return "idle"
+        if self.since is None:
+            self.since = now
+        self.reasons = reasons
+        self.checks += 1
+        return "wait" if now - self.since < self.max_delay_seconds else "max_delay"
+
+    def finish(self, now: float, outcome: str) -> Optional[Dict[str, Any]]:
+        """End the current deferral; ``outcome`` is idle, max_delay, manual or stopped. None if nothing was deferred."""
+        if self.since is None:
+            return None
+        self.last = {"since": self.since, "seconds": now - self.since, "checks": self.checks, "reasons": self.reasons, "outcome": outcome}
+        self.since = None
+        self.reasons = []
+        self.checks = 0
+        return self.last
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "seconds": now - self.since if self.since is not None else 0,
+            "reasons": list(self.reasons),
+            "max_delay_seconds": self.max_delay_seconds,
+            "last": self.last,
+        }
@@ -0,0 +1,163 @@
+import random
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from utils.clock import VirtualClock
+
+# Where simulated games are "installed"; launched processes report an exe under it.
+SIMULATED_LIBRARY = "/simulated/steamapps/common"
+
+
+@dataclass
+class SimulationTimings:
+    """Seconds the stubbed Steam and game processes take for each step."""
+
+    switch_seconds: float = 25.0  # kill Steam, relaunch, wait for loginusers.vdf to be consumed
+    game_exit_seconds: float = 2.0  # from SIGTERM until the game process is gone
+    switch_failure_rate: float = 0.0  # share of account switches that fail
+    seed: int = 1
+
+
+class SimulatedProcess:
+    """Just enough of ``psutil.Process`` for ``close_games``: status, terminate, wait and kill on virtual time."""
+
+    def __init__(self, table: "SimulatedProcessTable", pid: int, name: str, exe: str) -> None:
+        self.table = table
+        self.info = {"pid": pid, "name": name, "exe": exe, "cmdline": [exe], "create_time": table.clock.time()}
+        self._exit_at: Optional[float] = None
+
+    def status(self) -> str:
+        return psutil.STATUS_RUNNING
+
+    def terminate(self) -> None:
+        if self._exit_at is None:
+            self._exit_at = self.table.clock.monotonic() + self.table.timings.game_exit_seconds
+
+    def kill(self) -> None:
+        self._exit_at = self.table.clock.monotonic()
+        self.table.reap(self)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        clock = self.table.clock
+        remaining = None if self._exit_at is None else self._exit_at - clock.monotonic()
+        if remaining is not None and (timeout is None or remaining <= timeout):
+            clock.advance(remaining)
+            self.table.reap(self)
+            return 0
+        clock.advance(timeout or 0)
+        raise psutil.TimeoutExpired(timeout)
+
+
+class SimulatedProcessTable:
+    """Games started through the simulated launcher, with the peak count seen."""
+
+    def __init__(self, clock: VirtualClock, timings: SimulationTimings) -> None:
+        self.clock = clock
+        self.timings = timings
+        self.running: Dict[int, SimulatedProcess] = {}
+        self.launches = 0
+        self.closes = 0
+        self.peak = 0
+        self._next_pid = 1000
+
+    def launch(self, name: str, exe: str) -> None:
+        # Steam focuses an already running game instead of starting it twice.
+        if any(proc.info["name"] == name for proc in self.running.values()):
+            return
+        self._next_pid += 1
+        self.running[self._next_pid] = SimulatedProcess(self, self._next_pid, name, exe)
+        self.launches += 1
+        self.peak = max(self.peak, len(self.running))
+
+    def reap(self, proc: SimulatedProcess) -> None:
+        if self.running.pop(proc.info["pid"], None) is not None:
+            self.closes += 1
+
+
+class SimulatedSteamWorker:
+    """Stand-in for ``SteamWorker``: account switches cost virtual time and count as Steam restarts."""
+
+    def __init__(self, clock: VirtualClock, accounts: List[str], timings: SimulationTimings) -> None:
+        self.clock = clock
+        self.accounts = list(accounts)
+        self.timings = timings
+        self.restarts = 0
+        self.switches = 0
+        self.failed_switches = 0
+        self._random = random.Random(timings.seed)
+
+    def get_steam_login_user_names(self) -> List[str]:
+        return list(self.accounts)
+
+    def switch_account(self, username: str, progress_hook: Optional[Callable[[int, int, str], None]] = None, cancel: Any = None) -> bool:
+        self.switches += 1
+        self.restarts += 1
+        if progress_hook:
+            progress_hook(1, 1, f"Switching to {username}")
+        self.clock.advance(self.timings.switch_seconds)
+        if self._random.random() < self.timings.switch_failure_rate:
+            self.failed_switches += 1
+            return False
+        return True
+
+    def kill_steam(self, cancel: Any = None) -> None:
+        pass
+
+    def open_steam(self, cancel: Any = None) -> bool:
+        self.restarts += 1
+        return True
+
+    def is_steam_running(self) -> bool:
+        return True
+
+    def restore_loginusers_backup(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"pid": None, "alive": True, "current_op": None, "restarts": self.restarts}
+
+
+@dataclass
+class SimulationReport:
+    """What a dry run projects for one config."""
+
+    cycles: List[float] = field(default_factory=list)  # virtual seconds per run_once
+    starts: List[float] = field(default_factory=list)  # virtual start of each run, from the beginning
+    waiting_seconds: float = 0.0  # inside runs, waiting before closing games
+    virtual_seconds: float = 0.0
+    real_seconds: float = 0.0
+    steam_restarts: int = 0
+    failed_switches: int = 0
+    launches: int = 0
+    closes: int = 0
+    left_running: int = 0
+    peak_concurrent_games: int = 0
+    account_passes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        busy = sum(self.cycles)
+        hours = self.virtual_seconds / 3600 if self.virtual_seconds else 0
+        return {
+            "cycles": len(self.cycles),
+            "cycle_seconds_mean": statistics.fmean(self.cycles) if self.cycles else 0.0,
+            "cycle_seconds_max": max(self.cycles, default=0.0),
+            "period_seconds_mean": (self.starts[-1] - self.starts[0]) / (len(self.starts) - 1) if len(self.starts) > 1 else 0.0,
+            "waiting_seconds": self.waiting_seconds,
+            "idle_seconds": max(0.0, self.virtual_seconds - busy),
+            "virtual_seconds": self.virtual_seconds,
+            "real_seconds": self.real_seconds,
+            "steam_restarts": self.steam_restarts,
+            "failed_switches": self.failed_switches,
+            "launches": self.launches,
+            "closes": self.closes,
+            "left_running": self.left_running,
+            "peak_concurrent_games": self.peak_concurrent_games,
+            "account_passes": self.account_passes,
+            "launches_per_hour": self.launches / hours if hours else 0.0,
+        }
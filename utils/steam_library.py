@@ -0,0 +1,296 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+import vdf  # type: ignore
+
+logger = logging.getLogger("main")
+
+MAX_APP_ID = 2**32 - 1
+_URL_PATTERNS = (
+    re.compile(r"app/(\d+)", re.IGNORECASE),
+    re.compile(r"steam://(?:rungameid|run|install)/(\d+)", re.IGNORECASE),
+)
+_TOKEN_SPLIT = re.compile(r"[\s,;]+")
+_EXPORT_ID_KEYS = ("appid", "app_id", "appId", "id")
+
+SORT_KEYS: Dict[str, Callable[["InstalledApp"], Any]] = {
+    "name": lambda app: (app.name.casefold(), int(app.app_id) if app.app_id.isdigit() else 0),
+    "app_id": lambda app: int(app.app_id) if app.app_id.isdigit() else 0,
+    "size": lambda app: app.size_on_disk,
+    "last_played": lambda app: app.last_played,
+    "last_updated": lambda app: app.last_updated,
+}
+
+
+@dataclass
+class InstalledApp:
+    """One ``appmanifest_<id>.acf`` found in a Steam library folder."""
+
+    app_id: str
+    name: str
+    library: str
+    install_path: str
+    installed: bool
+    size_on_disk: int = 0
+    last_updated: int = 0
+    last_played: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "app_id": self.app_id,
+            "name": self.name,
+            "library": self.library,
+            "install_path": self.install_path,
+            "installed": self.installed,
+            "size_on_disk": self.size_on_disk,
+            "last_updated": self.last_updated,
+            "last_played": self.last_played,
+        }
+
+
+def _int_field(state: Dict[str, Any], key: str) -> int:
+    try:
+        return int(state.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SteamLibraryIndex:
+    """In-memory index of every app manifest across all Steam library folders.
+
+    One scan reads ``libraryfolders.vdf`` and each library's manifests, so
+    looking up N app IDs costs one pass instead of N. The scan is repeated
+    only when ``libraryfolders.vdf`` or a ``steamapps`` directory changes;
+    Steam adds and removes manifests there when games are installed or
+    uninstalled. Those mtimes are checked at most once per ``check_interval``
+    seconds.
+    """
+
+    def __init__(self, steam_path: Optional[str], check_interval: float = 1.0) -> None:
+        self.steam_path = steam_path
+        self.check_interval = check_interval
+        self._apps: Dict[str, InstalledApp] = {}
+        self._libraries: List[str] = []
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._sorted: Dict[str, List[InstalledApp]] = {}  # per sort key, dropped on every rescan
+        self._lock = threading.Lock()
+
+    def library_paths(self) -> List[str]:
+        if not self.steam_path:
+            return []
+        paths = [self.steam_path]
+        folders_file = os.path.join(self.steam_path, "steamapps", "libraryfolders.vdf")
+        try:
+            with open(folders_file, "r", encoding="utf-8") as handle:
+                data = vdf.load(handle)
+        except (OSError, SyntaxError, ValueError):
+            data = {}
+        folders = data.get("libraryfolders") or data.get("LibraryFolders") or {}
+        for key, library in folders.items():
+            path = library.get("path") if isinstance(library, dict) else (library if key.isdigit() else None)
+            if path:
+                paths.append(path)
+
+        unique: List[str] = []
+        seen = set()
+        for path in paths:
+            marker = os.path.normcase(os.path.realpath(path))
+            if marker not in seen:
+                seen.add(marker)
+                unique.append(path)
+        return unique
+
+    def _current_signature(self) -> Tuple:
+        if not self.steam_path:
+            return ()
+        stamps = []
+        for path in [os.path.join(self.steam_path, "steamapps", "libraryfolders.vdf")] + [os.path.join(library, "steamapps") for library in self._libraries]:
+            try:
+                stamps.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                stamps.append((path, None))
+        return tuple(stamps)
+
+    def _scan(self) -> Dict[str, InstalledApp]:
+        apps: Dict[str, InstalledApp] = {}
+        for library in self._libraries:
+            steamapps = os.path.join(library, "steamapps")
+            try:
+                entries = list(os.scandir(steamapps))
+            except OSError:
+                continue
+            for entry in entries:
+                if not (entry.name.startswith("appmanifest_") and entry.name.endswith(".acf")):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as handle:
+                        state = vdf.load(handle).get("AppState", {})
+                except (OSError, SyntaxError, ValueError) as exc:
+                    logger.debug(f"Skipping unreadable manifest {entry.path}: {exc}")
+                    continue
+                app_id = str(state.get("appid") or entry.name[len("appmanifest_"):-len(".acf")])
+                install_path = os.path.join(steamapps, "common", state.get("installdir", ""))
+                installed = bool(state.get("installdir")) and os.path.isdir(install_path)
+                if app_id in apps and (apps[app_id].installed or not installed):
+                    continue  # a moved game can leave a stale manifest behind; the installed copy wins
+                apps[app_id] = InstalledApp(
+                    app_id=app_id,
+                    name=state.get("name") or f"App {app_id}",
+                    library=library,
+                    install_path=install_path,
+                    installed=installed,
+                    size_on_disk=_int_field(state, "SizeOnDisk"),
+                    last_updated=_int_field(state, "LastUpdated"),
+                    last_played=_int_field(state, "LastPlayed"),
+                )
+        return apps
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._libraries = self.library_paths()
+            self._signature = self._current_signature()
+            self._apps = self._scan()
+            self._sorted = {}
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self) -> None:
+        """Rescan if the library layout changed since the last scan."""
+        if self._signature is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if self._signature is None or self._current_signature() != self._signature:
+            self.refresh()
+        self._checked_at = time.monotonic()
+
+    def libraries(self) -> List[str]:
+        """Library folders from the last scan."""
+        self.ensure_fresh()
+        return list(self._libraries)
+
+    def get(self, app_id: Any) -> Optional[InstalledApp]:
+        self.ensure_fresh()
+        return self._apps.get(str(app_id).strip())
+
+    def install_path(self, app_id: Any) -> Optional[str]:
+        app = self.get(app_id)
+        return app.install_path if app and app.installed else None
+
+    def apps(self) -> List[InstalledApp]:
+        self.ensure_fresh()
+        return list(self._apps.values())
+
+    def query(
+        self,
+        search: Optional[str] = None,
+        sort: str = "name",
+        descending: bool = False,
+        installed: Optional[bool] = None,
+        configured: Optional[bool] = None,
+        configured_ids: Collection[str] = (),
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[InstalledApp], int]:
+        """Return one page of apps and the total match count.
+
+        Each sort order is computed once per scan and reused, so paging and
+        filtering a large library is a linear pass over a cached list.
+        ``search`` matches the name or app ID; ``configured`` filters on
+        membership in ``configured_ids``.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'")
+        self.ensure_fresh()
+        with self._lock:
+            ordered = self._sorted.get(sort)
+            if ordered is None:
+                ordered = self._sorted[sort] = sorted(self._apps.values(), key=SORT_KEYS[sort])
+        if descending:
+            ordered = ordered[::-1]
+
+        needle = (search or "").strip().casefold()
+        configured_ids = set(configured_ids)
+        matches = [
+            app
+            for app in ordered
+            if (installed is None or app.installed == installed)
+            and (configured is None or (app.app_id in configured_ids) == configured)
+            and (not needle or needle in app.name.casefold() or needle == app.app_id)
+        ]
+        return matches[offset:offset + limit], len(matches)
+
+    def classify(self, app_ids: Iterable[Any]) -> Tuple[List[InstalledApp], List[str]]:
+        """Split ``app_ids`` into installed apps and IDs with no installed copy."""
+        self.ensure_fresh()
+        apps = self._apps
+        installed: List[InstalledApp] = []
+        missing: List[str] = []
+        for app_id in app_ids:
+            app = apps.get(str(app_id).strip())
+            if app and app.installed:
+                installed.append(app)
+            else:
+                missing.append(str(app_id).strip())
+        return installed, missing
+
+
+def _tokens_from_json(data: Any) -> List[str]:
+    """Collect app ID tokens from a JSON export (plain list, or Steam's owned-games shape)."""
+    if isinstance(data, (int, str)):
+        return [str(data)]
+    if isinstance(data, list):
+        tokens: List[str] = []
+        for item in data:
+            if isinstance(item, dict):
+                key = next((key for key in _EXPORT_ID_KEYS if key in item), None)
+                tokens.append(str(item[key]) if key else json.dumps(item))
+            else:
+                tokens.extend(_tokens_from_json(item))
+        return tokens
+    if isinstance(data, dict):
+        if "response" in data:
+            return _tokens_from_json(data["response"])
+        for key in ("apps", "games"):
+            if key in data:
+                return _tokens_from_json(data[key])
+    return []
+
+
+def parse_app_ids(source: Any) -> Tuple[List[str], List[str], int]:
+    """Extract app IDs from pasted text, a list or a library export.
+
+    Text may mix bare IDs, store links and ``steam://`` URLs separated by
+    whitespace, commas or semicolons. Returns ``(ids, invalid, duplicates)``
+    with ``ids`` de-duplicated in first-seen order.
+    """
+    if isinstance(source, str):
+        stripped = source.strip()
+        if stripped[:1] in ("[", "{"):
+            try:
+                source = json.loads(stripped)
+            except ValueError:
+                pass
+    tokens = [token for token in _TOKEN_SPLIT.split(source) if token] if isinstance(source, str) else _tokens_from_json(source)
+
+    ids: List[str] = []
+    invalid: List[str] = []
+    seen = set()
+    duplicates = 0
+    for token in tokens:
+        match = next((pattern.search(token) for pattern in _URL_PATTERNS if pattern.search(token)), None)
+        digits = match.group(1) if match else (token if token.isdigit() else None)
+        if digits is None or not 0 < int(digits) <= MAX_APP_ID:
+            invalid.append(token)
+            continue
+        app_id = str(int(digits))
+        if app_id in seen:
+            duplicates += 1
+            continue
+        seen.add(app_id)
+        ids.append(app_id)
+    return ids, invalid, duplicates
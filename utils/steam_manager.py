@@ -5,7 +5,7 @@ import shutil
 import subprocess
 import tempfile
 import time
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:  # winreg is Windows-only
     import winreg as reg
@@ -20,6 +20,10 @@ class SteamAccountChangerError(RuntimeError):
     """Raised when the Steam account switcher encounters a fatal issue."""
 
 
+class SteamAccountChangerCancelled(SteamAccountChangerError):
+    """Raised when a wait inside the account switcher sees a cancellation request."""
+
+
 class SteamAccountChanger:
     def __init__(self):
         """Manage Steam account switching across Windows and Linux."""
@@ -32,8 +36,17 @@ class SteamAccountChanger:
         self._steam_ready_timeout = 45  # seconds to wait for Steam to consume loginusers
         self._poll_interval = 1.25
         self._shadow_backup_active = False
+        self.cancel_event: Optional[Any] = None  # threading/multiprocessing Event checked by every wait
+        self._account_names_cache: Optional[Tuple[Tuple[int, int], List[str]]] = None  # (mtime_ns, size), names
         self._cleanup_orphaned_shadow_backup()  # Ensure cleanup is called during initialization
 
+    def _sleep(self, seconds: float) -> None:
+        """Sleep for ``seconds`` unless cancellation is requested first."""
+        if self.cancel_event is None:
+            time.sleep(seconds)
+        elif self.cancel_event.wait(seconds):
+            raise SteamAccountChangerCancelled("Steam operation cancelled")
+
     def _cleanup_orphaned_shadow_backup(self) -> None:
         if not self.loginusers_path or not self._shadow_backup_path:
             return
@@ -202,7 +215,7 @@ class SteamAccountChanger:
     def _wait_for_loginusers_activity(self, timeout: Optional[int] = None) -> bool:
         """Keep the single-user file in place until Steam consumes it."""
         if not self.loginusers_path:
-            time.sleep(5)
+            self._sleep(5)
             return True
 
         max_wait = timeout or self._steam_ready_timeout
@@ -215,7 +228,7 @@ class SteamAccountChanger:
                 return True
             if current and baseline is None:
                 return True
-            time.sleep(self._poll_interval)
+            self._sleep(self._poll_interval)
         return False
 
     def _set_autologin_registry(self, username: str) -> bool:
@@ -232,16 +245,32 @@ class SteamAccountChanger:
             return False
 
     def get_steam_login_user_names(self):
-        """Return saved Steam account names."""
+        """Return saved Steam account names.
+
+        The parsed list is reused until loginusers.vdf changes on disk, so
+        status polling does not re-parse the file every time.
+        """
+        try:
+            stat = os.stat(self.loginusers_path) if self.loginusers_path else None
+        except OSError:
+            stat = None
+        signature = (stat.st_mtime_ns, stat.st_size) if stat else None
+        cached = self._account_names_cache
+        if signature and cached and cached[0] == signature:
+            return list(cached[1])
+
         loginusers_vdf = self._load_loginusers()
         if not loginusers_vdf:
             return []
 
         try:
-            return [user.get("AccountName", "") for user in loginusers_vdf.get("users", {}).values() if user.get("AccountName")]
+            names = [user.get("AccountName", "") for user in loginusers_vdf.get("users", {}).values() if user.get("AccountName")]
         except Exception as exc:
             logger.error(f"An error occurred while parsing loginusers.vdf: {exc}")
             return []
+        if signature:
+            self._account_names_cache = (signature, names)
+        return list(names)
 
     def kill_steam(self):
         """Terminate Steam processes."""
@@ -250,7 +279,7 @@ class SteamAccountChanger:
                 subprocess.run(["taskkill.exe", "/F", "/IM", proc_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, shell=True)
         else:
             subprocess.run(["pkill", "-f", "steam"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(1.5)
+        self._sleep(1.5)
 
     def open_steam(self):
         """Start Steam and wait briefly for it to come up."""
@@ -269,7 +298,7 @@ class SteamAccountChanger:
                 else:
                     subprocess.Popen(["steam", "-silent", "-noreactlogin"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-            time.sleep(8)
+            self._sleep(8)
             if self.is_steam_running():
                 logger.info("Steam opened successfully.")
                 return True
@@ -355,6 +384,11 @@ class SteamAccountChanger:
                 else:
                     logger.warning("Steam did not touch loginusers.vdf within the wait window; restoring anyway.")
                     self._notify_progress(progress_hook, 6, total_steps, "Timeout waiting for Steam confirmation; continuing")
+        except SteamAccountChangerCancelled:
+            logger.warning(f"Switch to {username} cancelled; restoring account roster.")
+            self._restore_loginusers_backup()
+            self._notify_progress(progress_hook, total_steps, total_steps, "Cancelled; restoring full account roster")
+            return False
         except SteamAccountChangerError as exc:
             logger.error(str(exc))
             self._restore_loginusers_backup()
@@ -0,0 +1,321 @@
+import itertools
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.steam_manager import SteamAccountChanger
+
+logger = logging.getLogger("main")
+
+# Upper bound for each operation before the worker is considered hung. A
+# switch is two kills, up to three Steam launch attempts and the wait for
+# Steam to consume loginusers.vdf, so it gets the most headroom.
+OP_TIMEOUTS: Dict[str, float] = {
+    "switch_account": 240.0,
+    "kill_steam": 30.0,
+    "open_steam": 90.0,
+    "is_steam_running": 15.0,
+    "restore_loginusers_backup": 15.0,
+}
+
+# Once cancellation is requested the worker gets this long to unwind and
+# restore loginusers.vdf itself before it is killed.
+CANCEL_GRACE_SECONDS = 0.5
+POLL_SECONDS = 0.05
+
+
+class SteamWorkerError(RuntimeError):
+    """Raised when a worker operation fails, times out or the worker dies."""
+
+
+class _PipeLogHandler(logging.Handler):
+    """Forward the worker's log records to the parent process."""
+
+    def __init__(self, conn) -> None:
+        super().__init__()
+        self.conn = conn
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.conn.send({"type": "log", "level": record.levelno, "message": record.getMessage()})
+        except Exception:
+            pass
+
+
+def _worker_main(conn, cancel_event, changer_factory: Callable[..., SteamAccountChanger], factory_args: Tuple) -> None:
+    """Entry point of the worker process: serve one request at a time until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent decides when the worker exits
+    root = logging.getLogger()
+    root.handlers = [_PipeLogHandler(conn)]
+    root.setLevel(logging.INFO)
+
+    changer = changer_factory(*factory_args)
+    changer.cancel_event = cancel_event
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        op = request.get("op")
+        if op == "shutdown":
+            return
+        request_id = request.get("id")
+        args = request.get("args") or {}
+
+        def progress(step: int, total: int, message: str) -> None:
+            conn.send({"type": "progress", "id": request_id, "step": step, "total": total, "message": message})
+
+        try:
+            if op == "switch_account":
+                value = changer.switch_account(args.get("username"), progress)
+            elif op == "kill_steam":
+                value = changer.kill_steam()
+            elif op == "open_steam":
+                value = changer.open_steam()
+            elif op == "is_steam_running":
+                value = changer.is_steam_running()
+            elif op == "restore_loginusers_backup":
+                value = changer._restore_loginusers_backup()
+            else:
+                raise SteamWorkerError(f"Unknown operation '{op}'")
+            conn.send({"type": "result", "id": request_id, "ok": True, "value": value})
+        except Exception as exc:
+            conn.send({"type": "result", "id": request_id, "ok": False, "error": str(exc)})
+
+
+class SteamWorker:
+    """Run Steam automation in a supervised child process.
+
+    Account switches, Steam restarts and process checks block for tens of
+    seconds, so they are sent to a worker process over a pipe and answered
+    with progress, log and result messages. Each operation has a timeout; a
+    worker that misses it (or dies) is killed, ``loginusers.vdf`` is restored
+    from the on-disk backup and a fresh worker is started on the next call.
+    Reading the account list stays in-process because it is a plain file read.
+
+    Callers pass their stop event as ``cancel``; when it is set the worker's
+    shared cancel event is raised so every sleep inside the changer returns
+    at once, and a worker that has not answered within
+    ``CANCEL_GRACE_SECONDS`` is killed.
+    """
+
+    def __init__(
+        self,
+        changer_factory: Callable[..., SteamAccountChanger] = SteamAccountChanger,
+        factory_args: Tuple = (),
+        timeouts: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.changer_factory = changer_factory
+        self.factory_args = tuple(factory_args)
+        self.timeouts = {**OP_TIMEOUTS, **(timeouts or {})}
+        self.local = changer_factory(*self.factory_args)
+        self.restarts = 0
+        self.current_op: Optional[str] = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._cancel = self._ctx.Event()
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._conn = None
+        self._call_lock = threading.Lock()  # one operation in flight at a time
+        self._proc_lock = threading.Lock()  # guards starting and killing the process
+        self._ids = itertools.count(1)
+
+    # ------------------------------------------------------------
+    # Process management
+    # ------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        with self._proc_lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            parent_conn, child_conn = self._ctx.Pipe()
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(child_conn, self._cancel, self.changer_factory, self.factory_args),
+                name="AutoBanana-steam",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._process, self._conn = process, parent_conn
+            logger.info(f"Steam worker started (PID: {process.pid})")
+
+    def _terminate(self) -> None:
+        with self._proc_lock:
+            process, conn = self._process, self._conn
+            self._process, self._conn = None, None
+        if conn is not None:
+            conn.close()
+        if process is None:
+            return
+        process.terminate()
+        process.join(timeout=3)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=3)
+
+    def _recover(self, reason: str) -> None:
+        logger.error(f"Steam worker {reason}; restarting it and restoring loginusers.vdf")
+        self._terminate()
+        self.restarts += 1
+        try:
+            self.local._restore_loginusers_backup()
+        except Exception as exc:
+            logger.error(f"Unable to restore loginusers.vdf after worker restart: {exc}")
+
+    def abort(self, reason: str) -> None:
+        """Kill the worker even if an operation is in flight; the caller gets a failure."""
+        if self._process is None:
+            return
+        self._recover(reason)
+
+    def shutdown(self) -> None:
+        if self._process is None:
+            return
+        if self._call_lock.acquire(blocking=False):
+            try:
+                self._conn.send({"op": "shutdown"})
+                self._process.join(timeout=3)
+            except (AttributeError, OSError):
+                pass
+            finally:
+                self._call_lock.release()
+        self._terminate()
+
+    # ------------------------------------------------------------
+    # Request/response
+    # ------------------------------------------------------------
+    def _request(
+        self,
+        op: str,
+        progress_hook: Optional[Callable[[int, int, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        **args: Any,
+    ) -> Any:
+        if cancel is not None and cancel.is_set():
+            raise SteamWorkerError(f"Steam operation '{op}' cancelled")
+        self._ensure_started()
+        process, conn = self._process, self._conn
+        timeout = self.timeouts.get(op, 60.0)
+        request_id = next(self._ids)
+        deadline = time.monotonic() + timeout
+        cancelled_at: Optional[float] = None
+        self._cancel.clear()
+        self.current_op = op
+        try:
+            conn.send({"id": request_id, "op": op, "args": args})
+            while True:
+                now = time.monotonic()
+                if cancelled_at is None and cancel is not None and cancel.is_set():
+                    self._cancel.set()
+                    cancelled_at = now
+                if cancelled_at is not None and now - cancelled_at > CANCEL_GRACE_SECONDS:
+                    self._recover(f"ignored cancellation of '{op}'")
+                    raise SteamWorkerError(f"Steam operation '{op}' cancelled")
+                if now >= deadline:
+                    self._recover(f"'{op}' timed out after {timeout:.0f}s")
+                    raise SteamWorkerError(f"Steam operation '{op}' timed out")
+                if not conn.poll(min(deadline - now, POLL_SECONDS)):
+                    if not process.is_alive():
+                        raise EOFError
+                    continue
+                message = conn.recv()
+                kind = message.get("type")
+                if kind == "log":
+                    logger.log(message.get("level", logging.INFO), message.get("message", ""))
+                elif kind == "progress" and message.get("id") == request_id:
+                    if progress_hook:
+                        try:
+                            progress_hook(message["step"], message["total"], message["message"])
+                        except Exception:
+                            pass
+                elif kind == "result" and message.get("id") == request_id:
+                    if message.get("ok"):
+                        return message.get("value")
+                    raise SteamWorkerError(message.get("error") or f"Steam operation '{op}' failed")
+        except (EOFError, OSError) as exc:
+            if self._process is process:
+                self._recover(f"exited during '{op}'")
+            raise SteamWorkerError(f"Steam worker stopped during '{op}'") from exc
+        finally:
+            self.current_op = None
+
+    def call(
+        self,
+        op: str,
+        progress_hook: Optional[Callable[[int, int, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        **args: Any,
+    ) -> Any:
+        with self._call_lock:
+            return self._request(op, progress_hook, cancel, **args)
+
+    # ------------------------------------------------------------
+    # SteamAccountChanger surface
+    # ------------------------------------------------------------
+    def get_steam_login_user_names(self):
+        return self.local.get_steam_login_user_names()
+
+    def switch_account(
+        self,
+        username: str,
+        progress_hook: Optional[Callable[[int, int, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> bool:
+        try:
+            return bool(self.call("switch_account", progress_hook, cancel, username=username))
+        except SteamWorkerError as exc:
+            logger.error(f"Account switch to {username} failed: {exc}")
+            return False
+
+    def kill_steam(self, cancel: Optional[threading.Event] = None) -> None:
+        try:
+            self.call("kill_steam", cancel=cancel)
+        except SteamWorkerError as exc:
+            logger.error(f"Unable to stop Steam: {exc}")
+
+    def open_steam(self, cancel: Optional[threading.Event] = None) -> bool:
+        try:
+            return bool(self.call("open_steam", cancel=cancel))
+        except SteamWorkerError as exc:
+            logger.error(f"Unable to start Steam: {exc}")
+            return False
+
+    def is_steam_running(self) -> bool:
+        try:
+            return bool(self.call("is_steam_running"))
+        except SteamWorkerError:
+            return False
+
+    def restore_loginusers_backup(self) -> None:
+        """Put the full account roster back.
+
+        If an operation is still running (e.g. a switch when the scheduler is
+        stopped) it is cancelled; a worker that does not finish within
+        ``CANCEL_GRACE_SECONDS`` is killed and the roster is restored from the
+        on-disk backup.
+        """
+        if not self._call_lock.acquire(blocking=False):
+            self._cancel.set()
+            if not self._call_lock.acquire(timeout=CANCEL_GRACE_SECONDS + 2 * POLL_SECONDS):
+                self.abort(f"interrupted during '{self.current_op}'")
+                return
+        try:
+            if self._process is not None and self._process.is_alive():
+                self._request("restore_loginusers_backup")
+            else:
+                self.local._restore_loginusers_backup()
+        except SteamWorkerError as exc:
+            logger.error(f"Unable to restore loginusers.vdf: {exc}")
+        finally:
+            self._call_lock.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        process = self._process
+        return {
+            "pid": process.pid if process is not None else None,
+            "alive": bool(process is not None and process.is_alive()),
+            "current_op": self.current_op,
+            "restarts": self.restarts,
+        }
@@ -0,0 +1,207 @@
+import email.utils
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger("main")
+
+STORE_URL = "https://store.steampowered.com"
+PRIORITY_INTERACTIVE = 0  # the user is waiting on the answer (search box)
+PRIORITY_BACKGROUND = 1  # metadata prefetch and other work nobody is watching
+
+# How long a caller may wait for its turn before giving up.
+MAX_WAIT_SECONDS = {PRIORITY_INTERACTIVE: 4.0, PRIORITY_BACKGROUND: 300.0}
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+
+
+class StoreUnavailable(RuntimeError):
+    """Raised when a store request is refused locally: circuit open, throttled past the caller's wait budget."""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+class StoreClient:
+    """Shared, rate-limited gateway for Steam store API calls.
+
+    Callers take a ticket and wait their turn: a token bucket sets the
+    steady request rate, interactive tickets always go before background
+    ones, and background tickets leave ``interactive_reserve`` tokens in the
+    bucket so a search typed during a big prefetch is not stuck behind it.
+    A 429/503 pauses everyone until ``Retry-After`` (or an exponential
+    backoff when the header is missing) and the request is retried. Only
+    5xx answers and connection errors count as failures; a 429 means the
+    store is up and is handled by the pause alone. After
+    ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``open_seconds``; then a single probe decides
+    whether it closes again.
+    """
+
+    def __init__(
+        self,
+        base_url: str = STORE_URL,
+        requests_per_minute: float = 40.0,
+        burst: int = 5,
+        interactive_reserve: int = 1,
+        failure_threshold: int = 5,
+        open_seconds: float = 60.0,
+        max_retries: int = 3,
+        timeout: float = 6.0,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.rate = max(0.01, requests_per_minute / 60.0)
+        self.burst = max(1, burst)
+        self.interactive_reserve = min(interactive_reserve, self.burst - 1)
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0  # set from Retry-After / backoff
+        self._backoff_step = 0
+        self._failures = 0
+        self._circuit_open_until = 0.0
+        self._probe_in_flight = False
+        self._waiting: List[Tuple[int, int]] = []  # heap of (priority, ticket)
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self.stats = {"sent": 0, "throttled": 0, "failed": 0, "rejected": 0}
+
+    def set_rate(self, requests_per_minute: float) -> None:
+        with self._cond:
+            self.rate = max(0.01, requests_per_minute / 60.0)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _circuit_state(self, now: float) -> str:
+        if self._failures < self.failure_threshold:
+            return "closed"
+        return "open" if now < self._circuit_open_until or self._probe_in_flight else "half_open"
+
+    def _acquire(self, priority: int, max_wait: float) -> bool:
+        """Block until this caller may send; return True if it is the half-open probe."""
+        deadline = time.monotonic() + max_wait
+        with self._cond:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._circuit_state(now) == "open":
+                        self.stats["rejected"] += 1
+                        raise StoreUnavailable("Steam store circuit is open after repeated failures")
+                    self._refill(now)
+                    needed = 1.0 + (self.interactive_reserve if priority > PRIORITY_INTERACTIVE else 0)
+                    if self._waiting[0] == ticket and now >= self._blocked_until and self._tokens >= needed:
+                        self._tokens -= 1.0
+                        probe = self._circuit_state(now) == "half_open"
+                        if probe:
+                            self._probe_in_flight = True
+                        return probe
+                    wait = max(self._blocked_until - now, (needed - self._tokens) / self.rate, 0.005)
+                    if now + wait > deadline:
+                        self.stats["rejected"] += 1
+                        raise StoreUnavailable("Steam store is throttled; request dropped")
+                    self._cond.wait(min(wait, deadline - now))
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def _record(self, ok: Optional[bool], probe: bool, retry_after: Optional[float] = None, throttled: bool = False) -> None:
+        """Update backoff and the circuit breaker; ``ok`` None leaves the failure count alone."""
+        with self._cond:
+            now = time.monotonic()
+            if probe:
+                self._probe_in_flight = False
+            if throttled:
+                self.stats["throttled"] += 1
+                self._backoff_step += 1
+                delay = retry_after if retry_after is not None else BACKOFF_BASE_SECONDS * 2 ** (self._backoff_step - 1)
+                self._blocked_until = max(self._blocked_until, now + min(delay, BACKOFF_MAX_SECONDS))
+                self._tokens, self._refilled_at = 0.0, now
+            if ok:
+                self._failures = 0
+                self._backoff_step = 0
+            elif ok is False:
+                self.stats["failed"] += 1
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    # Re-opening after a failed probe waits twice as long, up to the backoff cap.
+                    extra = min(BACKOFF_MAX_SECONDS, self.open_seconds * 2 ** max(0, self._failures - self.failure_threshold))
+                    self._circuit_open_until = now + extra
+                    if self._failures == self.failure_threshold:
+                        logger.warning(f"Steam store unreachable; pausing store requests for {extra:.0f}s")
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None, priority: int = PRIORITY_BACKGROUND) -> Any:
+        """GET ``path`` through the queue and return the decoded JSON body.
+
+        Raises ``StoreUnavailable`` when the request is refused locally and
+        ``requests.RequestException`` when it was sent and failed.
+        """
+        max_wait = MAX_WAIT_SECONDS.get(priority, MAX_WAIT_SECONDS[PRIORITY_BACKGROUND])
+        for attempt in itertools.count():
+            probe = self._acquire(priority, max_wait)
+            self.stats["sent"] += 1
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+            except requests.RequestException:
+                self._record(False, probe)
+                raise
+            if response.status_code in (429, 503):
+                ok = None if response.status_code == 429 else False  # already paused via Retry-After; not a breaker failure
+                self._record(ok, probe, parse_retry_after(response.headers.get("Retry-After")), throttled=True)
+                if attempt < self.max_retries:
+                    continue
+                raise StoreUnavailable(f"Steam store kept throttling ({response.status_code})")
+            try:
+                response.raise_for_status()
+                payload = response.json()
+            except (requests.RequestException, ValueError):
+                self._record(response.status_code < 500, probe)  # a 4xx still means the store is up
+                raise
+            self._record(True, probe)
+            return payload
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Only fields that change on events, so the versioned status stays quiet while idle.
+        with self._cond:
+            now = time.monotonic()
+            return {
+                "circuit": self._circuit_state(now),
+                "backing_off": now < self._blocked_until,
+                "waiting": len(self._waiting),
+                **self.stats,
+            }
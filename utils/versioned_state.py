@@ -0,0 +1,48 @@
+import copy
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class VersionedState:
+    """Track per-field versions of a snapshot dict so pollers can ask for deltas.
+
+    Every ``update`` compares the new snapshot with the previous one field by
+    field; each changed field is stamped with a new version. Versions start
+    at the current time in milliseconds and only ever grow, so a version
+    handed out before a restart is always older than every field after it
+    and such a client simply receives the full snapshot again.
+    """
+
+    def __init__(self) -> None:
+        self.version = int(time.time() * 1000)
+        self._fields: Dict[str, Any] = {}
+        self._field_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def update(self, snapshot: Dict[str, Any]) -> int:
+        """Record ``snapshot`` and return the resulting version."""
+        with self._lock:
+            changed = [key for key, value in snapshot.items() if key not in self._fields or self._fields[key] != value]
+            removed = [key for key in self._fields if key not in snapshot]
+            if changed or removed:
+                self.version = max(self.version + 1, int(time.time() * 1000))
+                for key in changed:
+                    self._fields[key] = copy.deepcopy(snapshot[key])  # callers may mutate the live dicts later
+                    self._field_versions[key] = self.version
+                for key in removed:
+                    del self._fields[key]
+                    del self._field_versions[key]
+            return self.version
+
+    def since(self, version: Optional[int]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Return ``(current_version, fields changed after version)``.
+
+        ``None`` as the second element means nothing changed. An unknown or
+        future ``version`` yields the full snapshot.
+        """
+        with self._lock:
+            if version is None or version > self.version:
+                return self.version, dict(self._fields)
+            changes = {key: self._fields[key] for key, field_version in self._field_versions.items() if field_version > version}
+            return self.version, changes or None
@@ -1,5 +1,18 @@
 const state = {
     latestLogTs: 0,
+    pollTimers: [],
+    console: {
+        entries: [],
+        trimmed: 0,
+        stick: true,
+        frame: null,
+        spacer: null,
+        rowsEl: null,
+        rows: [],
+        placeholder: null,
+    },
+    status: {},
+    statusVersion: null,
     offline: false,
     formEditing: false,
     formFocusDepth: 0,
@@ -7,6 +20,7 @@ const state = {
     serviceState: "idle",
     gameIds: [],
     gameMeta: {},
+    gameMetaRetry: null,
     gameSearch: {
         term: "",
         results: [],
@@ -26,6 +40,14 @@ const state = {
 
 const GAME_HINT_DEFAULT = "Press Enter or Space to add an ID. Paste Steam store links or steam:// URLs.";
 const GAME_SEARCH_MIN = 2;
+const STATUS_POLL_MS = 500;
+const LOG_POLL_MS = 1000;
+// The console keeps this many lines in memory but only ever has one screenful
+// (plus overscan) of row elements in the DOM.
+const CONSOLE_MAX_ENTRIES = 5000;
+const CONSOLE_TRIM_CHUNK = 500;
+const CONSOLE_ROW_PX = 26; // must match .console-rows .console-line height
+const CONSOLE_OVERSCAN = 6;
 
 const el = (id) => document.getElementById(id);
 const consoleEl = () => el("console");
@@ -195,6 +217,13 @@ async function fetchGameMeta(ids) {
             state.gameMeta = { ...state.gameMeta, ...data.apps };
             renderGameTokens();
         }
+        // The rest is being fetched in the background at the store's pace.
+        if ((data.pending || []).length && !state.gameMetaRetry) {
+            state.gameMetaRetry = setTimeout(() => {
+                state.gameMetaRetry = null;
+                fetchGameMeta(state.gameIds);
+            }, 5000);
+        }
     } catch (err) {
         console.warn("Steam metadata lookup failed", err);
     }
@@ -661,13 +690,24 @@ function formatDurationVerbose(seconds) {
 
 async function fetchStatus() {
     try {
-        const res = await fetch("/api/status");
+        // Ask only for fields changed since the last version we have; an
+        // unchanged status is a few bytes and skips the full re-render.
+        const query = state.statusVersion === null ? "" : `?since_version=${state.statusVersion}`;
+        const res = await fetch(`/api/status${query}`);
         if (!res.ok) throw new Error("status not ok");
-        const data = await res.json();
+        const payload = await res.json();
         state.offline = false;
         setBanner(false);
+        state.statusVersion = payload.version ?? null;
+        const data = payload.unchanged ? state.status : { ...state.status, ...payload };
+        state.status = data;
+        if (payload.unchanged) {
+            renderStatusTimers(data);
+            return;
+        }
         const cfg = data.config || {};
         if (page === "settings" && state.formEditing) {
+            state.statusVersion = null; // re-read everything once editing ends
             return;
         }
 
@@ -694,9 +734,7 @@ async function fetchStatus() {
         };
 
         setText("kpi-next-run", fmtTime(data.next_run_at));
-        setText("kpi-next-hint", relative(data.next_run_at) || "waiting");
         setText("kpi-last-run", fmtTime(data.last_run_at));
-        setText("kpi-last-hint", relative(data.last_run_at) || "--");
         setText("kpi-accounts", data.accounts_count ?? 0, "0");
         setText("kpi-games", (cfg.games || []).length ?? 0, "0");
         setText("kpi-batch", cfg.batch_size ?? 0, "0");
@@ -728,57 +766,70 @@ async function fetchStatus() {
             setTheme(themeName);
         }
 
-        // Progress bar on dashboard
-        if (page === "dashboard") {
-            const fill = el("progress-fill");
-            const label = el("progress-label");
-            if (fill && label) {
-                const interval = data.interval_seconds || 0;
-                const next = data.next_run_at ? new Date(data.next_run_at).getTime() : null;
-                let pct = 0;
-                let text = "Idle";
-
-                fill.classList.remove("loading-anim", "waiting-anim");
-
-                if (data.state === "stopped") {
-                    pct = 0;
-                    text = "Stopped by user";
-                    fill.classList.remove("loading-anim");
-                } else {
-                    const wp = data.wait_progress;
-                    if (wp && wp.total > 0) {
-                        // Active waiting action (e.g., waiting before closing games)
-                        const total = Number(wp.total) || 0;
-                        const elapsed = Number(wp.elapsed) || 0;
-                        const remaining = typeof wp.remaining === "number" ? Math.max(0, wp.remaining) : Math.max(0, total - elapsed);
-                        const denom = total || (elapsed + remaining) || 1;
-                        pct = Math.min(100, Math.max(0, ((denom - remaining) / denom) * 100));
-                        text = `${wp.label} (${formatDurationHMS(remaining)} remaining)`;
-                        fill.classList.add("waiting-anim");
-                    } else if (data.state === "running") {
-                        pct = 100;
-                        text = "Running current cycle";
-                        fill.classList.add("loading-anim");
-                    } else if (next && interval > 0) {
-                        const now = Date.now();
-                        const remaining = Math.max(0, next - now);
-                        pct = Math.min(100, Math.max(0, ((interval * 1000 - remaining) / (interval * 1000)) * 100));
-                        text = `Next in ${relative(data.next_run_at) || "soon"}`;
-                        fill.classList.remove("loading-anim");
-                    }
-                }
-
-                fill.style.width = `${pct}%`;
-                label.textContent = text;
-            }
-        }
+        renderStatusTimers(data);
     } catch (err) {
         state.offline = true;
+        state.statusVersion = null;
         setBanner(true, "Backend is not reachable. Waiting to reconnect...");
         console.warn("status error", err);
     }
 }
 
+function renderStatusTimers(data) {
+    // Relative times and the countdown bar move with the clock, so they are
+    // redrawn on every poll even when the status itself is unchanged.
+    const hints = { "kpi-next-hint": relative(data.next_run_at) || "waiting", "kpi-last-hint": relative(data.last_run_at) || "--" };
+    Object.entries(hints).forEach(([id, text]) => {
+        const elRef = el(id);
+        if (elRef) elRef.textContent = text;
+    });
+
+    // Progress bar on dashboard
+    if (page === "dashboard") {
+        const fill = el("progress-fill");
+        const label = el("progress-label");
+        if (fill && label) {
+            const interval = data.interval_seconds || 0;
+            const next = data.next_run_at ? new Date(data.next_run_at).getTime() : null;
+            let pct = 0;
+            let text = "Idle";
+
+            fill.classList.remove("loading-anim", "waiting-anim");
+
+            if (data.state === "stopped") {
+                pct = 0;
+                text = "Stopped by user";
+                fill.classList.remove("loading-anim");
+            } else {
+                const wp = data.wait_progress;
+                if (wp && wp.total > 0) {
+                    // Active waiting action (e.g., waiting before closing games)
+                    const total = Number(wp.total) || 0;
+                    const elapsed = Number(wp.elapsed) || 0;
+                    const remaining = typeof wp.remaining === "number" ? Math.max(0, wp.remaining) : Math.max(0, total - elapsed);
+                    const denom = total || (elapsed + remaining) || 1;
+                    pct = Math.min(100, Math.max(0, ((denom - remaining) / denom) * 100));
+                    text = `${wp.label} (${formatDurationHMS(remaining)} remaining)`;
+                    fill.classList.add("waiting-anim");
+                } else if (data.state === "running") {
+                    pct = 100;
+                    text = "Running current cycle";
+                    fill.classList.add("loading-anim");
+                } else if (next && interval > 0) {
+                    const now = Date.now();
+                    const remaining = Math.max(0, next - now);
+                    pct = Math.min(100, Math.max(0, ((interval * 1000 - remaining) / (interval * 1000)) * 100));
+                    text = `Next in ${relative(data.next_run_at) || "soon"}`;
+                    fill.classList.remove("loading-anim");
+                }
+            }
+
+            fill.style.width = `${pct}%`;
+            label.textContent = text;
+        }
+    }
+}
+
 async function fetchLogs() {
     if (state.offline) return;
     try {
@@ -795,24 +846,103 @@ async function fetchLogs() {
     }
 }
 
-function appendLog(event) {
-    const wrapper = document.createElement("div");
-    wrapper.className = `console-line ${event.level}`;
-    const ts = new Date(event.timestamp * 1000).toLocaleTimeString();
-    wrapper.innerHTML = `<span class="ts">${ts}</span><span class="lvl">${event.level}</span><span class="msg">${event.message}</span>`;
+function setupConsole() {
     const c = consoleEl();
     if (!c) return;
-    const shouldStick = c.scrollTop + c.clientHeight >= c.scrollHeight - 40;
-    c.appendChild(wrapper);
-    while (c.childNodes.length > 300) c.removeChild(c.firstChild);
-    if (shouldStick) c.scrollTop = c.scrollHeight;
+    const log = state.console;
+    log.placeholder = c.firstElementChild;
+    log.spacer = document.createElement("div");
+    log.spacer.className = "console-spacer";
+    log.rowsEl = document.createElement("div");
+    log.rowsEl.className = "console-rows";
+    c.append(log.spacer, log.rowsEl);
+    c.addEventListener(
+        "scroll",
+        () => {
+            log.stick = c.scrollTop + c.clientHeight >= c.scrollHeight - 40;
+            scheduleConsoleRender();
+        },
+        { passive: true },
+    );
 }
 
-function clearConsole() {
+function appendLog(event) {
+    const log = state.console;
+    const time = new Date(event.timestamp * 1000).toLocaleTimeString();
+    // Rows have a fixed height, so each line of a multi-line message (a traceback) gets its own row.
+    String(event.message ?? "").split(/\r?\n/).forEach((message, index) => {
+        log.entries.push({ level: event.level, time, message, continued: index > 0 });
+    });
+    // Trim in chunks so a full buffer is not shifted on every line.
+    if (log.entries.length > CONSOLE_MAX_ENTRIES + CONSOLE_TRIM_CHUNK) {
+        const excess = log.entries.length - CONSOLE_MAX_ENTRIES;
+        log.entries.splice(0, excess);
+        log.trimmed += excess;
+    }
+    scheduleConsoleRender();
+}
+
+function scheduleConsoleRender() {
+    // Every line and scroll in a frame is drawn by one render; hidden tabs get no frames at all.
+    if (state.console.frame !== null || !state.console.rowsEl) return;
+    state.console.frame = requestAnimationFrame(renderConsole);
+}
+
+function createConsoleRow() {
+    const row = document.createElement("div");
+    const ts = document.createElement("span");
+    const lvl = document.createElement("span");
+    const msg = document.createElement("span");
+    ts.className = "ts";
+    lvl.className = "lvl";
+    msg.className = "msg";
+    row.append(ts, lvl, msg);
+    state.console.rowsEl.appendChild(row);
+    return { row, ts, lvl, msg };
+}
+
+function renderConsole() {
+    const log = state.console;
+    log.frame = null;
     const c = consoleEl();
-    if (c) {
-        c.innerHTML = "";
+    if (!c) return;
+    if (log.placeholder && log.entries.length) {
+        log.placeholder.remove();
+        log.placeholder = null;
     }
+
+    log.spacer.style.height = `${log.entries.length * CONSOLE_ROW_PX}px`;
+    if (log.stick) {
+        c.scrollTop = c.scrollHeight;
+    } else if (log.trimmed) {
+        c.scrollTop = Math.max(0, c.scrollTop - log.trimmed * CONSOLE_ROW_PX); // keep the lines being read in place
+    }
+    log.trimmed = 0;
+
+    const first = Math.max(0, Math.floor(c.scrollTop / CONSOLE_ROW_PX) - CONSOLE_OVERSCAN);
+    const count = Math.min(log.entries.length - first, Math.ceil(c.clientHeight / CONSOLE_ROW_PX) + 2 * CONSOLE_OVERSCAN);
+    while (log.rows.length < count) log.rows.push(createConsoleRow());
+    log.rowsEl.style.transform = `translateY(${first * CONSOLE_ROW_PX}px)`;
+    log.rows.forEach((view, index) => {
+        const entry = log.entries[first + index];
+        if (index >= count || !entry) {
+            view.row.style.display = "none";
+            return;
+        }
+        view.row.style.display = "";
+        view.row.className = `console-line ${entry.level}${entry.continued ? " continued" : ""}`;
+        view.ts.textContent = entry.time;
+        view.lvl.textContent = entry.level;
+        view.msg.textContent = entry.message;
+        view.row.title = entry.message;
+    });
+}
+
+function clearConsole() {
+    state.console.entries = [];
+    state.console.trimmed = 0;
+    state.console.stick = true;
+    scheduleConsoleRender();
 }
 
 function jumpConsoleToBottom() {
@@ -963,10 +1093,24 @@ function init() {
     if (el("console-clear")) el("console-clear").addEventListener("click", clearConsole);
     if (el("console-jump")) el("console-jump").addEventListener("click", jumpConsoleToBottom);
 
+    setupConsole();
+    document.addEventListener("visibilitychange", () => (document.hidden ? stopPolling() : startPolling()));
+    if (!document.hidden) startPolling();
+}
+
+function startPolling() {
+    // Nothing is polled while the tab is hidden; coming back fetches the
+    // changes since the last status version and log timestamp in one go.
+    if (state.pollTimers.length) return;
     fetchStatus();
     fetchLogs();
-    setInterval(fetchStatus, 500);
-    setTimeout(() => setInterval(fetchLogs, 1000), 300);
+    state.pollTimers.push(setInterval(fetchStatus, STATUS_POLL_MS));
+    state.pollTimers.push(setTimeout(() => state.pollTimers.push(setInterval(fetchLogs, LOG_POLL_MS)), 300));
+}
+
+function stopPolling() {
+    state.pollTimers.forEach((timer) => clearInterval(timer));
+    state.pollTimers = [];
 }
 
 document.addEventListener("DOMContentLoaded", init);